@@ -0,0 +1,107 @@
+"""Shared helpers for the benchmark scripts."""
+import random
+import statistics
+import time
+from pathlib import Path
+from typing import Callable
+from xml.etree.ElementTree import tostring
+
+from hunt.attributes.codec import encode_match
+from hunt.attributes.match import Accolade, Entry, Match
+from hunt.attributes.parser import parse_match, read_attributes
+from hunt.attributes.player import Player
+from hunt.attributes.team import SerializableTeam
+from hunt.attributes.xml.elements import XmlElement, append_element
+
+# A live attributes file holds a few thousand unlock and setting attributes next to the match data
+DEFAULT_FILLER_ATTRIBUTES: int = 20000
+
+
+def generate_attributes_document(filler_attributes: int = DEFAULT_FILLER_ATTRIBUTES, seed: int = 0) -> bytes:
+    """
+    Generates an attributes file with a full 12 player lobby and unrelated filler attributes.
+    :param filler_attributes: the number of attributes unrelated to match data
+    :param seed: the random seed
+    :return: the file contents
+    """
+    generator: random.Random = random.Random(seed)
+    root: XmlElement = XmlElement("Attributes", attrib={"Version": "37"})
+
+    # Unlocks and settings are written before the match data
+    for i in range(filler_attributes // 2):
+        append_element(root, name=f"Unlocks/Item_{i}", value=generator.randint(0, 1) == 1)
+
+    accolades: int = 12
+    entries: int = 24
+    for i in range(accolades):
+        Accolade(*(generator.randint(0, 500) for _ in range(2)), f"accolade_{i}",
+                 *(generator.randint(0, 500) for _ in range(9))).serialize(root, accolade_id=i)
+    for i in range(entries):
+        Entry(generator.randint(0, 100), f"accolade_{i}", f"descriptor &amp; {i}",
+              *(generator.randint(0, 100) for _ in range(4))).serialize(root, entry_id=i)
+
+    teams: int = 4
+    players_per_team: int = 3
+    for i in range(teams):
+        SerializableTeam(0, generator.randint(0, 1) == 1, generator.randint(1000, 5000), players_per_team,
+                         i == 0).serialize(root, team_id=i)
+        for j in range(players_per_team):
+            Player(f"Player <{i}_{j}>", *(generator.randint(0, 3) for _ in range(6)),
+                   *(generator.randint(0, 1) == 1 for _ in range(3)), *(generator.randint(0, 3) for _ in range(4)),
+                   generator.randint(1000, 5000), generator.randint(10 ** 6, 10 ** 9),
+                   *(generator.randint(0, 1) == 1 for _ in range(4))).serialize(root, team_id=i, player_id=j)
+
+    for name, value in (("MissionBagNumAccolades", accolades), ("MissionBagNumEntries", entries),
+                        ("MissionBagNumTeams", teams), ("MissionBagFbeGoldBonus", 0),
+                        ("MissionBagFbeHunterXpBonus", 0), ("MissionBagIsHunterDead", False),
+                        ("MissionBagIsQuickPlay", False), ("Unlocks/UnlockRank", 50),
+                        ("Region", "eu"), ("SecondaryRegion", "")):
+        append_element(root, name=name, value=value)
+
+    for i in range(filler_attributes - filler_attributes // 2):
+        append_element(root, name=f"Settings/Option_{i}", value=generator.randint(0, 100))
+
+    return tostring(root, encoding="utf-8", xml_declaration=True)
+
+
+def write_attributes_file(directory: Path, filler_attributes: int = DEFAULT_FILLER_ATTRIBUTES) -> Path:
+    """
+    Writes a generated attributes file to a directory.
+    :param directory: the directory to write to
+    :param filler_attributes: the number of attributes unrelated to match data
+    :return: the path to the attributes file
+    """
+    file_path: Path = directory / "attributes.xml"
+    file_path.write_bytes(generate_attributes_document(filler_attributes))
+    return file_path
+
+
+def generate_match_documents(count: int, directory: Path) -> list[bytes]:
+    """
+    Generates the JSON documents of distinct matches, the way Match.try_save_to_file writes them.
+    :param count: the amount of matches
+    :param directory: a temporary directory
+    :return: the encoded documents
+    """
+    documents: list[bytes] = []
+    file_path: Path = directory / "attributes.xml"
+    for seed in range(count):
+        file_path.write_bytes(generate_attributes_document(filler_attributes=0, seed=seed))
+        match: Match = parse_match(read_attributes(file_path), "Player <0_0>")
+        documents.append(encode_match(match).document.encode())
+    return documents
+
+
+def measure(function: Callable[[], object], repeat: int = 20) -> tuple[float, float]:
+    """
+    Measures the wall-clock time of a function.
+    :param function: the function to measure
+    :param repeat: the number of measurements
+    :return: the median and the standard deviation in milliseconds
+    """
+    samples: list[float] = []
+    for _ in range(repeat):
+        start: float = time.perf_counter()
+        function()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples), statistics.pstdev(samples)
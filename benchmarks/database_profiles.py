@@ -0,0 +1,48 @@
+"""Measures the commit latency of saving a 12 player match with each database profile."""
+import argparse
+import random
+import statistics
+import tempfile
+import time
+from datetime import datetime
+from hashlib import sha256
+from pathlib import Path
+
+from hunt.database.client import Client as DatabaseClient, DatabaseProfile
+from hunt.database.queries import MatchRecord, PlayerRecord, insert_match
+
+
+def main() -> None:
+    argument_parser: argparse.ArgumentParser = argparse.ArgumentParser(description=__doc__)
+    argument_parser.add_argument("--matches", type=int, default=200)
+    arguments: argparse.Namespace = argument_parser.parse_args()
+
+    generator: random.Random = random.Random(0)
+    profile_ids: list[int] = [generator.randint(10 ** 6, 10 ** 9) for _ in range(2000)]
+
+    for profile in DatabaseProfile:
+        samples: list[float] = []
+        with tempfile.TemporaryDirectory() as directory:
+            database: DatabaseClient
+            with DatabaseClient(file_path=Path(directory) / "match_data.db", profile=profile) as database:
+                for i in range(arguments.matches):
+                    players: tuple[PlayerRecord, ...] = tuple(
+                        PlayerRecord(j // 3, profile_id, f"Player {profile_id}", generator.randint(1000, 5000),
+                                     kills=generator.randint(0, 2), deaths=generator.randint(0, 2))
+                        for j, profile_id in enumerate(generator.sample(profile_ids, 12)))
+                    match: MatchRecord = MatchRecord(sha256(f"{i}".encode()).hexdigest(), Path(f"{i}.json"),
+                                                     datetime.now(), is_quickplay=False, is_hunter_dead=False,
+                                                     bloodline_rank=100, region="eu", players=players)
+
+                    start: float = time.perf_counter()
+                    insert_match(database, match=match)
+                    samples.append((time.perf_counter() - start) * 1000)
+
+        samples.sort()
+        print(f"{profile:>12}: median {statistics.median(samples):6.2f} ms, "
+              f"p95 {samples[int(len(samples) * 0.95)]:6.2f} ms, "
+              f"throughput {len(samples) / (sum(samples) / 1000):8.0f} matches/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""Measures the throughput of the database writer under burst load, with and without group commit."""
+import argparse
+import random
+import tempfile
+import threading
+import time
+from concurrent.futures import Future
+from datetime import datetime
+from hashlib import sha256
+from pathlib import Path
+
+from hunt.database.client import Client as DatabaseClient, DatabaseProfile
+from hunt.database.queries import MatchRecord, PlayerRecord, submit_match
+from hunt.database.writer import DatabaseWriter
+
+
+def generate_matches(count: int, offset: int) -> list[MatchRecord]:
+    """
+    Generates matches with 12 players each.
+    :param count: the amount of matches
+    :param offset: the index of the first match, used to generate unique hashes
+    :return: a list of MatchRecord instances
+    """
+    generator: random.Random = random.Random(offset)
+    return [MatchRecord(sha256(f"{offset + i}".encode()).hexdigest(), Path(f"{offset + i}.json"), datetime.now(),
+                        is_quickplay=False, is_hunter_dead=False, bloodline_rank=100, region="eu",
+                        players=tuple(PlayerRecord(j // 3, profile_id, f"Player {profile_id}",
+                                                   generator.randint(1000, 5000), kills=generator.randint(0, 2),
+                                                   deaths=generator.randint(0, 2))
+                                      for j, profile_id in enumerate(generator.sample(range(10 ** 6), 12))))
+            for i in range(count)]
+
+
+def main() -> None:
+    argument_parser: argparse.ArgumentParser = argparse.ArgumentParser(description=__doc__)
+    argument_parser.add_argument("--matches", type=int, default=500, help="matches submitted by each producer")
+    argument_parser.add_argument("--producers", type=int, default=4)
+    arguments: argparse.Namespace = argument_parser.parse_args()
+    batches: tuple[list[MatchRecord], ...] = tuple(generate_matches(arguments.matches, offset=i * arguments.matches)
+                                                   for i in range(arguments.producers))
+
+    for profile in DatabaseProfile:
+        for batch_size in (1, 64):
+            with tempfile.TemporaryDirectory() as directory:
+                database: DatabaseClient
+                writer: DatabaseWriter
+                with DatabaseClient(file_path=Path(directory) / "match_data.db", profile=profile) as database, \
+                        DatabaseWriter(database, batch_size=batch_size) as writer:
+                    futures: list[Future[bool]] = []
+
+                    def produce(matches: list[MatchRecord]) -> None:
+                        futures.extend([submit_match(writer, match) for match in matches])
+
+                    # Every producer submits its matches at once
+                    start: float = time.perf_counter()
+                    producers: list[threading.Thread] = [threading.Thread(target=produce, args=(matches,))
+                                                         for matches in batches]
+                    for producer in producers:
+                        producer.start()
+                    for producer in producers:
+                        producer.join()
+                    assert all(future.result() for future in futures)
+                    elapsed: float = time.perf_counter() - start
+
+            print(f"{profile:>12}, batch size {batch_size:>2}: {len(futures) / elapsed:8.0f} matches/s, "
+                  f"{writer.requests / writer.transactions:5.1f} matches/transaction")
+
+
+if __name__ == "__main__":
+    main()
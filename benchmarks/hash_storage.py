@@ -0,0 +1,90 @@
+"""Compares the legacy (hex text) and the compact (digest) match hash storage at a large history size."""
+import argparse
+import random
+import sqlite3
+import tempfile
+import time
+from contextlib import closing
+from hashlib import sha256
+from pathlib import Path
+
+from common import measure
+from hunt.constants import DATABASE_TABLE_QUERIES, MATCH_LOGS_PATH
+from hunt.database.migrations import migrate
+
+
+def create_legacy_database(file_path: Path, rows: int) -> list[str]:
+    """
+    Creates a database with the initial (unversioned) schema and fills the data hashes.
+    :param file_path: the path to the database
+    :param rows: the amount of match hashes
+    :return: the stored match hashes
+    """
+    match_hashes: list[str] = [sha256(f"{i}".encode()).hexdigest() for i in range(rows)]
+    with closing(sqlite3.connect(file_path)) as connection:
+        for query in DATABASE_TABLE_QUERIES:
+            connection.execute(query)
+        connection.executemany("INSERT INTO data_hashes (hash, path) VALUES (?, ?)", (
+            (match_hash, str(MATCH_LOGS_PATH / f"2023-{i % 12 + 1:02d}-01" / "bounty_hunt" / f"{i}.json"))
+            for i, match_hash in enumerate(match_hashes)))
+        connection.commit()
+        connection.execute("VACUUM")
+    return match_hashes
+
+
+def measure_lookups(file_path: Path, query: str, parameters: list[tuple[str | bytes]], repeat: int) -> float:
+    """
+    Measures looking up match hashes directly, without the hash cache.
+    :param file_path: the path to the database
+    :param query: the lookup query
+    :param parameters: the parameters of each lookup
+    :param repeat: the amount of times to repeat the measurement
+    :return: the median time per lookup in microseconds
+    """
+    with closing(sqlite3.connect(file_path)) as connection:
+        def look_up() -> None:
+            for parameter in parameters:
+                connection.execute(query, parameter).fetchone()
+
+        median, _ = measure(look_up, repeat=repeat)
+    return median * 1000 / len(parameters)
+
+
+def main() -> None:
+    argument_parser: argparse.ArgumentParser = argparse.ArgumentParser(description=__doc__)
+    argument_parser.add_argument("--rows", type=int, default=1_000_000)
+    argument_parser.add_argument("--lookups", type=int, default=10000)
+    argument_parser.add_argument("--repeat", type=int, default=5)
+    arguments: argparse.Namespace = argument_parser.parse_args()
+
+    generator: random.Random = random.Random(0)
+    with tempfile.TemporaryDirectory() as directory:
+        file_path: Path = Path(directory) / "match_data.db"
+        match_hashes: list[str] = create_legacy_database(file_path, arguments.rows)
+
+        # Half of the lookups are stored hashes, the other half are missing
+        lookups: list[str] = generator.sample(match_hashes, arguments.lookups // 2) + [
+            sha256(f"missing {i}".encode()).hexdigest() for i in range(arguments.lookups - arguments.lookups // 2)]
+        generator.shuffle(lookups)
+
+        query: str = "SELECT EXISTS(SELECT 1 FROM data_hashes WHERE hash = ?)"
+        legacy_size: int = file_path.stat().st_size
+        print(f"{'legacy':>8}: {legacy_size / 2 ** 20:7.1f} MiB, "
+              f"{measure_lookups(file_path, query, [(match_hash,) for match_hash in lookups], arguments.repeat):5.2f}"
+              " µs/lookup")
+
+        start: float = time.perf_counter()
+        with closing(sqlite3.connect(file_path)) as connection:
+            migrate(connection)
+            connection.execute("VACUUM")
+        print(f"Migrated {arguments.rows} rows in {time.perf_counter() - start:.1f} s")
+
+        compact_size: int = file_path.stat().st_size
+        print(f"{'compact':>8}: {compact_size / 2 ** 20:7.1f} MiB, "
+              f"{measure_lookups(file_path, query, [(bytes.fromhex(h),) for h in lookups], arguments.repeat):5.2f}"
+              " µs/lookup "
+              f"({legacy_size / compact_size:.1f}x smaller)")
+
+
+if __name__ == "__main__":
+    main()
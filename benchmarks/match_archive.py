@@ -0,0 +1,65 @@
+"""Compares loading the matches of the last week by scanning the match logs and through the match archive."""
+import argparse
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from common import generate_match_documents
+from hunt.attributes.archive import MatchArchive
+from hunt.attributes.codec import decode_match
+from hunt.attributes.match import Match
+from hunt.database.client import Client as DatabaseClient
+from hunt.database.queries import MatchRecord, insert_matches
+from hunt.filesystem.segments import SegmentLocation, SegmentLog
+
+
+def main() -> None:
+    argument_parser: argparse.ArgumentParser = argparse.ArgumentParser(description=__doc__)
+    argument_parser.add_argument("--matches", type=int, default=2000)
+    arguments: argparse.Namespace = argument_parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        # One match every 4 hours, the last week holds 43 matches
+        now: datetime = datetime(year=2023, month=6, day=1)
+        documents: list[bytes] = generate_match_documents(arguments.matches, Path(directory))
+        times: list[datetime] = [now - timedelta(hours=4 * i) for i in reversed(range(len(documents)))]
+        since: datetime = now - timedelta(days=7)
+
+        file_records: list[MatchRecord] = []
+        segment_records: list[MatchRecord] = []
+        segment_log: SegmentLog
+        with SegmentLog(Path(directory) / "segments") as segment_log:
+            for document, match_time in zip(documents, times):
+                match: Match = decode_match(document)
+                file_path: Path = Path(directory) / "logs" / f"{match_time:%Y-%m-%d}" / "bounty_hunt" / (
+                    f"{match_time:%H-%M-%S}.json")
+                file_path.parent.mkdir(parents=True, exist_ok=True)
+                file_path.write_bytes(document)
+                file_records.append(match.to_record(match.generate_hash(), file_path, match_time))
+                location: SegmentLocation = segment_log.append(document, match_time)
+                segment_records.append(match.to_record(match.generate_hash(), location.file_path, match_time,
+                                                       log_location=location))
+
+        # Every match log is read and decoded, the matches are filtered by the time of their path
+        start: float = time.perf_counter()
+        scanned_matches: list[Match] = [
+            match for file_path in sorted((Path(directory) / "logs").glob("*/*/*.json"))
+            if (match := decode_match(file_path.read_bytes())) and datetime.strptime(
+                f"{file_path.parent.parent.name} {file_path.stem}", "%Y-%m-%d %H-%M-%S") >= since]
+        print(f"    scan: {len(scanned_matches)} matches in {(time.perf_counter() - start) * 1000:8.1f} ms")
+
+        for name, records in (("files", file_records), ("segments", segment_records)):
+            database: DatabaseClient
+            archive: MatchArchive
+            with DatabaseClient(file_path=Path(directory) / f"{name}.db") as database, \
+                    MatchArchive(database) as archive:
+                insert_matches(database, records)
+                start = time.perf_counter()
+                archived_matches: list[Match] = list(archive.matches(since=since))
+                print(f"{name:>8}: {len(archived_matches)} matches in {(time.perf_counter() - start) * 1000:8.1f} ms")
+            assert archived_matches == scanned_matches
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""Compares the memory usage of a list of Match instances and of a MatchHistory holding the same matches."""
+import argparse
+import gc
+import tempfile
+import tracemalloc
+from dataclasses import replace
+from datetime import datetime
+from pathlib import Path
+from typing import Callable
+
+from common import generate_match_documents
+from hunt.attributes.codec import decode_match
+from hunt.attributes.history import MatchHistory
+from hunt.attributes.match import Match
+
+
+def measure_memory(build: Callable[[], object]) -> int:
+    """
+    Measures the memory retained by the result of a function.
+    :param build: the function which builds the result
+    :return: the retained memory in bytes
+    """
+    gc.collect()
+    tracemalloc.start()
+    result: object = build()
+    gc.collect()
+    retained: int = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    return retained
+
+
+def main() -> None:
+    argument_parser: argparse.ArgumentParser = argparse.ArgumentParser(description=__doc__)
+    argument_parser.add_argument("--matches", type=int, default=1000)
+    arguments: argparse.Namespace = argument_parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        documents: list[bytes] = generate_match_documents(arguments.matches, Path(directory))
+
+    def build_matches() -> list[Match]:
+        return [decode_match(document) for document in documents]
+
+    def build_teams() -> list[Match]:
+        # The accolades and the entries aren't stored by MatchHistory, the rewards summarize them
+        return [replace(decode_match(document), accolades=(), entries=()) for document in documents]
+
+    def build_history() -> MatchHistory:
+        history: MatchHistory = MatchHistory()
+        for document in documents:
+            history.append(decode_match(document), time=datetime.now())
+        return history
+
+    history_memory: int = measure_memory(build_history)
+    for name, build in (("list[Match]", build_matches), ("list[Match] (teams only)", build_teams),
+                        ("MatchHistory", build_history)):
+        memory: int = measure_memory(build)
+        print(f"{name:>24}: {memory / 1024:9.1f} KiB ({memory / len(documents):7.0f} B per match, "
+              f"{memory / history_memory:5.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""Compares the disk usage and the read throughput of the match log compression codecs."""
+import argparse
+import os
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+from common import generate_match_documents
+from hunt.attributes.codec import decode_match
+from hunt.filesystem.compression import MatchLogCompression, compress_file, read_match_log
+from hunt.filesystem.segments import SegmentLocation, SegmentLog, read_record
+
+
+def disk_usage(file_paths: list[Path]) -> tuple[int, int]:
+    """
+    Measures the size of files.
+    :param file_paths: the paths to the files
+    :return: the size of the files and the size of the blocks allocated to them, in bytes
+    """
+    results: list[os.stat_result] = [file_path.stat() for file_path in file_paths]
+    return sum(result.st_size for result in results), sum(getattr(result, "st_blocks", 0) * 512 for result in results)
+
+
+def main() -> None:
+    argument_parser: argparse.ArgumentParser = argparse.ArgumentParser(description=__doc__)
+    argument_parser.add_argument("--matches", type=int, default=1000)
+    arguments: argparse.Namespace = argument_parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        documents: list[bytes] = generate_match_documents(arguments.matches, Path(directory))
+        for compression in MatchLogCompression:
+            # One match log file per match, compressed the way archived day directories are
+            files_path: Path = Path(directory) / f"files_{compression}"
+            files_path.mkdir()
+            file_paths: list[Path] = []
+            for i, document in enumerate(documents):
+                file_path: Path = files_path / f"{i:06d}.json"
+                file_path.write_bytes(document)
+                file_paths.append(file_path)
+            start: float = time.perf_counter()
+            if compression != MatchLogCompression.NONE:
+                file_paths = [compress_file(file_path, compression) for file_path in file_paths]
+                for file_path in files_path.glob("*.json"):
+                    file_path.unlink()
+            compress_time: float = time.perf_counter() - start
+            size, allocated = disk_usage(file_paths)
+
+            start = time.perf_counter()
+            for file_path in file_paths:
+                decode_match(read_match_log(file_path))
+            read_time: float = time.perf_counter() - start
+
+            # One record per match in a segment, compressed when it's appended
+            segment_log: SegmentLog
+            with SegmentLog(Path(directory) / f"segments_{compression}", compression=compression) as segment_log:
+                locations: list[SegmentLocation] = [segment_log.append(document, datetime.now())
+                                                    for document in documents]
+            segment_size, _ = disk_usage(sorted({location.file_path for location in locations}))
+            start = time.perf_counter()
+            for location in locations:
+                decode_match(read_record(location).payload)
+            segment_read_time: float = time.perf_counter() - start
+
+            print(f"{compression:>5}: files: {size / 1024:8.1f} KiB ({allocated / 1024:8.1f} KiB allocated), "
+                  f"compressed in {compress_time * 1000:7.1f} ms, read {len(documents) / read_time:6.0f} matches/s; "
+                  f"segments: {segment_size / 1024:8.1f} KiB, read {len(documents) / segment_read_time:6.0f} "
+                  "matches/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,34 @@
+"""Compares the parser backends of hunt.attributes.parser on a generated attributes file."""
+import argparse
+import tempfile
+from pathlib import Path
+
+from common import DEFAULT_FILLER_ATTRIBUTES, measure, write_attributes_file
+from hunt.attributes.parser import Match, ParserBackend, parse_match, read_attributes
+
+
+def main() -> None:
+    argument_parser: argparse.ArgumentParser = argparse.ArgumentParser(description=__doc__)
+    argument_parser.add_argument("--filler-attributes", type=int, default=DEFAULT_FILLER_ATTRIBUTES)
+    argument_parser.add_argument("--repeat", type=int, default=20)
+    arguments: argparse.Namespace = argument_parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        file_path: Path = write_attributes_file(Path(directory), arguments.filler_attributes)
+        print(f"File size: {file_path.stat().st_size / 1024:.0f} KiB")
+
+        matches: dict[ParserBackend, Match] = {}
+        baseline: float | None = None
+        for backend in ParserBackend:
+            def parse(parser_backend: ParserBackend = backend) -> None:
+                matches[parser_backend] = parse_match(read_attributes(file_path, backend=parser_backend), "Player")
+
+            median, deviation = measure(parse, repeat=arguments.repeat)
+            baseline = baseline or median
+            print(f"{backend:>12}: {median:8.2f} ms ± {deviation:5.2f} ms ({baseline / median:5.1f}x)")
+
+        assert len(set(matches.values())) == 1, "Every backend should produce the same Match."
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""Measures the startup time of the CLI: the import time of the entry point and the time until matches are watched."""
+import argparse
+import os
+import signal
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# The startup budget in milliseconds, tracked across releases (see README.md)
+STARTUP_BUDGETS: dict[str, float] = {
+    "import": 120,
+    "backfill": 300,
+    "watching": 300,
+}
+
+
+def measure_import_time() -> float:
+    """
+    Measures the cumulative import time of the CLI entry point with `-X importtime`.
+    :return: the import time in milliseconds
+    """
+    process: subprocess.CompletedProcess[str] = subprocess.run(
+        (sys.executable, "-X", "importtime", "-c", "import hunt.cli.app"), capture_output=True, text=True, check=True)
+    # The last line is the entry point: "import time: self [us] | cumulative | imported package"
+    return int(process.stderr.splitlines()[-1].split("|")[1]) / 1000
+
+
+def measure_backfill_time(directory: Path) -> float:
+    """
+    Measures the wall-clock time of a short-lived command, backfilling an empty match logs directory.
+    :param directory: the working directory of the CLI
+    :return: the wall-clock time in milliseconds
+    """
+    start: float = time.perf_counter()
+    subprocess.run((sys.executable, "-m", "hunt.cli.app", "backfill", str(directory / "empty")),
+                   cwd=directory, capture_output=True, check=True)
+    return (time.perf_counter() - start) * 1000
+
+
+def measure_watching_time(directory: Path) -> float:
+    """
+    Measures the wall-clock time until the CLI logs "Watching for matches" in the headless mode.
+    :param directory: the working directory of the CLI
+    :return: the wall-clock time in milliseconds
+    """
+    attributes_path: Path = directory / "attributes.xml"
+    attributes_path.touch()
+    start: float = time.perf_counter()
+    process: subprocess.Popen[str] = subprocess.Popen(
+        (sys.executable, "-m", "hunt.cli.app", "--headless", "--watcher", "polling",
+         "--source", str(attributes_path), "Player", str(directory / "match_data.db")),
+        cwd=directory, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+    try:
+        assert process.stdout is not None
+        for line in process.stdout:
+            if "Watching for matches" in line:
+                return (time.perf_counter() - start) * 1000
+        raise RuntimeError("The CLI exited before watching for matches.")
+    finally:
+        process.send_signal(signal.SIGINT if os.name != "nt" else signal.CTRL_C_EVENT)
+        process.communicate()
+
+
+def main() -> None:
+    argument_parser: argparse.ArgumentParser = argparse.ArgumentParser(description=__doc__)
+    argument_parser.add_argument("--repeat", type=int, default=10)
+    arguments: argparse.Namespace = argument_parser.parse_args()
+
+    samples: dict[str, list[float]] = {name: [] for name in STARTUP_BUDGETS}
+    for _ in range(arguments.repeat):
+        with tempfile.TemporaryDirectory() as directory:
+            (Path(directory) / "empty").mkdir()
+            samples["import"].append(measure_import_time())
+            samples["backfill"].append(measure_backfill_time(Path(directory)))
+            samples["watching"].append(measure_watching_time(Path(directory)))
+
+    over_budget: bool = False
+    for name, budget in STARTUP_BUDGETS.items():
+        median: float = statistics.median(samples[name])
+        over_budget |= median > budget
+        print(f"{name:>10}: {median:7.1f} ms (budget: {budget:5.0f} ms){'  OVER BUDGET' if median > budget else ''}")
+    raise SystemExit(1 if over_budget else 0)
+
+
+if __name__ == "__main__":
+    main()
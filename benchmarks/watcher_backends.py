@@ -0,0 +1,49 @@
+"""Measures the wakeups and the CPU time of each watcher backend while unrelated files in the directory change."""
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from hunt.exceptions import UnsupportedPlatformError
+from hunt.filesystem.watchdog import FileWatcher
+from hunt.filesystem.watchers import WatcherBackend, create_file_watcher
+
+
+def main() -> None:
+    argument_parser: argparse.ArgumentParser = argparse.ArgumentParser(description=__doc__)
+    argument_parser.add_argument("--duration", type=float, default=10.0)
+    argument_parser.add_argument("--unrelated-writes", type=int, default=50, help="unrelated writes per second")
+    argument_parser.add_argument("--poll-interval", type=float, default=1.0)
+    arguments: argparse.Namespace = argument_parser.parse_args()
+
+    for backend in WatcherBackend:
+        with tempfile.TemporaryDirectory() as directory:
+            file_path: Path = Path(directory) / "attributes.xml"
+            file_path.touch()
+            invocations: list[Path] = []
+            try:
+                file_watcher: FileWatcher = create_file_watcher(backend, file_path, invocations.append,
+                                                                poll_interval=arguments.poll_interval)
+            except UnsupportedPlatformError:
+                print(f"{backend:>10}: unsupported on the current platform")
+                continue
+            file_watcher.start()
+
+            # The game rewrites other files in the profile directory, the attributes file is written once
+            end: float = time.monotonic() + arguments.duration
+            i: int = 0
+            while time.monotonic() < end:
+                (Path(directory) / f"unrelated_{i % 10}.xml").write_text(f"{i}")
+                if i == 0:
+                    file_path.write_text("match data")
+                i += 1
+                time.sleep(1 / arguments.unrelated_writes)
+
+            file_watcher.stop()
+            file_watcher.join()
+        print(f"{backend:>10}: {file_watcher.wakeups:6} wakeup(s), "
+              f"{file_watcher.cpu_time * 1000:8.1f} ms of CPU time, {len(invocations)} callback(s)")
+
+
+if __name__ == "__main__":
+    main()
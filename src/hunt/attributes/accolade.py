@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 
-from .xml.serializable import MappingGenerator, Serializable, XmlElement
+from .xml.serializable import AttributeSource, MappingGenerator, Serializable, XmlElement
 
 
 @dataclass(frozen=True)
@@ -65,7 +65,7 @@ class Accolade(Serializable):
 
     # noinspection PyMethodOverriding
     @classmethod
-    def deserialize(cls, root: XmlElement, accolade_id: int) -> Accolade:  # type: ignore[override]
+    def deserialize(cls, root: AttributeSource, accolade_id: int) -> Accolade:  # type: ignore[override]
         """
         Deserialize a series of elements into an Accolade instance.
         :param root: the root element to serialize into
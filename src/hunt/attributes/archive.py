@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+from contextlib import closing
+from datetime import datetime
+from pathlib import Path
+from types import TracebackType
+from typing import Generator
+
+from .codec import decode_match
+from .match import Match
+from ..database.queries import ArchivedMatchLog, DatabaseClient, count_matches, fetch_archived_match_logs
+from ..filesystem.compression import read_match_log
+from ..filesystem.segments import SegmentLocation, SegmentReader
+
+
+class MatchArchive:
+    database: DatabaseClient
+    _segment_reader: SegmentReader
+
+    def __init__(self, database: DatabaseClient):
+        """
+        Initialize the class.
+        The saved matches are located by the time index of the database, match logs stored in segments are read from
+          memory-mapped segments and match log files are read one at a time.
+        :param database: a DatabaseClient instance
+        """
+        self.database = database
+        self._segment_reader = SegmentReader()
+
+    def __len__(self) -> int:
+        """
+        Counts the saved matches.
+        :return: the amount of saved matches
+        """
+        return count_matches(self.database)
+
+    def __getitem__(self, index: int) -> ArchivedMatchLog:
+        """
+        Locates a saved match by its position in time order.
+        :param index: the position of the match, negative positions count from the most recent match
+        :return: an ArchivedMatchLog instance
+        :raises IndexError: if there's no match at the position
+        """
+        if index < 0:
+            index += len(self)
+        match_log: ArchivedMatchLog | None = None
+        if index >= 0:
+            match_logs: Generator[ArchivedMatchLog, None, None]
+            with closing(fetch_archived_match_logs(self.database, offset=index)) as match_logs:
+                match_log = next(match_logs, None)
+        if match_log is None:
+            raise IndexError(f"There's no match at {index}.")
+        return match_log
+
+    def match_logs(self, since: datetime | None = None, until: datetime | None = None,
+                   is_quickplay: bool | None = None) -> Generator[ArchivedMatchLog, None, None]:
+        """
+        Locates the saved matches in a time range, without reading their match logs.
+        :param since: if provided, only matches from this point in time onwards are located
+        :param until: if provided, only matches before this point in time are located
+        :param is_quickplay: if provided, only quickplay (True) or bounty hunt (False) matches are located
+        :return: a generator which yields an ArchivedMatchLog instance for each match, in time order
+        """
+        return fetch_archived_match_logs(self.database, since=since, until=until, is_quickplay=is_quickplay)
+
+    def read(self, match_log: ArchivedMatchLog) -> bytes:
+        """
+        Reads the JSON document of a saved match.
+        :param match_log: the ArchivedMatchLog instance of the match
+        :return: the JSON document of the match
+        :raises OSError: if the match log can't be read
+        :raises ParserError: if the match log is corrupted
+        """
+        location: Path | SegmentLocation = match_log.location
+        if isinstance(location, SegmentLocation):
+            return self._segment_reader.read(location).payload
+        return read_match_log(location)
+
+    def load(self, match_log: ArchivedMatchLog) -> Match:
+        """
+        Loads a saved match.
+        :param match_log: the ArchivedMatchLog instance of the match
+        :return: a Match instance
+        :raises OSError: if the match log can't be read
+        :raises ParserError: if the match log is corrupted
+        """
+        return decode_match(self.read(match_log))
+
+    def matches(self, since: datetime | None = None, until: datetime | None = None,
+                is_quickplay: bool | None = None) -> Generator[Match, None, None]:
+        """
+        Loads the saved matches in a time range lazily, only the match logs in the range are read.
+        :param since: if provided, only matches from this point in time onwards are loaded
+        :param until: if provided, only matches before this point in time are loaded
+        :param is_quickplay: if provided, only quickplay (True) or bounty hunt (False) matches are loaded
+        :return: a generator which yields a Match instance for each match, in time order
+        :raises OSError: if a match log can't be read
+        :raises ParserError: if a match log is corrupted
+        """
+        for match_log in self.match_logs(since=since, until=until, is_quickplay=is_quickplay):
+            yield self.load(match_log)
+
+    def close(self) -> None:
+        """Unmaps the segments, the database is closed by its owner."""
+        self._segment_reader.close()
+
+    # Context manager support
+    def __enter__(self) -> MatchArchive:
+        """Return self when entering the scope."""
+        return self
+
+    def __exit__(self, exc_type: type[BaseException] | None, exc_val: BaseException | None,
+                 exc_tb: TracebackType | None) -> None:
+        """Unmap the segments when exiting the scope."""
+        self.close()
@@ -0,0 +1,10 @@
+from enum import StrEnum
+
+
+class ParserBackend(StrEnum):
+    # Builds the full element tree
+    ELEMENT_TREE = "elementtree"
+    # Incrementally parses the file, keeping only the match attributes
+    STREAMING = "streaming"
+    # Memory-maps the file and extracts the match attributes from the raw bytes
+    SCANNER = "scanner"
@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+import builtins
+import json
+from dataclasses import dataclass, fields, is_dataclass
+from functools import cache
+from hashlib import sha256
+from json.encoder import encode_basestring_ascii
+from typing import TYPE_CHECKING, Any, Callable, TypeAlias, get_args, get_origin, get_type_hints
+
+from ..exceptions import ParserError
+
+if TYPE_CHECKING:
+    from .match import Match
+
+# Variables which are excluded from the match hash to prevent entry spamming
+_HASH_EXCLUDED_FIELDS: frozenset[str] = frozenset(("bloodline_rank", "region", "secondary_region"))
+_INDENT: str = "  "
+# Decodes a JSON value into a field value
+_Decoder: TypeAlias = Callable[[Any], Any]
+
+
+class _DiscardedOutput(list[str]):
+    """An output which discards everything appended to it."""
+
+    def append(self, _: str) -> None:
+        """Discard the value."""
+
+
+_DISCARDED_OUTPUT: list[str] = _DiscardedOutput()
+
+
+@dataclass(frozen=True)
+class EncodedMatch:
+    # A sha256 hex digest of the canonical (compact) encoding, without the variables excluded from the hash
+    digest: str
+    # The indented JSON document written to the match logs
+    document: str
+
+
+@cache
+def _field_table(cls: type) -> tuple[tuple[str, str], ...]:
+    """
+    Resolves the field names of a dataclass and their encoded JSON keys once per class.
+    :param cls: a dataclass
+    :return: a tuple of (field name, encoded key) tuples, in declaration order
+    """
+    assert is_dataclass(cls), "The class should be a dataclass."
+    return tuple((field.name, encode_basestring_ascii(field.name)) for field in fields(cls))
+
+
+def _encode(value: object, compact: list[str], indented: list[str], indent: str,
+            excluded_fields: frozenset[str] = frozenset()) -> None:
+    """
+    Encodes a value into the compact and the indented JSON output at the same time.
+    The outputs match json.dumps(asdict(value)) and json.dumps(value, indent=2, default=vars) respectively.
+    :param value: a dataclass instance, a tuple, or a scalar value
+    :param compact: the compact output
+    :param indented: the indented output
+    :param indent: the indentation of the value
+    :param excluded_fields: dataclass fields which are excluded from the compact output
+    :raises TypeError: if the value isn't supported
+    """
+    encoded: str
+    if isinstance(value, str):
+        encoded = encode_basestring_ascii(value)
+    elif isinstance(value, bool):
+        encoded = "true" if value else "false"
+    elif isinstance(value, int):
+        encoded = int.__repr__(value)
+    elif isinstance(value, tuple):
+        if not value:
+            compact.append("[]")
+            indented.append("[]")
+            return
+
+        item_indent: str = indent + _INDENT
+        compact.append("[")
+        indented.append("[\n" + item_indent)
+        for i, item in enumerate(value):
+            if i:
+                compact.append(", ")
+                indented.append(",\n" + item_indent)
+            _encode(item, compact, indented, item_indent)
+        compact.append("]")
+        indented.append("\n" + indent + "]")
+        return
+    elif is_dataclass(value):
+        field_indent: str = indent + _INDENT
+        compact.append("{")
+        indented.append("{\n" + field_indent)
+
+        compact_separator: str = ""
+        for i, (field_name, encoded_key) in enumerate(_field_table(value.__class__)):
+            if i:
+                indented.append(",\n" + field_indent)
+            indented.append(encoded_key + ": ")
+
+            # Excluded fields are only encoded into the indented output
+            if field_name in excluded_fields:
+                _encode(getattr(value, field_name), _DISCARDED_OUTPUT, indented, field_indent)
+                continue
+            compact.append(compact_separator + encoded_key + ": ")
+            compact_separator = ", "
+            _encode(getattr(value, field_name), compact, indented, field_indent)
+        compact.append("}")
+        indented.append("\n" + indent + "}")
+        return
+    else:
+        raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+    compact.append(encoded)
+    indented.append(encoded)
+
+
+def encode_match(match: Match, document: bool = True) -> EncodedMatch:
+    """
+    Encodes a match into its hash and its JSON document in a single pass, without intermediate dictionaries.
+    The hash is compatible with hashes generated from json.dumps(dataclasses.asdict(match)).
+    :param match: a Match instance
+    :param document: False if only the hash is required, the document is left empty
+    :return: an EncodedMatch instance
+    """
+    compact: list[str] = []
+    indented: list[str] = [] if document else _DISCARDED_OUTPUT
+    _encode(match, compact, indented, indent="", excluded_fields=_HASH_EXCLUDED_FIELDS)
+
+    return EncodedMatch(digest=sha256("".join(compact).encode()).hexdigest(), document="".join(indented))
+
+
+def _decode_scalar(result_type: type) -> _Decoder:
+    """
+    Creates a decoder which validates the type of scalar JSON values.
+    :param result_type: the expected type
+    :return: a decoder function
+    """
+    def decode(value: Any) -> Any:
+        # Booleans are integers, but integers aren't booleans
+        if not isinstance(value, result_type) or (result_type is int and isinstance(value, bool)):
+            raise ParserError(f"Expected a value of type {result_type.__name__}, got {value!r}.")
+        return value
+    return decode
+
+
+@cache
+def _decoder(value_type: Any) -> _Decoder:
+    """
+    Resolves the decoder of a field type once per type.
+    :param value_type: a dataclass, a variadic tuple type, or a scalar type
+    :return: a decoder function
+    :raises ParserError: if the type isn't supported
+    """
+    if value_type in (builtins.str, builtins.int, builtins.bool):
+        return _decode_scalar(value_type)
+    if get_origin(value_type) is tuple:
+        item_decoder: _Decoder = _decoder(get_args(value_type)[0])
+
+        def decode_tuple(value: Any) -> tuple[Any, ...]:
+            if not isinstance(value, list):
+                raise ParserError(f"Expected a list, got {value!r}.")
+            return tuple(item_decoder(item) for item in value)
+        return decode_tuple
+    if isinstance(value_type, type) and is_dataclass(value_type):
+        dataclass_type: type = value_type
+        type_hints: dict[str, Any] = get_type_hints(dataclass_type)
+        field_decoders: tuple[tuple[str, _Decoder], ...] = tuple(
+            (field.name, _decoder(type_hints[field.name])) for field in fields(dataclass_type))
+
+        def decode_dataclass(value: Any) -> Any:
+            if not isinstance(value, dict) or len(value) != len(field_decoders):
+                raise ParserError(f"Expected an object with the fields of {dataclass_type.__name__}.")
+            try:
+                return dataclass_type(*(decoder(value[name]) for name, decoder in field_decoders))
+            except KeyError as exception:
+                raise ParserError(f"Missing field {exception} of {dataclass_type.__name__}.") from exception
+        return decode_dataclass
+    raise ParserError(f"Decoding {value_type!r} isn't supported.")
+
+
+def decode_match(document: str | bytes) -> Match:
+    """
+    Decodes a match from the JSON document written to the match logs, the inverse of encode_match.
+    :param document: an indented (or compact) JSON document
+    :return: a Match instance
+    :raises ParserError: if the document isn't valid JSON or doesn't describe a match
+    """
+    from .match import Match
+
+    try:
+        match_data: Any = json.loads(document)
+    except ValueError as exception:  # JSONDecodeError and UnicodeDecodeError
+        raise ParserError("The match document isn't valid JSON.") from exception
+    match: Match = _decoder(Match)(match_data)
+    return match
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 
-from .xml.serializable import MappingGenerator, Serializable, XmlElement
+from .xml.serializable import AttributeSource, MappingGenerator, Serializable, XmlElement
 
 
 @dataclass(frozen=True)
@@ -55,7 +55,7 @@ class Entry(Serializable):
 
     # noinspection PyMethodOverriding
     @classmethod
-    def deserialize(cls, root: XmlElement, entry_id: int) -> Entry:  # type: ignore[override]
+    def deserialize(cls, root: AttributeSource, entry_id: int) -> Entry:  # type: ignore[override]
         """
         Deserialize a series of elements into an Entry instance.
         :param root: the root element to serialize into
@@ -0,0 +1,44 @@
+from dataclasses import dataclass, field
+
+from ..database.queries import Cursor, DatabaseClient, get_application_state, set_application_state, \
+    write_application_state
+
+# The application state key of the last processed fingerprint
+_FINGERPRINT_STATE_KEY: str = "attributes_fingerprint"
+
+
+@dataclass(kw_only=True)
+class FingerprintTracker:
+    database: DatabaseClient
+    # The name of the source of the attributes file, if multiple sources share the database
+    source: str | None = None
+    _state_key: str = field(init=False)
+    _fingerprint: str | None = None
+
+    def __post_init__(self) -> None:
+        """Restore the last processed fingerprint."""
+        self._state_key = _FINGERPRINT_STATE_KEY if self.source is None else f"{_FINGERPRINT_STATE_KEY}:{self.source}"
+        self._fingerprint = get_application_state(self.database, key=self._state_key)
+
+    def is_unchanged(self, fingerprint: str) -> bool:
+        """
+        Checks if a fingerprint matches the last processed fingerprint.
+        :param fingerprint: a fingerprint generated by fingerprint_match_attributes
+        :return: True if the match data was already processed, otherwise False
+        """
+        return fingerprint == self._fingerprint
+
+    def update(self, fingerprint: str, cursor: Cursor | None = None) -> None:
+        """
+        Marks a fingerprint as processed and persists it, so it isn't processed again after a restart.
+        :param fingerprint: a fingerprint generated by fingerprint_match_attributes
+        :param cursor: if provided, the fingerprint is persisted in the transaction of the cursor
+        """
+        if self.is_unchanged(fingerprint):
+            return
+
+        if cursor is not None:
+            write_application_state(cursor, key=self._state_key, value=fingerprint)
+        else:
+            set_application_state(self.database, key=self._state_key, value=fingerprint)
+        self._fingerprint = fingerprint
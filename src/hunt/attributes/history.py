@@ -0,0 +1,242 @@
+from __future__ import annotations
+
+from array import array
+from dataclasses import dataclass, field
+from datetime import datetime
+from functools import partial
+from typing import Any
+
+from .archive import MatchArchive
+from .match import Match
+
+# The reward and player fields stored as-is, in the order of their columns
+_REWARD_FIELDS: tuple[str, ...] = ("bounty", "xp", "hunt_dollars", "bloodbonds", "hunter_xp", "hunter_levels",
+                                   "upgrade_points", "bloodline_xp", "event_points")
+_PLAYER_FIELDS: tuple[str, ...] = ("profile_id", "mmr", "bounties_extracted", "bounties_picked_up", "downed_by_me",
+                                   "downed_by_teammate", "downed_me", "downed_teammate", "killed_by_me",
+                                   "killed_by_teammate", "killed_me", "killed_teammate", "had_wellspring",
+                                   "is_partner", "is_soul_survivor", "proximity_to_me", "proximity_to_teammate",
+                                   "skillbased", "team_extraction")
+
+
+def _column(typecode: str) -> Any:
+    """
+    Declares a typed column of a dataclass.
+    :param typecode: the array typecode of the column
+    :return: a dataclass field which defaults to an empty array
+    """
+    return field(default_factory=partial(array, typecode))
+
+
+class StringTable:
+    strings: list[str]
+    _ids: dict[str, int]
+
+    def __init__(self) -> None:
+        """
+        Initialize the class.
+        Every distinct string is stored once, columns store the id of the string instead.
+        """
+        self.strings = []
+        self._ids = {}
+
+    def intern(self, value: str) -> int:
+        """
+        Gets the id of a string, adding it to the table if it's new.
+        :param value: the string
+        :return: the id of the string
+        """
+        string_id: int | None = self._ids.get(value)
+        if string_id is None:
+            string_id = self._ids[value] = len(self.strings)
+            self.strings.append(value)
+        return string_id
+
+    def __getitem__(self, string_id: int) -> str:
+        """
+        Gets a string by its id.
+        :param string_id: the id of the string
+        :return: the string
+        """
+        return self.strings[string_id]
+
+    def __len__(self) -> int:
+        """
+        Counts the distinct strings.
+        :return: the amount of strings in the table
+        """
+        return len(self.strings)
+
+
+@dataclass(frozen=True)
+class MatchColumns:
+    # The time the match was saved (a UNIX timestamp)
+    time: array[int] = _column("q")
+    # The local player's name and the regions (string ids)
+    player_name: array[int] = _column("I")
+    region: array[int] = _column("I")
+    secondary_region: array[int] = _column("I")
+    bloodline_rank: array[int] = _column("H")
+    is_hunter_dead: array[int] = _column("B")
+    is_quickplay: array[int] = _column("B")
+    # Rewards
+    bounty: array[int] = _column("i")
+    xp: array[int] = _column("i")
+    hunt_dollars: array[int] = _column("i")
+    bloodbonds: array[int] = _column("i")
+    hunter_xp: array[int] = _column("i")
+    hunter_levels: array[int] = _column("i")
+    upgrade_points: array[int] = _column("i")
+    bloodline_xp: array[int] = _column("i")
+    event_points: array[int] = _column("i")
+    # The index of the first team of the match, the teams of a match are stored contiguously
+    first_team: array[int] = _column("I")
+
+
+@dataclass(frozen=True)
+class TeamColumns:
+    # The index of the match of the team
+    match: array[int] = _column("I")
+    handicap: array[int] = _column("i")
+    is_invite: array[int] = _column("B")
+    mmr: array[int] = _column("i")
+    own_team: array[int] = _column("B")
+    # The index of the first player of the team, the players of a team are stored contiguously
+    first_player: array[int] = _column("I")
+
+
+@dataclass(frozen=True)
+class PlayerColumns:
+    # The index of the team of the player
+    team: array[int] = _column("I")
+    # The name of the player (a string id)
+    name: array[int] = _column("I")
+    profile_id: array[int] = _column("q")
+    mmr: array[int] = _column("i")
+    # The counters are signed, the attributes file doesn't guarantee non-negative values
+    bounties_extracted: array[int] = _column("h")
+    bounties_picked_up: array[int] = _column("h")
+    downed_by_me: array[int] = _column("h")
+    downed_by_teammate: array[int] = _column("h")
+    downed_me: array[int] = _column("h")
+    downed_teammate: array[int] = _column("h")
+    killed_by_me: array[int] = _column("h")
+    killed_by_teammate: array[int] = _column("h")
+    killed_me: array[int] = _column("h")
+    killed_teammate: array[int] = _column("h")
+    had_wellspring: array[int] = _column("B")
+    is_partner: array[int] = _column("B")
+    is_soul_survivor: array[int] = _column("B")
+    proximity_to_me: array[int] = _column("B")
+    proximity_to_teammate: array[int] = _column("B")
+    skillbased: array[int] = _column("B")
+    team_extraction: array[int] = _column("B")
+
+
+class MatchHistory:
+    strings: StringTable
+    matches: MatchColumns
+    teams: TeamColumns
+    players: PlayerColumns
+
+    def __init__(self) -> None:
+        """
+        Initialize the class.
+        The matches, the teams and the players are stored in typed columns (one array per field), the rows of a table
+          are addressed by their index. Accolades and entries aren't stored, the rewards of a match summarize them.
+        """
+        self.strings = StringTable()
+        self.matches = MatchColumns()
+        self.teams = TeamColumns()
+        self.players = PlayerColumns()
+
+    def __len__(self) -> int:
+        """
+        Counts the matches.
+        :return: the amount of matches in the history
+        """
+        return len(self.matches.time)
+
+    def append(self, match: Match, time: datetime | None = None) -> int:
+        """
+        Appends a match, e.g. the result of parse_match.
+        :param match: a Match instance
+        :param time: the time the match was saved, the current time if omitted
+        :return: the index of the match
+        """
+        if time is None:
+            time = datetime.now()
+        match_index: int = len(self)
+        self.matches.time.append(int(time.timestamp()))
+        self.matches.player_name.append(self.strings.intern(match.player_name))
+        self.matches.region.append(self.strings.intern(match.region))
+        self.matches.secondary_region.append(self.strings.intern(match.secondary_region))
+        self.matches.bloodline_rank.append(match.bloodline_rank)
+        self.matches.is_hunter_dead.append(match.is_hunter_dead)
+        self.matches.is_quickplay.append(match.is_quickplay)
+        for field_name in _REWARD_FIELDS:
+            getattr(self.matches, field_name).append(getattr(match.rewards, field_name))
+        self.matches.first_team.append(len(self.teams.match))
+
+        for team in match.teams:
+            team_index: int = len(self.teams.match)
+            self.teams.match.append(match_index)
+            self.teams.handicap.append(team.handicap)
+            self.teams.is_invite.append(team.is_invite)
+            self.teams.mmr.append(team.mmr)
+            self.teams.own_team.append(team.own_team)
+            self.teams.first_player.append(len(self.players.team))
+            for player in team.players:
+                self.players.team.append(team_index)
+                self.players.name.append(self.strings.intern(player.name))
+                for field_name in _PLAYER_FIELDS:
+                    getattr(self.players, field_name).append(getattr(player, field_name))
+        return match_index
+
+    def extend(self, archive: MatchArchive, since: datetime | None = None, until: datetime | None = None,
+               is_quickplay: bool | None = None) -> int:
+        """
+        Appends the saved matches in a time range, in time order.
+        :param archive: a MatchArchive instance
+        :param since: if provided, only matches from this point in time onwards are appended
+        :param until: if provided, only matches before this point in time are appended
+        :param is_quickplay: if provided, only quickplay (True) or bounty hunt (False) matches are appended
+        :return: the amount of appended matches
+        :raises OSError: if a match log can't be read
+        :raises ParserError: if a match log is corrupted
+        """
+        appended_matches: int = 0
+        for match_log in archive.match_logs(since=since, until=until, is_quickplay=is_quickplay):
+            self.append(archive.load(match_log), time=match_log.time)
+            appended_matches += 1
+        return appended_matches
+
+    def team_range(self, match_index: int) -> range:
+        """
+        Locates the teams of a match.
+        :param match_index: the index of the match
+        :return: the indices of the teams of the match
+        """
+        end: int = self.matches.first_team[match_index + 1] if match_index + 1 < len(self) else len(self.teams.match)
+        return range(self.matches.first_team[match_index], end)
+
+    def player_range(self, team_index: int) -> range:
+        """
+        Locates the players of a team.
+        :param team_index: the index of the team
+        :return: the indices of the players of the team
+        """
+        end: int = self.teams.first_player[team_index + 1] if team_index + 1 < len(self.teams.match) \
+            else len(self.players.team)
+        return range(self.teams.first_player[team_index], end)
+
+    def match_player_range(self, match_index: int) -> range:
+        """
+        Locates the players of a match.
+        :param match_index: the index of the match
+        :return: the indices of the players of the match
+        """
+        teams: range = self.team_range(match_index)
+        if not teams:
+            return range(0)
+        return range(self.player_range(teams.start).start, self.player_range(teams.stop - 1).stop)
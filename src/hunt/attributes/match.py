@@ -1,15 +1,18 @@
-import json
-from dataclasses import asdict, dataclass
-from datetime import datetime
-from hashlib import sha256
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timedelta
 from pathlib import Path
 
 from .accolade import Accolade
+from .codec import EncodedMatch, decode_match, encode_match
 from .entry import Entry
 from .rewards import Rewards
 from .team import Team
 from ..constants import MATCH_LOGS_PATH
-from ..database.queries import DatabaseClient, data_hash_exists, insert_match_hash, update_player_data
+from ..database.queries import Cursor, DatabaseClient, MatchRecord, PlayerRecord, data_hash_exists, \
+    fetch_match_log, write_match
+from ..filesystem.compression import read_match_log
+from ..filesystem.segments import SegmentLocation, SegmentLog, read_record
 
 
 @dataclass(frozen=True)
@@ -43,15 +46,25 @@ class Match:
         Some variables are removed to prevent duplicates.
         :return: a sha256 hash digest
         """
-        # Convert the current instance to a dictionary
-        match_data: dict = asdict(self)
+        return encode_match(self, document=False).digest
 
-        # Remove certain variables to prevent entry spamming
-        del match_data["bloodline_rank"]
-        del match_data["region"]
-        del match_data["secondary_region"]
-
-        return sha256(json.dumps(match_data).encode()).hexdigest()
+    def to_record(self, match_hash: str, file_path: Path, time: datetime,
+                  log_location: SegmentLocation | None = None) -> MatchRecord:
+        """
+        Generates a database record of the match.
+        :param match_hash: the hash of the match
+        :param file_path: the file path of the match data (the segment if the match data is stored in a segment)
+        :param time: the time the match was saved
+        :param log_location: the location of the match data in a segment, if it's stored in a segment
+        :return: a MatchRecord instance
+        """
+        return MatchRecord(match_hash, file_path, time, self.is_quickplay, self.is_hunter_dead, self.bloodline_rank,
+                           self.region,
+                           players=tuple(PlayerRecord(team_id, player.profile_id, player.name, player.mmr,
+                                                      kills=player.killed_by_me + player.downed_by_me,
+                                                      deaths=player.killed_me + player.downed_me)
+                                         for team_id, team in enumerate(self.teams) for player in team.players),
+                           log_location=log_location)
 
     def try_save_to_file(self, database: DatabaseClient) -> bool:
         """
@@ -60,37 +73,96 @@ class Match:
         :param database: a DatabaseClient instance
         :return: True if this entry already exists in the database, otherwise False.
         """
+        # Save the match and update the player log in a single transaction
+        cursor: Cursor
+        with database.transaction() as cursor:
+            match_hash: str | None = self.write(cursor, database=database)
+        if match_hash is None:
+            return True
+
+        database.hash_cache.add(match_hash)
+        return False
+
+    def write(self, cursor: Cursor, database: DatabaseClient, segment_log: SegmentLog | None = None) -> str | None:
+        """
+        Converts the match data to json and saves it to the file path and the database in the current transaction,
+          if the match data hasn't already been saved. The match hash is cached by the caller once committed.
+        :param cursor: the cursor of the current transaction
+        :param database: the DatabaseClient instance of the transaction
+        :param segment_log: a SegmentLog instance to append the match data to, None to save it to a file
+          (saved as plain JSON, archived match logs are compressed later)
+        :return: the hash of the saved match, or None if this entry already exists in the database
+        """
         # Generate a datetime instance
         current_time: datetime = datetime.now()
 
-        # Generate the match hash
-        match_hash: str = self.generate_hash()
+        # Generate the match hash and the match data as JSON
+        encoded_match: EncodedMatch = encode_match(self)
+        match_hash: str = encoded_match.digest
 
         # Check if the hash already exists in the database to prevent duplicates
         if data_hash_exists(database, match_hash=match_hash):
-            return True
-
-        # Generate the file path
-        generated_file_path: Path = self.generate_file_path(time=current_time)
-
-        # Save the hash to the database
-        insert_match_hash(database, match_hash=match_hash, file_path=generated_file_path)
-
-        # Update the player log
-        for player in (player for team in self.teams for player in team.players):
-            update_player_data(database, profile_id=player.profile_id, name=player.name, mmr=player.mmr,
-                               kills=player.killed_by_me + player.downed_by_me,
-                               deaths=player.killed_me + player.downed_me,
-                               is_quickplay=self.is_quickplay)
-
-        # Create the directories
-        directory_path: Path = generated_file_path.parent
-        directory_path.mkdir(parents=True, exist_ok=True)
-
-        # Generate the match data as JSON
-        match_data: str = json.dumps(self, indent=2, default=vars)
-
-        # Save the data to a file
-        with open(generated_file_path, mode="w") as file:
-            file.write(match_data)
-        return False
+            return None
+
+        # The match logs are the source of truth, they're written before the database is updated and removed if the
+        #   database update fails (the request is rolled back)
+        if segment_log is not None:
+            location: SegmentLocation = segment_log.append(encoded_match.document.encode(), time=current_time)
+            try:
+                write_match(cursor, match=self.to_record(match_hash, location.file_path, current_time,
+                                                         log_location=location))
+            except Exception:
+                if not segment_log.discard(location):
+                    logging.warning(f"The match log at {location.offset} of {str(location.file_path)!r} is orphaned, "
+                                    "run the backfill to save it.")
+                raise
+            return match_hash
+
+        # The time of the file path is moved forward while another source's match log uses the path
+        file_time: datetime = current_time
+        while True:
+            generated_file_path: Path = self.generate_file_path(time=file_time)
+            try:
+                write_match_log(generated_file_path, encoded_match.document, exclusive=True)
+                break
+            except FileExistsError:
+                file_time += timedelta(seconds=1)
+        try:
+            write_match(cursor, match=self.to_record(match_hash, generated_file_path, current_time))
+        except Exception:
+            generated_file_path.unlink(missing_ok=True)
+            raise
+        return match_hash
+
+
+def load_match(database: DatabaseClient, match_hash: str) -> Match | None:
+    """
+    Loads a saved match from its (plain or compressed) match log, match logs in segments are read by random access.
+    :param database: a DatabaseClient instance
+    :param match_hash: the hash of the match (a hex digest)
+    :return: a Match instance, or None if the match isn't saved
+    :raises OSError: if the match log can't be read
+    :raises ParserError: if the match log is corrupted
+    """
+    location: Path | SegmentLocation | None = fetch_match_log(database, match_hash=match_hash)
+    if location is None:
+        return None
+    return decode_match(read_record(location).payload if isinstance(location, SegmentLocation)
+                        else read_match_log(location))
+
+
+def write_match_log(file_path: Path, document: str, exclusive: bool = False) -> None:
+    """
+    Writes the JSON document of a match to a match log, creating the directories if required.
+    :param file_path: the path to the match log
+    :param document: the JSON document of the match
+    :param exclusive: True to fail if the match log already exists instead of overwriting it
+    :raises FileExistsError: if exclusive is True and the match log already exists
+    """
+    # Create the directories
+    directory_path: Path = file_path.parent
+    directory_path.mkdir(parents=True, exist_ok=True)
+
+    # Save the data to a file
+    with open(file_path, mode="x" if exclusive else "w") as file:
+        file.write(document)
@@ -1,11 +1,39 @@
+from pathlib import Path
+from xml.etree.ElementTree import ParseError, parse as parse_element_tree
+
+from .backends import ParserBackend
 from .match import Accolade, Entry, Match, Rewards, Team
 from .team import Player, SerializableTeam
-from .xml.elements import XmlElement, get_element_value
+from .xml.elements import AttributeIndex, AttributeSource, as_attribute_index, get_element_value, index_attributes
+from .xml.scanner import scan_match_attributes
+from .xml.streaming import stream_match_attributes
+from ..exceptions import ParserError
 from ..reward_constants import BLOODBONDS_CATEGORY, BLOODLINE_DESCRIPTOR_NAME, BOUNTY_CATEGORIES, \
     HUNTER_LEVELS_CATEGORY, HUNTER_XP_DESCRIPTOR_NAME, HUNTER_XP_REWARD_TYPE, HUNT_DOLLARS_CATEGORY, \
     UPGRADE_POINTS_DESCRIPTOR_NAME, XP_CATEGORIES
 
 
+def read_attributes(file_path: Path, backend: ParserBackend = ParserBackend.STREAMING) -> AttributeIndex:
+    """
+    Reads the attributes required to parse match data from an attributes file.
+    :param file_path: the path to the attributes file
+    :param backend: the parser backend to use
+    :return: an AttributeIndex instance which can be passed to parse_match
+    :raises ParserError: if the attributes file is malformed
+    """
+    try:
+        match backend:
+            case ParserBackend.ELEMENT_TREE:
+                return index_attributes(parse_element_tree(file_path).getroot())
+            case ParserBackend.STREAMING:
+                return stream_match_attributes(file_path)
+            case ParserBackend.SCANNER:
+                return scan_match_attributes(file_path)
+    except ParseError as exception:
+        raise ParserError(f"Failed to parse the attributes file: {exception}") from exception
+    raise ParserError(f"Unsupported parser backend {backend!r}.")  # pragma: no cover
+
+
 def _calculate_rewards(accolades: tuple[Accolade, ...], entries: tuple[Entry, ...],
                        hunt_dollar_bonus: int, hunter_xp_bonus: int) -> Rewards:
     """
@@ -33,64 +61,68 @@ def _calculate_rewards(accolades: tuple[Accolade, ...], entries: tuple[Entry, ..
                    hunter_xp, hunter_levels, upgrade_points, bloodline_xp, event_points)
 
 
-def parse_match(root: XmlElement, steam_name: str) -> Match:
+def parse_match(root: AttributeSource, steam_name: str) -> Match:
     """
     Parse the element tree for match data.
-    :param root: the root element tree
+    :param root: the root element tree (or an index of its attributes)
     :param steam_name: the user's display name
     :return: a Match object
     :raises ParserError: from get_element_value
     """
+    # Index the attributes once, every value below is resolved from the index
+    attributes: AttributeIndex = as_attribute_index(root)
+
     accolades: list[Accolade] = []
     entries: list[Entry] = []
 
     # Determine the expected number of accolades and entries to iterate
-    accolades_count: int = get_element_value(root, "MissionBagNumAccolades", result_type=int)
-    entries_count: int = get_element_value(root, "MissionBagNumEntries", result_type=int)
+    accolades_count: int = get_element_value(attributes, "MissionBagNumAccolades", result_type=int)
+    entries_count: int = get_element_value(attributes, "MissionBagNumEntries", result_type=int)
 
     # Parse and store the accolades
     for i in range(accolades_count):
-        accolades.append(Accolade.deserialize(root, accolade_id=i))
+        accolades.append(Accolade.deserialize(attributes, accolade_id=i))
 
     # Parse and store the entries
     for i in range(entries_count):
-        entries.append(Entry.deserialize(root, entry_id=i))
+        entries.append(Entry.deserialize(attributes, entry_id=i))
 
-    bloodline_rank: int = get_element_value(root, "Unlocks/UnlockRank", result_type=int)
-    hunt_dollar_bonus: int = get_element_value(root, "MissionBagFbeGoldBonus", result_type=int)
-    hunter_xp_bonus: int = get_element_value(root, "MissionBagFbeHunterXpBonus", result_type=int)
-    is_hunter_dead: bool = get_element_value(root, "MissionBagIsHunterDead", result_type=bool)
-    is_quickplay: bool = get_element_value(root, "MissionBagIsQuickPlay", result_type=bool)
-    region: str = get_element_value(root, "Region")
-    secondary_region: str = get_element_value(root, "SecondaryRegion")
+    bloodline_rank: int = get_element_value(attributes, "Unlocks/UnlockRank", result_type=int)
+    hunt_dollar_bonus: int = get_element_value(attributes, "MissionBagFbeGoldBonus", result_type=int)
+    hunter_xp_bonus: int = get_element_value(attributes, "MissionBagFbeHunterXpBonus", result_type=int)
+    is_hunter_dead: bool = get_element_value(attributes, "MissionBagIsHunterDead", result_type=bool)
+    is_quickplay: bool = get_element_value(attributes, "MissionBagIsQuickPlay", result_type=bool)
+    region: str = get_element_value(attributes, "Region")
+    secondary_region: str = get_element_value(attributes, "SecondaryRegion")
 
     accolades_tuple: tuple[Accolade, ...] = tuple(accolades)
     entries_tuple: tuple[Entry, ...] = tuple(entries)
     return Match(steam_name, bloodline_rank, is_hunter_dead, is_quickplay, region, secondary_region,
                  accolades_tuple, entries_tuple,
                  _calculate_rewards(accolades_tuple, entries_tuple, hunt_dollar_bonus, hunter_xp_bonus),
-                 parse_teams(root=root))
+                 parse_teams(root=attributes))
 
 
-def parse_teams(root: XmlElement) -> tuple[Team, ...]:
+def parse_teams(root: AttributeSource) -> tuple[Team, ...]:
     """
     Parse the element tree for the available teams.
-    :param root: the root element tree
+    :param root: the root element tree (or an index of its attributes)
     :return: a tuple of Team objects
     :raises ParserError: from get_element_value
     """
+    attributes: AttributeIndex = as_attribute_index(root)
     teams: list[Team] = []
 
     # Determine the expected team count and iterate over the teams
-    expected_team_count: int = get_element_value(root, "MissionBagNumTeams", result_type=int)
+    expected_team_count: int = get_element_value(attributes, "MissionBagNumTeams", result_type=int)
     for i in range(expected_team_count):
         # Parse each team
-        parsed_team: SerializableTeam = SerializableTeam.deserialize(root, team_id=i)
+        parsed_team: SerializableTeam = SerializableTeam.deserialize(attributes, team_id=i)
 
         players: list[Player] = []
         # Parse each player from the team
         for j in range(parsed_team.players_count):
-            players.append(Player.deserialize(root, team_id=i, player_id=j))
+            players.append(Player.deserialize(attributes, team_id=i, player_id=j))
 
         teams.append(Team(parsed_team.handicap, parsed_team.is_invite, parsed_team.mmr, parsed_team.own_team,
                           tuple(players)))
@@ -4,7 +4,7 @@ from dataclasses import dataclass
 
 from colorama import Fore, Style
 
-from .xml.serializable import MappingGenerator, Serializable, XmlElement
+from .xml.serializable import AttributeSource, MappingGenerator, Serializable, XmlElement
 from ..formats import format_mmr
 
 
@@ -116,7 +116,7 @@ class Player(Serializable):
 
     # noinspection PyMethodOverriding
     @classmethod
-    def deserialize(cls, root: XmlElement, *, team_id: int, player_id: int) -> Player:  # type: ignore[override]
+    def deserialize(cls, root: AttributeSource, *, team_id: int, player_id: int) -> Player:  # type: ignore[override]
         """
         Deserialize a series of elements into a Player instance.
         :return: a serialized Player instance
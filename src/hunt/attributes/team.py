@@ -3,7 +3,7 @@ from __future__ import annotations
 from dataclasses import dataclass
 
 from .player import Player
-from .xml.serializable import MappingGenerator, Serializable, XmlElement
+from .xml.serializable import AttributeSource, MappingGenerator, Serializable, XmlElement
 
 
 @dataclass(frozen=True)
@@ -52,7 +52,7 @@ class SerializableTeam(Serializable):
 
     # noinspection PyMethodOverriding
     @classmethod
-    def deserialize(cls, root: XmlElement, team_id: int) -> SerializableTeam:  # type: ignore[override]
+    def deserialize(cls, root: AttributeSource, team_id: int) -> SerializableTeam:  # type: ignore[override]
         """
         Deserialize a series of elements into a SerializableTeam instance.
         :param root: the root element to serialize into
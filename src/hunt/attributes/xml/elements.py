@@ -1,10 +1,13 @@
 import builtins
-from typing import TypeAlias, TypeVar
+from typing import Callable, Mapping, TypeAlias, TypeVar
 from xml.etree.ElementTree import Element as XmlElement
 
 from ...exceptions import ParserError
 
 ElementValueType: TypeAlias = str | int | bool
+# Maps an attribute name to its "value" attribute (None if the "value" attribute is missing)
+AttributeIndex: TypeAlias = Mapping[str, str | None]
+AttributeSource: TypeAlias = XmlElement | AttributeIndex
 _T = TypeVar("_T", bound=ElementValueType)
 
 
@@ -27,11 +30,100 @@ def append_element(parent_element: XmlElement, name: str, value: ElementValueTyp
     parent_element.append(new_element)
 
 
+def index_attributes(element: XmlElement) -> AttributeIndex:
+    """
+    Builds a name to value index of every "Attr" child element in a single pass.
+    The first element with a given name takes precedence, mirroring XmlElement.find.
+    :param element: an XmlElement instance
+    :return: an AttributeIndex instance
+    """
+    index: dict[str, str | None] = {}
+    for child_element in element:
+        if child_element.tag != "Attr":
+            continue
+
+        name: str | None = child_element.attrib.get("name", None)
+        if name is not None and name not in index:
+            index[name] = child_element.attrib.get("value", None)
+    return index
+
+
+def as_attribute_index(source: AttributeSource) -> AttributeIndex:
+    """
+    Resolves an AttributeIndex from an attribute source, indexing element trees if required.
+    :param source: an XmlElement or an already built AttributeIndex instance
+    :return: an AttributeIndex instance
+    """
+    if isinstance(source, XmlElement):
+        return index_attributes(source)
+    return source
+
+
+def resolve_element_value(index: AttributeIndex, name: str) -> str:
+    """
+    Resolves an element's raw "value" attribute from an attribute index.
+    :param index: an AttributeIndex instance
+    :param name: the element's name
+    :return: the raw value of an element
+    :raises ParserError: if the xpath isn't found, or
+                         if the element is missing a "value" attribute
+    """
+    value: str | None = index.get(name, None)
+    if value is None:
+        xpath: str = f"Attr[@name={name!r}]"
+        if name not in index:
+            raise ParserError(f"No such element {xpath!r} in the current element tree.")
+        raise ParserError(f"""Missing "value" attribute in element {xpath!r}.""")
+    return value
+
+
+def _convert_bool(value: str) -> bool:
+    """
+    Converts a raw element value to a bool.
+    :param value: the raw element value
+    :return: True if the value is "true", otherwise False
+    """
+    return value == "true"
+
+
+def _convert_int(value: str) -> int:
+    """
+    Converts a raw element value to an int.
+    :param value: the raw element value
+    :return: the value as an int
+    :raises ParserError: if the value isn't an integer
+    """
+    try:
+        return int(value)
+    except ValueError:
+        raise ParserError(f"Couldn't cast the value {value!r} to an {int!r} type.")
+
+
+def element_value_converter(result_type: type[_T]) -> Callable[[str], _T]:
+    """
+    Selects the function which converts raw element values to the result type.
+    :param result_type: the type to cast values to
+    :return: a converter function
+    :raises ParserError: if the result type isn't a supported type
+    """
+    match result_type:
+        case builtins.str:
+            return str  # type: ignore[return-value]
+        case builtins.int:
+            return _convert_int  # type: ignore[return-value]
+        case builtins.bool:
+            return _convert_bool  # type: ignore[return-value]
+        case _:
+            raise ParserError("Type conversion not supported.")
+
+
 # https://github.com/python/mypy/issues/3737
-def get_element_value(element: XmlElement, name: str, result_type: type[_T] = str) -> _T:  # type: ignore[assignment]
+def get_element_value(element: AttributeSource, name: str,
+                      result_type: type[_T] = str) -> _T:  # type: ignore[assignment]
     """
     Resolves an element's "value" attribute based from its name (and suffix).
-    :param element: an XmlElement instance
+    Prefer passing an AttributeIndex when resolving multiple values, an XmlElement is indexed on every call.
+    :param element: an XmlElement or an AttributeIndex instance
     :param name: the element's name
     :param result_type: the type to cast the value to
     :return: the value of an element
@@ -39,21 +131,5 @@ def get_element_value(element: XmlElement, name: str, result_type: type[_T] = st
                          if the element is missing a "value" attribute, or
                          if the result type isn't a supported type
     """
-    xpath: str = f"Attr[@name={name!r}]"
-    resolved_element: XmlElement | None = element.find(path=xpath)
-    if resolved_element is not None:
-        value: str | None = resolved_element.attrib.get("value", None)
-        if value is None:
-            raise ParserError(f"""Missing "value" attribute in element {xpath!r}.""")
-
-        match result_type:
-            case builtins.str | builtins.int:
-                try:
-                    return result_type(value)  # type: ignore[return-value]
-                except ValueError:
-                    raise ParserError(f"Couldn't cast the value {value!r} to an {result_type!r} type.")
-            case builtins.bool:
-                return value == "true"  # type: ignore[return-value]
-            case _:
-                raise ParserError("Type conversion not supported.")
-    raise ParserError(f"No such element {xpath!r} in the current element tree.")
+    value: str = resolve_element_value(as_attribute_index(element), name)
+    return element_value_converter(result_type)(value)
@@ -0,0 +1,135 @@
+import mmap
+import re
+from contextlib import contextmanager
+from hashlib import blake2b
+from pathlib import Path
+from typing import Generator
+
+from .elements import AttributeIndex
+from ...constants import MATCH_ATTRIBUTE_NAMES, MATCH_ATTRIBUTE_PREFIXES
+from ...exceptions import ParserError
+
+# The attributes file layout written by the game: an optional declaration and a flat list of Attr elements
+_DOCUMENT_PATTERN: re.Pattern[bytes] = re.compile(
+    rb'(?:\xef\xbb\xbf)?\s*(?:<\?xml[^>]*\?>\s*)?'
+    rb'<Attributes(?:\s+[\w.:-]+="[^"<]*")*+\s*>'
+    rb'(?:\s*+<Attr\s++name="[^"<]*+"\s++value="[^"<]*+"\s*+/>)*+'
+    rb'\s*</Attributes>\s*')
+
+# Only the attributes required to parse match data are matched
+_MATCH_ATTRIBUTE_PATTERN: re.Pattern[bytes] = re.compile(
+    rb'<Attr\s+name="(' +
+    b"|".join((*(re.escape(prefix.encode()) + rb'[^"]*' for prefix in MATCH_ATTRIBUTE_PREFIXES),
+               *(re.escape(name.encode()) for name in MATCH_ATTRIBUTE_NAMES))) +
+    rb')"\s+value="([^"]*)"')
+
+# The attributes which are written when a match finishes (excludes the bloodline rank and the regions)
+_MISSION_BAG_PATTERN: re.Pattern[bytes] = re.compile(
+    rb'<Attr\s+name="(?:' + b"|".join(re.escape(prefix.encode()) for prefix in MATCH_ATTRIBUTE_PREFIXES) +
+    rb')[^"]*"\s+value="[^"]*"')
+
+# XML attribute value normalization
+_ENTITY_PATTERN: re.Pattern[str] = re.compile(r"&(?:#([0-9]+)|#x([0-9a-fA-F]+)|([A-Za-z]+));|&")
+_PREDEFINED_ENTITIES: dict[str, str] = {"lt": "<", "gt": ">", "amp": "&", "quot": '"', "apos": "'"}
+_WHITESPACE_TRANSLATION: dict[int, int] = str.maketrans("\t\n", "  ")
+
+
+def _replace_entity(entity: re.Match[str]) -> str:
+    """
+    Resolves a character or a predefined entity reference.
+    :param entity: the matched reference
+    :return: the referenced character(s)
+    :raises ParserError: if the reference is malformed or undefined
+    """
+    decimal, hexadecimal, name = entity.groups()
+    try:
+        if decimal is not None:
+            return chr(int(decimal))
+        if hexadecimal is not None:
+            return chr(int(hexadecimal, 16))
+        if name is not None:
+            return _PREDEFINED_ENTITIES[name]
+    except (KeyError, ValueError, OverflowError):
+        pass
+    raise ParserError(f"Invalid entity reference {entity.group()!r} in the attributes file.")
+
+
+def _decode_value(raw_value: bytes) -> str:
+    """
+    Decodes an attribute value the same way an XML parser would.
+    :param raw_value: the raw value between the quotes
+    :return: the decoded value
+    :raises ParserError: if the value isn't valid UTF-8 or contains invalid references
+    """
+    try:
+        value: str = raw_value.decode()
+    except UnicodeDecodeError as exception:
+        raise ParserError(f"Couldn't decode the value {raw_value!r}.") from exception
+
+    # Normalize line endings and whitespace before resolving references (references aren't normalized)
+    if "\r" in value:
+        value = value.replace("\r\n", "\n").replace("\r", "\n")
+    value = value.translate(_WHITESPACE_TRANSLATION)
+    if "&" in value:
+        value = _ENTITY_PATTERN.sub(_replace_entity, value)
+    return value
+
+
+@contextmanager
+def _map_file(file_path: Path) -> Generator[mmap.mmap, None, None]:
+    """
+    Memory-maps a file for reading.
+    :param file_path: the path to the file
+    :return: a generator which yields the mapped file
+    :raises ParserError: if the file is empty
+    """
+    with open(file_path, mode="rb") as file:
+        try:
+            mapped_file: mmap.mmap = mmap.mmap(file.fileno(), length=0, access=mmap.ACCESS_READ)
+        except ValueError as exception:
+            raise ParserError("The attributes file is empty.") from exception
+
+    with mapped_file:
+        yield mapped_file
+
+
+def scan_match_attributes(file_path: Path) -> AttributeIndex:
+    """
+    Memory-maps an attributes file and extracts the attributes required to parse match data from the raw bytes,
+      without constructing any elements.
+    Only the layout written by the game is supported: a flat list of Attr elements with a double-quoted "name"
+      attribute followed by a double-quoted "value" attribute.
+    :param file_path: the path to the attributes file
+    :return: an AttributeIndex instance which can be passed to parse_match
+    :raises ParserError: if the attributes file is empty or malformed
+    """
+    mapped_file: mmap.mmap
+    with _map_file(file_path) as mapped_file:
+        # Validate the document structure in a single pass
+        if _DOCUMENT_PATTERN.fullmatch(mapped_file) is None:
+            raise ParserError("The attributes file is malformed.")
+
+        # Extract the match attributes, the first element with a given name takes precedence
+        index: dict[str, str | None] = {}
+        for attribute in _MATCH_ATTRIBUTE_PATTERN.finditer(mapped_file):
+            name: str = attribute.group(1).decode()
+            if name not in index:
+                index[name] = _decode_value(attribute.group(2))
+        return index
+
+
+def fingerprint_match_attributes(file_path: Path) -> str:
+    """
+    Generates a fingerprint of the MissionBag attributes of an attributes file, without parsing the file.
+    The fingerprint only changes when the match data changes, not when unrelated attributes are written.
+    :param file_path: the path to the attributes file
+    :return: a hex digest of the MissionBag attributes
+    :raises ParserError: if the file is empty
+    """
+    digest: blake2b = blake2b(digest_size=16)
+
+    mapped_file: mmap.mmap
+    with _map_file(file_path) as mapped_file:
+        for attribute in _MISSION_BAG_PATTERN.finditer(mapped_file):
+            digest.update(attribute.group())
+    return digest.hexdigest()
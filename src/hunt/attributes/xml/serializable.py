@@ -1,11 +1,15 @@
 from abc import ABC, abstractmethod
-from dataclasses import is_dataclass
-from typing import Generator, TypeAlias, TypeVar, get_type_hints
+from dataclasses import fields, is_dataclass
+from functools import cache
+from typing import Callable, Generator, TypeAlias, TypeVar, get_type_hints
 
-from .elements import ElementValueType, XmlElement, append_element, get_element_value
+from .elements import AttributeIndex, AttributeSource, ElementValueType, XmlElement, append_element, \
+    as_attribute_index, element_value_converter, resolve_element_value
 
 _T = TypeVar("_T", bound="Serializable")
 MappingGenerator: TypeAlias = Generator[tuple[str, str], None, None]
+# The variable name, the attribute suffix and the value converter of a field
+_CompiledField: TypeAlias = tuple[str, str, Callable[[str], ElementValueType]]
 
 
 class Serializable(ABC):
@@ -25,28 +29,40 @@ class Serializable(ABC):
         :param root: the root element to serialize into
         :param name_prefix: the name prefix to use when appending elements
         """
-        assert is_dataclass(self.__class__), "The class should be a dataclass."
-
         # Append each element
-        for variable_name, name_suffix in self._data_mappings():
-            append_element(root, name=f"{name_prefix}_{name_suffix}", value=self.__getattribute__(variable_name))
+        for variable_name, name_suffix, _ in _compile_fields(self.__class__):
+            append_element(root, name=f"{name_prefix}_{name_suffix}", value=getattr(self, variable_name))
 
     @classmethod
     @abstractmethod
-    def deserialize(cls: type[_T], root: XmlElement, name_prefix: str) -> _T:
+    def deserialize(cls: type[_T], root: AttributeSource, name_prefix: str) -> _T:
         """
         Deserialize a series of elements into the class instance.
-        :param root: the root element to deserialize from
+        :param root: the root element (or an index of its attributes) to deserialize from
         :param name_prefix: the name prefix to use when resolving elements
         """
-        assert is_dataclass(cls), "The class should be a dataclass."
+        # Index the attributes once rather than searching the element tree for each value
+        index: AttributeIndex = as_attribute_index(root)
+
+        # Construct and return the class, the compiled fields are in positional argument order
+        return cls(*(converter(resolve_element_value(index, f"{name_prefix}_{name_suffix}"))
+                     for _, name_suffix, converter in _compile_fields(cls)))
+
+
+@cache
+def _compile_fields(cls: type[Serializable]) -> tuple[_CompiledField, ...]:
+    """
+    Resolves the serialization data of a class once, when the class is first (de)serialized.
+    :param cls: a Serializable dataclass
+    :return: a tuple of compiled fields, ordered by the positional arguments of the class
+    :raises ParserError: if a field type isn't supported (element_value_converter)
+    """
+    assert is_dataclass(cls), "The class should be a dataclass."
 
-        # Generate the data by fetching each element value
-        type_hints: dict[str, type[ElementValueType]] = get_type_hints(cls)
-        data: dict[str, ElementValueType] = dict(
-            (variable_name, get_element_value(  # type: ignore[type-var, misc]
-                root, name=f"{name_prefix}_{name_suffix}", result_type=type_hints[variable_name]))
-            for variable_name, name_suffix in cls._data_mappings())  # type: ignore[attr-defined]
+    # Resolve the annotations and the attribute suffixes
+    type_hints: dict[str, type[ElementValueType]] = get_type_hints(cls)
+    name_suffixes: dict[str, str] = dict(cls._data_mappings())
+    assert name_suffixes.keys() == {field.name for field in fields(cls)}, "Each field should be mapped."
 
-        # Construct and return the class
-        return cls(**data)  # type: ignore[return-value]
+    return tuple((field.name, name_suffixes[field.name], element_value_converter(type_hints[field.name]))
+                 for field in fields(cls))
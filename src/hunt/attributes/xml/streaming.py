@@ -0,0 +1,50 @@
+from pathlib import Path
+from typing import BinaryIO
+from xml.etree.ElementTree import iterparse
+
+from .elements import AttributeIndex, XmlElement
+from ...constants import MATCH_ATTRIBUTE_NAMES, MATCH_ATTRIBUTE_PREFIXES
+
+
+def is_match_attribute(name: str) -> bool:
+    """
+    Checks if an attribute is required to parse match data.
+    :param name: the name of the attribute
+    :return: True if the attribute is used by the match parser, otherwise False
+    """
+    return name.startswith(MATCH_ATTRIBUTE_PREFIXES) or name in MATCH_ATTRIBUTE_NAMES
+
+
+def stream_match_attributes(source: Path | BinaryIO) -> AttributeIndex:
+    """
+    Incrementally parses an attributes file, keeping only the attributes required to parse match data.
+    Elements are discarded as soon as they're parsed, so memory usage is bounded by the match data.
+    :param source: the path to the attributes file or a binary file object
+    :return: an AttributeIndex instance which can be passed to parse_match
+    :raises ParseError: if the attributes file isn't well-formed
+    """
+    index: dict[str, str | None] = {}
+
+    root: XmlElement | None = None
+    depth: int = 0
+    for event, element in iterparse(source, events=("start", "end")):
+        if event == "start":
+            if root is None:
+                root = element
+            depth += 1
+            continue
+        depth -= 1
+
+        # Only direct children of the root element are attributes
+        if depth != 1:
+            continue
+        assert root is not None
+
+        if element.tag == "Attr":
+            name: str | None = element.attrib.get("name", None)
+            if name is not None and name not in index and is_match_attribute(name):
+                index[name] = element.attrib.get("value", None)
+
+        # Discard the parsed element(s)
+        root.clear()
+    return index
@@ -1,24 +1,27 @@
+from __future__ import annotations
+
 import logging
-import statistics
 import sys
-import time
-import xml.etree.ElementTree as ElementTree
+from contextlib import ExitStack
 from functools import partial
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 from colorama import Fore, Style, colorama_text
 
-from hunt.attributes.parser import Match, Player, XmlElement, parse_match
 from hunt.cli.arguments.parser import Config, parse_arguments
+from hunt.cli.config import Command
 from hunt.cli.exit_codes import ExitCode
-from hunt.constants import DATABASE_PATH, DATABASE_TEST_SERVER_PATH, HUNT_SHOWDOWN_APP_ID, \
-    HUNT_SHOWDOWN_TEST_SERVER_APP_ID, MATCH_LOGS_PATH, RESOURCES_PATH, STEAMWORKS_BINARIES_PATH, STEAMWORKS_SDK_PATH
-from hunt.database.client import Client as DatabaseClient
-from hunt.exceptions import ParserError, SteamworksError, UnsupportedPlatformError
-from hunt.filesystem.watchdog import FileWatchdog
+from hunt.constants import HUNT_SHOWDOWN_APP_ID, HUNT_SHOWDOWN_TEST_SERVER_APP_ID, MATCH_LOGS_PATH, \
+    MATCH_LOG_SEGMENTS_PATH, RESOURCES_PATH, STEAMWORKS_BINARIES_PATH, STEAMWORKS_SDK_PATH
+from hunt.exceptions import SteamworksError, UnsupportedPlatformError
 from hunt.formats import format_mmr
 from hunt.reward_constants import ASSISTS_CATEGORY
-from hunt.steam.api import SteamworksApi, fetch_hunt_attributes_path, try_extract_steamworks_binaries
+
+# The remaining modules are imported by the code paths which use them, commands don't load the watch mode modules
+if TYPE_CHECKING:
+    from hunt.attributes.parser import Match, Player
+    from hunt.steam.identity import SteamIdentity
 
 
 def setup_logger(config: Config) -> None:
@@ -79,112 +82,205 @@ def main(config: Config) -> ExitCode:
     try:
         RESOURCES_PATH.mkdir(parents=True, exist_ok=True)  # Create the resource directory if it doesn't exist
         MATCH_LOGS_PATH.mkdir(parents=True, exist_ok=True)  # Create the match logs directory if it doesn't exist
-        STEAMWORKS_BINARIES_PATH.mkdir(parents=True, exist_ok=True)  # Create the bin directory if it doesn't exist
     except OSError as exception:
         logging.critical("Failed to create create application-critical directories in the current working directory. "
                          "Are write permissions missing?")
         logging.debug(f"OS error: {exception=}")
         return ExitCode.FILESYSTEM_ERROR
 
-    try:
-        # Extract the Steamworks binaries to disk
-        steamworks_api_path: Path = try_extract_steamworks_binaries()
-    except SteamworksError as exception:
-        logging.critical("Failed to extract the Steamworks binaries, are you missing the Steamworks SDK?")
-        logging.info(f"The Steamworks SDK should be located at: {STEAMWORKS_SDK_PATH!r}")
-        logging.debug(f"Steamworks error: {exception=}")
-        return ExitCode.STEAMWORKS_ERROR
-    except UnsupportedPlatformError as exception:
-        logging.critical("The current platform isn't supported.")
-        logging.debug(f"Unsupported platform error: {exception=}")
-        return ExitCode.UNSUPPORTED_PLATFORM
-
-    try:
-        # Initialize the Steamworks API
-        app_id: int = HUNT_SHOWDOWN_APP_ID if not config.test_server else HUNT_SHOWDOWN_TEST_SERVER_APP_ID
-        steamworks_api: SteamworksApi = SteamworksApi.prepare_and_initialize(steamworks_api_path, app_id=app_id)
-    except SteamworksError as exception:
-        logging.critical("A Steamworks API error occurred, is Steam running?")
-        logging.debug(f"Steamworks error: {exception=}")
-        return ExitCode.STEAMWORKS_ERROR
+    # Commands don't require the Steamworks API
+    match config.command:
+        case Command.BACKFILL:
+            from hunt.cli.backfill import backfill
+            return backfill(config)
+        case Command.CONVERT:
+            from hunt.cli.convert import convert
+            return convert(config)
+        case Command.INGEST:
+            from hunt.cli.ingest import ingest
+            return ingest(config)
+    return watch(config)
+
+
+def watch(config: Config) -> ExitCode:
+    """
+    Watch the attributes files for matches until interrupted.
+    :param config: the configuration provided by the user
+    :return: an exit code.
+    """
+    from hunt.attributes.fingerprint import FingerprintTracker
+    from hunt.cli.archive import MatchLogArchiver
+    from hunt.cli.runtime import MatchRuntime, MatchSource
+    from hunt.cli.sources import SourceConfig, discover_sources
+    from hunt.database.client import Client as DatabaseClient
+    from hunt.database.writer import DatabaseWriter
+    from hunt.filesystem.base import FileWatcher
+    from hunt.filesystem.compression import MatchLogCompression
+    from hunt.filesystem.segments import MatchLogStorage, SegmentLog
+    from hunt.filesystem.watchers import create_file_watcher
+    from hunt.steam.identity import HeadlessIdentity, SteamworksIdentity
+
+    # The headless mode doesn't load the Steamworks API
+    app_id: int = HUNT_SHOWDOWN_APP_ID if not config.test_server else HUNT_SHOWDOWN_TEST_SERVER_APP_ID
+    identity: SteamIdentity
+    if config.headless:
+        identity = HeadlessIdentity(persona_name=config.persona_name, install_directories={
+            install_app_id: install_directory for install_app_id, install_directory in (
+                (HUNT_SHOWDOWN_APP_ID, config.install_directory),
+                (HUNT_SHOWDOWN_TEST_SERVER_APP_ID, config.test_server_install_directory))
+            if install_directory is not None})
+        logging.info("Running in headless mode.")
     else:
-        logging.info("Steamworks API initialized.")
-
-    # Locate the attributes file
-    attributes_path: Path = fetch_hunt_attributes_path(steamworks_api, app_id=app_id)
-    assert attributes_path.exists(), "Attributes file does not exist."
-
-    database: DatabaseClient
-    database_path: Path = DATABASE_PATH if not config.test_server else DATABASE_TEST_SERVER_PATH
-    with DatabaseClient(file_path=database_path) as database:
-        # Set up a file watcher to listen for changes on the attributes file
-        file_watchdog: FileWatchdog = FileWatchdog(
-            file_path=attributes_path,
-            callback=partial(attributes_file_modified,
-                             database=database, steamworks_api=steamworks_api, config=config))
-        file_watchdog.start()
-
-        # Inform the user that the program has started
-        logging.info("Watching for matches, good luck and have fun!")
+        from hunt.steam.api import SteamworksApi, try_extract_steamworks_binaries
         try:
-            while True:
-                time.sleep(1)
-        except KeyboardInterrupt:
-            # Stop the file watcher if a keyboard interrupt is received
-            file_watchdog.stop()
-        file_watchdog.join()
+            STEAMWORKS_BINARIES_PATH.mkdir(parents=True, exist_ok=True)  # Create the bin directory if it doesn't exist
+        except OSError as exception:
+            logging.critical("Failed to create the Steamworks binaries directory. Are write permissions missing?")
+            logging.debug(f"OS error: {exception=}")
+            return ExitCode.FILESYSTEM_ERROR
 
-    # Cleanup/shutdown the Steamworks API
-    steamworks_api.shutdown()
+        try:
+            # Extract the Steamworks binaries to disk
+            steamworks_api_path: Path = try_extract_steamworks_binaries()
+        except SteamworksError as exception:
+            logging.critical("Failed to extract the Steamworks binaries, are you missing the Steamworks SDK?")
+            logging.info(f"The Steamworks SDK should be located at: {STEAMWORKS_SDK_PATH!r}")
+            logging.debug(f"Steamworks error: {exception=}")
+            return ExitCode.STEAMWORKS_ERROR
+        except UnsupportedPlatformError as exception:
+            logging.critical("The current platform isn't supported.")
+            logging.debug(f"Unsupported platform error: {exception=}")
+            return ExitCode.UNSUPPORTED_PLATFORM
+
+        try:
+            # Initialize the Steamworks API, its lookups are cached by the identity
+            identity = SteamworksIdentity(SteamworksApi.prepare_and_initialize(steamworks_api_path, app_id=app_id))
+        except SteamworksError as exception:
+            logging.critical("A Steamworks API error occurred, is Steam running?")
+            logging.debug(f"Steamworks error: {exception=}")
+            return ExitCode.STEAMWORKS_ERROR
+        else:
+            logging.info("Steamworks API initialized.")
+
+    # Locate the attributes files
+    sources: tuple[SourceConfig, ...] = config.sources
+    if not sources:
+        app_ids: tuple[int, ...] = (HUNT_SHOWDOWN_APP_ID, HUNT_SHOWDOWN_TEST_SERVER_APP_ID) \
+            if config.all_profiles else (app_id,)
+        try:
+            sources = discover_sources(locate_install_directories(identity, app_ids=app_ids),
+                                       all_profiles=config.all_profiles, profile_personas=config.profile_personas)
+        except ValueError as exception:
+            logging.critical("Failed to resolve the persona names of the profiles, use --profile-persona.")
+            logging.debug(f"Configuration error: {exception=}")
+            identity.shutdown()
+            return ExitCode.CONFIGURATION_ERROR
+    missing_attributes_paths: tuple[Path, ...] = tuple(
+        source.attributes_path for source in sources if not source.attributes_path.exists())
+    if not sources or missing_attributes_paths:
+        logging.critical("Failed to locate the attributes file(s).")
+        logging.debug(f"Missing attributes files: {missing_attributes_paths=}")
+        identity.shutdown()
+        return ExitCode.FILESYSTEM_ERROR
+
+    exit_stack: ExitStack
+    with ExitStack() as exit_stack:
+        # Every source appends its match logs to the same segments, which are closed once the writers are stopped
+        try:
+            segment_log: SegmentLog | None = exit_stack.enter_context(SegmentLog(
+                MATCH_LOG_SEGMENTS_PATH, compression=config.match_log_compression)) \
+                if config.match_log_storage == MatchLogStorage.SEGMENTS else None
+        except OSError as exception:
+            logging.critical("Failed to open the match log segments, is another instance appending to them?")
+            logging.debug(f"OS error: {exception=}")
+            identity.shutdown()
+            return ExitCode.FILESYSTEM_ERROR
+
+        # Every database is owned by its writer thread, sources which share a database share its writer
+        writers: dict[Path, DatabaseWriter] = {}
+        for source in sources:
+            if source.database_path not in writers:
+                database: DatabaseClient = exit_stack.enter_context(
+                    DatabaseClient(file_path=source.database_path, profile=config.database_profile))
+                writers[source.database_path] = exit_stack.enter_context(DatabaseWriter(database))
+
+        # The match log files of the previous days are compressed in the background, stopped before the writers
+        archiver: MatchLogArchiver | None = exit_stack.enter_context(MatchLogArchiver(
+            MATCH_LOGS_PATH, compression=config.match_log_compression, writers=tuple(writers.values()))) \
+            if config.match_log_compression != MatchLogCompression.NONE else None
+        match_sources: list[MatchSource] = []
+        for source in sources:
+            writer: DatabaseWriter = writers[source.database_path]
+            # Sources which share a database track their fingerprints separately
+            shared_database: bool = sum(other.database_path == source.database_path for other in sources) > 1
+            match_sources.append(MatchSource(
+                name=source.name, attributes_path=source.attributes_path, writer=writer,
+                fingerprint_tracker=FingerprintTracker(database=writer.database,
+                                                       source=source.name if shared_database else None),
+                # Fixed persona names don't require the Steamworks API
+                identity=identity if source.persona_name is None
+                else HeadlessIdentity(persona_name=source.persona_name), segment_log=segment_log))
+
+        # Process attributes file modifications on an asyncio runtime, parsing is shared by every source
+        runtime: MatchRuntime = MatchRuntime(
+            sources=tuple(match_sources), parser_backend=config.parser_backend,
+            log_match=partial(log_match_data, log_statistical_data=config.statistics))
+
+        # Set up a file watcher to listen for changes on each attributes file
+        try:
+            file_watchers: tuple[FileWatcher, ...] = tuple(create_file_watcher(
+                config.watcher_backend, file_path=source.attributes_path, callback=runtime.notify,
+                quiet_period=config.quiet_period, max_delay=config.max_delay, poll_interval=config.poll_interval)
+                for source in sources)
+        except UnsupportedPlatformError as exception:
+            logging.critical(f"The {config.watcher_backend} watcher isn't supported on the current platform.")
+            logging.debug(f"Unsupported platform error: {exception=}")
+            identity.shutdown()
+            return ExitCode.UNSUPPORTED_PLATFORM
+
+        # Inform the user that the program has started, the runtime runs until a keyboard interrupt is received
+        for source in sources:
+            logging.debug(f"Watching {source.name}: {str(source.attributes_path)!r} -> {str(source.database_path)!r}")
+        logging.info("Watching for matches, good luck and have fun!")
+        runtime.run(file_watchers)
+
+        for match_source, file_watcher in zip(match_sources, file_watchers):
+            logging.debug(f"{match_source.name}: attributes file watcher ({config.watcher_backend}): "
+                          f"{file_watcher.wakeups} wakeup(s), {file_watcher.cpu_time:.3f} s of CPU time.")
+            logging.debug(f"{match_source.name}: attributes file modifications: {file_watcher.debouncer.events} "
+                          f"event(s), {file_watcher.debouncer.collapsed_events} collapsed, "
+                          f"{file_watcher.debouncer.invocations} processed.")
+            logging.debug(f"{match_source.name}: {match_source.modifications} modification(s), "
+                          f"{match_source.parsed_matches} parsed, {match_source.saved_matches} saved match(es).")
+        for database_path, writer in writers.items():
+            logging.debug(f"{str(database_path)!r}: {writer.requests} write request(s) in "
+                          f"{writer.transactions} transaction(s), match hash cache: "
+                          f"{writer.database.hash_cache.hits} hit(s), {writer.database.hash_cache.misses} miss(es).")
+        if archiver is not None:
+            logging.debug(f"Compressed {archiver.compressed_match_logs} archived match log(s).")
+
+    # Cleanup/shutdown the Steamworks API (if it was loaded)
+    identity.shutdown()
 
     # Signal to the user that we're shutting down
     logging.info("Shutting down.")
     return ExitCode.SUCCESS
 
 
-def attributes_file_modified(file_path: Path,
-                             database: DatabaseClient, steamworks_api: SteamworksApi, config: Config) -> None:
+def locate_install_directories(identity: SteamIdentity, app_ids: tuple[int, ...]) -> dict[int, Path]:
     """
-    Invoked when the attributes file is modified;
-      Parses the match data from the attributes file and
-      saves it to disk.
-    :param file_path: the path of the file to parse
-    :param database: a DatabaseClient instance
-    :param steamworks_api: a SteamworksApi instance
-    :param config: the configuration provided by the user
+    Locates the install directories of the game, apps which aren't installed are skipped.
+    :param identity: a SteamIdentity instance
+    :param app_ids: the app ids of the game
+    :return: the install directories, by app id
     """
-    # Read the file contents
-    file_contents: bytes = file_path.read_bytes()
-
-    # If the file contents are empty, skip parsing
-    if not file_contents:
-        return
-
-    try:
-        # Attempt to parse the attributes file
-        parsed_attributes: XmlElement = ElementTree.fromstring(file_contents)
-    except ElementTree.ParseError as exception:
-        # Skip the update
-        logging.error("Failed to parse the attributes file.")
-        logging.debug(f"Failed to parse the attributes file: {exception=}")
-        return
-
-    # Parse the teams from the attributes file
-    try:
-        match: Match = parse_match(root=parsed_attributes, steam_name=steamworks_api.get_persona_name())
-    except SteamworksError as exception:
-        logging.debug(f"Failed to get the user's display name: {exception=}")
-        return
-    except ParserError as exception:
-        logging.debug(f"Failed to parse the attributes file: {exception=}")
-        return
-
-    # Save match data to disk
-    if match.try_save_to_file(database=database):
-        return  # Skip printing an already existing entry
-
-    # Print useful data from the match
-    log_match_data(match, log_statistical_data=config.statistics)
+    install_directories: dict[int, Path] = {}
+    for app_id in app_ids:
+        try:
+            install_directories[app_id] = identity.get_install_directory(app_id=app_id)
+        except SteamworksError as exception:
+            logging.debug(f"Failed to locate the install directory of {app_id}: {exception=}")
+    return install_directories
 
 
 def log_match_data(match: Match, log_statistical_data: bool) -> None:
@@ -199,6 +295,7 @@ def log_match_data(match: Match, log_statistical_data: bool) -> None:
 
     # Log statistical data
     def _log_stats() -> None:
+        import statistics
         logging.info("Statistics:")
 
         # Player statistics
@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import logging
+import threading
+from concurrent.futures import Future
+from datetime import date, datetime
+from functools import partial
+from pathlib import Path
+from sqlite3 import Error as SqliteError
+from types import TracebackType
+
+from ..constants import MATCH_LOG_ARCHIVE_INTERVAL
+from ..database.queries import rename_match_logs
+from ..database.writer import DatabaseWriter
+from ..exceptions import DatabaseError
+from ..filesystem.compression import MatchLogCompression, compress_file
+from ..filesystem.scan import scan_files
+
+
+def archived_day_directories(logs_path: Path, before: date) -> list[Path]:
+    """
+    Lists the day directories of the match logs (see Match.generate_file_path) which are no longer written to.
+    :param logs_path: the match logs directory
+    :param before: the first day which isn't archived
+    :return: the paths of the day directories, oldest first
+    :raises OSError: if the match logs directory can't be read
+    """
+    directories: list[Path] = []
+    for directory in logs_path.iterdir():
+        try:
+            if directory.is_dir() and datetime.strptime(directory.name, "%Y-%m-%d").date() < before:
+                directories.append(directory)
+        except ValueError:
+            continue
+    return sorted(directories)
+
+
+def compress_day_directory(directory: Path, compression: MatchLogCompression,
+                           writers: tuple[DatabaseWriter, ...]) -> int:
+    """
+    Compresses the plain match log files of a day directory.
+    The compressed copies are written first, then the databases are pointed to them, then the plain match logs are
+      removed: an interrupted compression leaves both copies, which is resumed by compressing the directory again.
+    :param directory: the day directory
+    :param compression: the codec to use, compression must be enabled
+    :param writers: the writers of the databases which may reference the match logs
+    :return: the amount of compressed match logs
+    :raises OSError: if a match log can't be compressed
+    :raises DatabaseError: if a writer was stopped
+    :raises SqliteError: if a database couldn't be updated
+    """
+    file_paths: list[tuple[Path, Path]] = [(file_path, compress_file(file_path, compression))
+                                           for file_path in sorted(scan_files(directory, suffix=".json"))]
+    if not file_paths:
+        return 0
+
+    # Every database is updated in a single request, paths which belong to another database are ignored
+    futures: list[Future[None]] = [writer.submit(partial(rename_match_logs, file_paths=file_paths))
+                                   for writer in writers]
+    for future in futures:
+        future.result()
+    for file_path, _ in file_paths:
+        file_path.unlink(missing_ok=True)
+    return len(file_paths)
+
+
+class MatchLogArchiver:
+    logs_path: Path
+    compression: MatchLogCompression
+    writers: tuple[DatabaseWriter, ...]
+    interval: float
+    # Statistics
+    compressed_match_logs: int
+    _stop_event: threading.Event
+    _thread: threading.Thread
+
+    def __init__(self, logs_path: Path, compression: MatchLogCompression, writers: tuple[DatabaseWriter, ...],
+                 interval: float = MATCH_LOG_ARCHIVE_INTERVAL):
+        """
+        Initialize the class.
+        Once started, the match logs of the previous days are compressed in the background, then again every interval.
+        :param logs_path: the match logs directory
+        :param compression: the codec to use, compression must be enabled
+        :param writers: the (started) writers of the databases which may reference the match logs
+        :param interval: the amount of seconds between each compression of the archived match logs
+        """
+        assert compression != MatchLogCompression.NONE, "Compression is disabled."
+        self.logs_path = logs_path
+        self.compression = compression
+        self.writers = writers
+        self.interval = interval
+        self.compressed_match_logs = 0
+
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="MatchLogArchiver", daemon=True)
+
+    def start(self) -> None:
+        """Start the archiver thread."""
+        self._thread.start()
+
+    def join(self) -> None:
+        """Wait until the archiver thread terminates."""
+        self._thread.join()
+
+    def stop(self) -> None:
+        """Stop the archiver thread, the day directory being compressed is completed before the thread terminates."""
+        self._stop_event.set()
+
+    def archive(self) -> None:
+        """Compresses the match logs of the previous days, one day directory at a time."""
+        try:
+            directories: list[Path] = archived_day_directories(self.logs_path, before=date.today())
+        except OSError as exception:
+            logging.warning(f"Failed to list the match logs directory: {exception}")
+            return
+        for directory in directories:
+            if self._stop_event.is_set():
+                return
+            try:
+                compressed_match_logs: int = compress_day_directory(directory, self.compression, self.writers)
+            except (OSError, DatabaseError, SqliteError) as exception:
+                logging.warning(f"Failed to compress the match logs of {str(directory)!r}: {exception}")
+                continue
+            if compressed_match_logs:
+                self.compressed_match_logs += compressed_match_logs
+                logging.debug(f"Compressed {compressed_match_logs} match log(s) of {str(directory)!r} "
+                              f"({self.compression}).")
+
+    def _run(self) -> None:
+        """Compresses the archived match logs every interval until the archiver is stopped."""
+        while not self._stop_event.is_set():
+            self.archive()
+            self._stop_event.wait(self.interval)
+
+    # Context manager support
+    def __enter__(self) -> MatchLogArchiver:
+        """Start the archiver thread when entering the scope."""
+        self.start()
+        return self
+
+    def __exit__(self, exc_type: type[BaseException] | None, exc_val: BaseException | None,
+                 exc_tb: TracebackType | None) -> None:
+        """Stop the archiver thread when exiting the scope."""
+        self.stop()
+        self.join()
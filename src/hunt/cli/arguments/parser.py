@@ -1,6 +1,14 @@
-from argparse import ArgumentParser, Namespace
+from argparse import ArgumentParser, Namespace, _SubParsersAction
+from pathlib import Path
 
-from ..config import Config
+from ..config import Command, Config
+from ..sources import SourceConfig
+from ...attributes.backends import ParserBackend
+from ...constants import MATCH_LOGS_PATH, WATCHDOG_MAX_DELAY, WATCHDOG_POLL_INTERVAL, WATCHDOG_QUIET_PERIOD
+from ...database.client import DatabaseProfile
+from ...filesystem.compression import MatchLogCompression
+from ...filesystem.segments import MatchLogStorage
+from ...filesystem.watchers import WatcherBackend
 
 
 def setup_argument_parser() -> ArgumentParser:
@@ -19,6 +27,62 @@ def setup_argument_parser() -> ArgumentParser:
     # Statistics
     argument_parser.add_argument("--statistics", action="store_true")
 
+    # Attributes file parser backend
+    argument_parser.add_argument("--parser-backend", type=ParserBackend, choices=tuple(ParserBackend),
+                                 default=ParserBackend.STREAMING)
+
+    # Database performance profile
+    argument_parser.add_argument("--database-profile", type=DatabaseProfile, choices=tuple(DatabaseProfile),
+                                 default=DatabaseProfile.DURABLE)
+
+    # Match log storage
+    argument_parser.add_argument("--match-log-storage", type=MatchLogStorage, choices=tuple(MatchLogStorage),
+                                 default=MatchLogStorage.FILES)
+    argument_parser.add_argument("--match-log-compression", type=MatchLogCompression,
+                                 choices=tuple(MatchLogCompression), default=MatchLogCompression.NONE)
+
+    # Attributes file watcher backend
+    argument_parser.add_argument("--watcher", type=WatcherBackend, choices=tuple(WatcherBackend),
+                                 default=WatcherBackend.WATCHDOG)
+    argument_parser.add_argument("--poll-interval", type=float, default=WATCHDOG_POLL_INTERVAL)
+
+    # Coalescing of attributes file modification bursts
+    argument_parser.add_argument("--quiet-period", type=float, default=WATCHDOG_QUIET_PERIOD)
+    argument_parser.add_argument("--max-delay", type=float, default=WATCHDOG_MAX_DELAY)
+
+    # Attributes file sources
+    argument_parser.add_argument("--all-profiles", action="store_true")
+    argument_parser.add_argument("--profile-persona", action="append", nargs=2, default=[],
+                                 metavar=("SOURCE_NAME", "PERSONA_NAME"))
+    argument_parser.add_argument("--source", action="append", nargs=3, default=[],
+                                 metavar=("ATTRIBUTES_PATH", "PERSONA_NAME", "DATABASE_PATH"))
+
+    # Headless mode, the identity is provided by the arguments instead of the Steamworks API
+    argument_parser.add_argument("--headless", action="store_true")
+    argument_parser.add_argument("--persona-name", default=None)
+    argument_parser.add_argument("--install-directory", type=Path, default=None)
+    argument_parser.add_argument("--test-server-install-directory", type=Path, default=None)
+
+    # Commands
+    command_parsers: _SubParsersAction = argument_parser.add_subparsers(dest="command")
+
+    # Backfill the database from the match logs
+    backfill_parser: ArgumentParser = command_parsers.add_parser(Command.BACKFILL, add_help=False)
+    backfill_parser.add_argument("paths", type=Path, nargs="*", default=[MATCH_LOGS_PATH])
+    backfill_parser.add_argument("--workers", type=int, default=None)
+
+    # Convert the match log files to segments
+    convert_parser: ArgumentParser = command_parsers.add_parser(Command.CONVERT, add_help=False)
+    convert_parser.add_argument("paths", type=Path, nargs="*", default=[MATCH_LOGS_PATH])
+    convert_parser.add_argument("--workers", type=int, default=None)
+    convert_parser.add_argument("--remove-files", action="store_true")
+
+    # Save the matches of archived attributes file snapshots
+    ingest_parser: ArgumentParser = command_parsers.add_parser(Command.INGEST, add_help=False)
+    ingest_parser.add_argument("paths", type=Path, nargs="+")
+    ingest_parser.add_argument("--persona-name", required=True)
+    ingest_parser.add_argument("--workers", type=int, default=None)
+
     return argument_parser
 
 
@@ -30,6 +94,24 @@ def parse_arguments() -> Config:
     # Parse any provided arguments
     argument_parser: ArgumentParser = setup_argument_parser()
     arguments: Namespace = argument_parser.parse_args()
+    if arguments.headless and arguments.command is None and not arguments.source:
+        if arguments.persona_name is None:
+            argument_parser.error("the headless mode requires --persona-name or --source")
+        # Every profile of either install is watched, otherwise the default profile of the selected install
+        install_directories: tuple[Path | None, ...] = \
+            (arguments.install_directory, arguments.test_server_install_directory) if arguments.all_profiles else \
+            (arguments.install_directory if not arguments.test_server else arguments.test_server_install_directory,)
+        if not any(install_directories):
+            argument_parser.error("the headless mode requires the install directory of the game or --source")
 
     # Return a Config instance
-    return Config(arguments.debug, arguments.test_server, arguments.statistics)
+    command: Command | None = Command(arguments.command) if arguments.command is not None else None
+    return Config(arguments.debug, arguments.test_server, arguments.statistics, arguments.parser_backend,
+                  arguments.database_profile, arguments.match_log_storage, arguments.match_log_compression,
+                  arguments.watcher, arguments.poll_interval, arguments.quiet_period, arguments.max_delay,
+                  arguments.all_profiles, dict(arguments.profile_persona),
+                  tuple(SourceConfig(attributes_path, Path(attributes_path), persona_name, Path(database_path))
+                        for attributes_path, persona_name, database_path in arguments.source),
+                  arguments.headless, arguments.install_directory, arguments.test_server_install_directory, command,
+                  tuple(getattr(arguments, "paths", ())), getattr(arguments, "workers", None),
+                  arguments.persona_name, getattr(arguments, "remove_files", False))
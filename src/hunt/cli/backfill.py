@@ -0,0 +1,161 @@
+import logging
+import signal
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from itertools import islice
+from pathlib import Path
+from typing import Generator, Iterable, Iterator, TypeVar
+
+from .config import Config
+from .exit_codes import ExitCode
+from .progress import ProgressReporter
+from ..attributes.codec import decode_match
+from ..attributes.match import Match
+from ..constants import DATABASE_BULK_BATCH_SIZE, DATABASE_PATH, DATABASE_TEST_SERVER_PATH
+from ..database.client import Client as DatabaseClient
+from ..database.paths import relative_log_path
+from ..database.queries import MatchRecord, fetch_match_log_paths, fetch_segment_offsets, insert_matches
+from ..exceptions import ParserError
+from ..filesystem.compression import MATCH_LOG_SUFFIXES, read_match_log, uncompressed_path
+from ..filesystem.scan import scan_files
+from ..filesystem.segments import SEGMENT_SUFFIX, SegmentLocation, SegmentLog, SegmentRecord, read_record, \
+    scan_segment
+
+_T = TypeVar("_T")
+
+
+def _match_log_time(file_path: Path) -> datetime:
+    """
+    Resolves the time a match was saved from the path of its match log (see Match.generate_file_path).
+    :param file_path: the path to a plain or compressed match log
+    :return: the time the match was saved, the modification time of the file if the path isn't a generated path
+    """
+    try:
+        return datetime.strptime(f"{file_path.parent.parent.name} {uncompressed_path(file_path).stem}",
+                                 "%Y-%m-%d %H-%M-%S")
+    except ValueError:
+        return datetime.fromtimestamp(file_path.stat().st_mtime)
+
+
+def decode_match_log(match_log: Path | SegmentLocation) -> MatchRecord | None:
+    """
+    Decodes a match log and recomputes its hash, invoked in the worker processes.
+    :param match_log: the path to a match log file, or the location of a match log in a segment
+    :return: a MatchRecord instance, or None if the match log couldn't be read
+    """
+    match: Match
+    try:
+        if isinstance(match_log, SegmentLocation):
+            record: SegmentRecord = read_record(match_log)
+            match = decode_match(record.payload)
+            return match.to_record(match.generate_hash(), match_log.file_path, record.time, log_location=match_log)
+        match = decode_match(read_match_log(match_log))
+        return match.to_record(match.generate_hash(), match_log, _match_log_time(match_log))
+    except (OSError, ParserError) as exception:
+        logging.warning(f"Skipping the match log {str(match_log)!r}: {exception}")
+        return None
+
+
+def collect_segment_records(directories: tuple[Path, ...],
+                            saved_offsets: set[tuple[str, int]]) -> list[SegmentLocation]:
+    """
+    Collects the match logs stored in the segments of directories, segments which can't be read are skipped.
+    :param directories: the directories which are searched for segments
+    :param saved_offsets: the locations of the saved match logs, as stored in the database (fetch_segment_offsets)
+    :return: the locations of the match logs which aren't saved, in the order they were appended
+    :raises OSError: if a directory can't be read
+    """
+    locations: list[SegmentLocation] = []
+    segment_paths: list[Path] = sorted(file_path for directory in directories
+                                       for file_path in scan_files(directory, suffix=SEGMENT_SUFFIX))
+    for file_path in segment_paths:
+        segment_path: str = relative_log_path(file_path)
+        try:
+            locations.extend(location for location in scan_segment(file_path)
+                             if (segment_path, location.offset) not in saved_offsets)
+        except (OSError, ParserError) as exception:
+            logging.warning(f"Skipping the segment {str(file_path)!r}: {exception}")
+    return locations
+
+
+def initialize_worker() -> None:
+    """Ignores keyboard interrupts in worker processes, the main process shuts the pool down instead."""
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+
+def remove_match_logs(records: list[MatchRecord], segment_log: SegmentLog | None) -> None:
+    """
+    Removes the match logs written for a batch whose transaction was rolled back.
+    :param records: the records of the match logs, in the order they were written
+    :param segment_log: the SegmentLog instance the match logs in segments were appended to
+    """
+    for record in reversed(records):
+        if record.log_location is None:
+            record.file_path.unlink(missing_ok=True)
+        elif segment_log is None or not segment_log.discard(record.log_location):
+            logging.warning(f"The match log at {record.log_location.offset} of {str(record.file_path)!r} is orphaned, "
+                            "run the backfill to save it.")
+
+
+def batched(results: Iterable[_T | None], batch_size: int) -> Generator[tuple[int, list[_T]], None, None]:
+    """
+    Groups worker results into batches, dropping the inputs which couldn't be processed.
+    :param results: the worker results, None for inputs which couldn't be processed
+    :param batch_size: the maximum amount of inputs in a batch
+    :return: a generator which yields the amount of inputs consumed by each batch and the batch
+    """
+    iterator: Iterator[_T | None] = iter(results)
+    while batch := list(islice(iterator, batch_size)):
+        yield len(batch), [result for result in batch if result is not None]
+
+
+def backfill(config: Config) -> ExitCode:
+    """
+    Rebuilds the match data and the player log of the database from the match logs.
+    Match logs which are already saved are skipped, an interrupted backfill resumes from the last committed batch.
+    :param config: the configuration provided by the user
+    :return: an exit code
+    """
+    database: DatabaseClient
+    database_path: Path = DATABASE_PATH if not config.test_server else DATABASE_TEST_SERVER_PATH
+    with DatabaseClient(file_path=database_path, profile=config.database_profile) as database:
+        # Skip the match logs saved by the live mode or by a previous (possibly interrupted) backfill, the match logs
+        #   whose hash was saved without its match data (by legacy versions) are decoded to save their match data
+        saved_paths: set[str] = fetch_match_log_paths(database)
+        saved_offsets: set[tuple[str, int]] = fetch_segment_offsets(database)
+        try:
+            # Match log files precede the segments, which replaced them
+            # Compressed match logs are skipped by their current path, or the path they had before their compression
+            match_logs: list[Path | SegmentLocation] = [*sorted(
+                file_path for directory in config.paths
+                for file_path in scan_files(directory, suffix=MATCH_LOG_SUFFIXES)
+                if relative_log_path(file_path) not in saved_paths
+                and relative_log_path(uncompressed_path(file_path)) not in saved_paths),
+                *collect_segment_records(config.paths, saved_offsets)]
+        except OSError as exception:
+            logging.critical("Failed to read the match logs directory.")
+            logging.debug(f"OS error: {exception=}")
+            return ExitCode.FILESYSTEM_ERROR
+        logging.info(f"Backfilling {len(match_logs)} match log(s), "
+                     f"{len(saved_paths) + len(saved_offsets)} already saved.")
+
+        saved_matches: int = 0
+        progress: ProgressReporter = ProgressReporter(total=len(match_logs), unit="match log")
+        with ProcessPoolExecutor(max_workers=config.workers, initializer=initialize_worker) as executor:
+            try:
+                # The match logs are decoded in parallel and saved in chronological order
+                consumed: int
+                batch: list[MatchRecord]
+                for consumed, batch in batched(executor.map(decode_match_log, match_logs, chunksize=64),
+                                               DATABASE_BULK_BATCH_SIZE):
+                    saved_matches += insert_matches(database, batch)
+                    progress.advance(consumed)
+            except KeyboardInterrupt:
+                executor.shutdown(wait=True, cancel_futures=True)
+                logging.warning(f"Backfill interrupted after saving {saved_matches} match(es), "
+                                "run the backfill again to resume.")
+                return ExitCode.SUCCESS
+
+    logging.info(f"Backfill completed, saved {saved_matches} match(es) "
+                 f"({len(match_logs) - saved_matches} duplicate or unreadable match log(s)).")
+    return ExitCode.SUCCESS
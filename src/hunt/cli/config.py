@@ -1,4 +1,22 @@
 from dataclasses import dataclass
+from enum import StrEnum
+from pathlib import Path
+
+from ..attributes.backends import ParserBackend
+from ..database.client import DatabaseProfile
+from .sources import SourceConfig
+from ..filesystem.compression import MatchLogCompression
+from ..filesystem.segments import MatchLogStorage
+from ..filesystem.watchers import WatcherBackend
+
+
+class Command(StrEnum):
+    # Rebuild the database from the match logs
+    BACKFILL = "backfill"
+    # Convert the match log files to segments
+    CONVERT = "convert"
+    # Save the matches of archived attributes file snapshots
+    INGEST = "ingest"
 
 
 @dataclass(frozen=True)
@@ -6,3 +24,38 @@ class Config:
     debug: bool
     test_server: bool
     statistics: bool
+    parser_backend: ParserBackend
+    database_profile: DatabaseProfile
+    # How new match logs are stored
+    match_log_storage: MatchLogStorage
+    # How match logs are compressed: segment records when they're appended, match log files once they're archived
+    match_log_compression: MatchLogCompression
+    # The backend used to watch the attributes file
+    watcher_backend: WatcherBackend
+    # The amount of seconds between each stat call of the polling watcher
+    poll_interval: float
+    # The amount of seconds without attributes file modifications after which a burst is over
+    quiet_period: float
+    # The maximum amount of seconds a burst of modifications can delay processing
+    max_delay: float
+    # Watch every profile of the live and the test server installs instead of the default profile of one install
+    all_profiles: bool
+    # The persona names of the profiles other than the default profiles, by source name
+    profile_personas: dict[str, str]
+    # Attributes files to watch instead of the installs
+    sources: tuple[SourceConfig, ...]
+    # Don't load the Steamworks API, the persona name and the install directories are provided by the configuration
+    headless: bool
+    # The install directories used by the headless mode
+    install_directory: Path | None
+    test_server_install_directory: Path | None
+    # The command to run instead of watching for matches
+    command: Command | None
+    # The files or directories processed by the command
+    paths: tuple[Path, ...]
+    # The amount of worker processes used by the command (None to use every CPU)
+    workers: int | None
+    # The Steam persona name used by the command and the headless mode instead of the Steamworks API
+    persona_name: str | None
+    # Remove the match log files once they're converted to segments
+    remove_files: bool
@@ -0,0 +1,116 @@
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import replace
+from pathlib import Path
+
+from .backfill import batched, decode_match_log, initialize_worker, remove_match_logs
+from .config import Config
+from .exit_codes import ExitCode
+from .progress import ProgressReporter
+from ..constants import DATABASE_BULK_BATCH_SIZE, DATABASE_PATH, DATABASE_TEST_SERVER_PATH, MATCH_LOG_SEGMENTS_PATH
+from ..database.client import Client as DatabaseClient, Cursor
+from ..database.queries import MatchRecord, fetch_match_log, relocate_match_log, write_match
+from ..filesystem.compression import MATCH_LOG_SUFFIXES, read_match_log
+from ..filesystem.scan import scan_files
+from ..filesystem.segments import SegmentLocation, SegmentLog
+
+
+def _convert_match_logs(database: DatabaseClient, segment_log: SegmentLog, records: list[MatchRecord],
+                        converted_hashes: set[str], remove_files: bool) -> int:
+    """
+    Appends a batch of match log files to the segments and points the database to them in a single transaction.
+    Match logs which aren't saved in the database yet are saved, the same way the backfill does.
+    :param database: a DatabaseClient instance
+    :param segment_log: the SegmentLog instance to append the match logs to
+    :param records: the decoded match log files
+    :param converted_hashes: the hashes converted by the current conversion
+    :param remove_files: True to remove the match log files once the transaction is committed
+    :return: the amount of converted match logs
+    """
+    converted_records: list[MatchRecord] = []
+    saved_hashes: list[str] = []
+    try:
+        for record in records:
+            # Duplicates and match logs converted by a previous (possibly interrupted) conversion are only removed
+            if record.match_hash in converted_hashes or isinstance(
+                    fetch_match_log(database, match_hash=record.match_hash), SegmentLocation):
+                continue
+
+            # The match log documents are copied as-is (compressed by the segment log), the time of the record is the
+            #   time the match was saved
+            location: SegmentLocation = segment_log.append(read_match_log(record.file_path), record.time)
+            converted_records.append(replace(record, file_path=location.file_path, log_location=location))
+            converted_hashes.add(record.match_hash)
+
+        cursor: Cursor
+        with database.transaction() as cursor:
+            for converted_record in converted_records:
+                assert converted_record.log_location is not None
+                if write_match(cursor, converted_record):
+                    saved_hashes.append(converted_record.match_hash)
+                else:
+                    relocate_match_log(cursor, converted_record.match_hash, converted_record.log_location)
+    except Exception:
+        # Nothing was committed, the appended records are removed (the last appended record first)
+        remove_match_logs(converted_records, segment_log)
+        converted_hashes.difference_update(converted_record.match_hash for converted_record in converted_records)
+        raise
+    for match_hash in saved_hashes:
+        database.hash_cache.add(match_hash)
+
+    if remove_files:
+        for record in records:
+            record.file_path.unlink(missing_ok=True)
+    return len(converted_records)
+
+
+def convert(config: Config) -> ExitCode:
+    """
+    Converts match log files to segments, the database is pointed to the converted match logs in batched commits.
+    An interrupted conversion resumes where it stopped, match log files which can't be decoded are kept as-is.
+    :param config: the configuration provided by the user
+    :return: an exit code
+    """
+    try:
+        file_paths: list[Path] = sorted(
+            file_path for directory in config.paths for file_path in scan_files(directory, suffix=MATCH_LOG_SUFFIXES))
+    except OSError as exception:
+        logging.critical("Failed to read the match logs directory.")
+        logging.debug(f"OS error: {exception=}")
+        return ExitCode.FILESYSTEM_ERROR
+    logging.info(f"Converting {len(file_paths)} match log file(s).")
+
+    # The segments are locked while they're appended to, e.g. the live mode can't append to them in the meantime
+    segment_log: SegmentLog
+    try:
+        segment_log = SegmentLog(MATCH_LOG_SEGMENTS_PATH, compression=config.match_log_compression)
+    except OSError as exception:
+        logging.critical("Failed to open the match log segments, is another instance appending to them?")
+        logging.debug(f"OS error: {exception=}")
+        return ExitCode.FILESYSTEM_ERROR
+
+    database: DatabaseClient
+    database_path: Path = DATABASE_PATH if not config.test_server else DATABASE_TEST_SERVER_PATH
+    with segment_log, DatabaseClient(file_path=database_path, profile=config.database_profile) as database:
+        converted_matches: int = 0
+        converted_hashes: set[str] = set()
+        progress: ProgressReporter = ProgressReporter(total=len(file_paths), unit="match log")
+        with ProcessPoolExecutor(max_workers=config.workers, initializer=initialize_worker) as executor:
+            try:
+                # The match logs are decoded (and their hashes recomputed) in parallel, appended in chronological order
+                consumed: int
+                batch: list[MatchRecord]
+                for consumed, batch in batched(executor.map(decode_match_log, file_paths, chunksize=64),
+                                               DATABASE_BULK_BATCH_SIZE):
+                    converted_matches += _convert_match_logs(database, segment_log, batch, converted_hashes,
+                                                             remove_files=config.remove_files)
+                    progress.advance(consumed)
+            except KeyboardInterrupt:
+                executor.shutdown(wait=True, cancel_futures=True)
+                logging.warning(f"Conversion interrupted after converting {converted_matches} match log(s), "
+                                "run the conversion again to resume.")
+                return ExitCode.SUCCESS
+
+    logging.info(f"Conversion completed, converted {converted_matches} match log(s) to "
+                 f"{str(MATCH_LOG_SEGMENTS_PATH)!r}.")
+    return ExitCode.SUCCESS
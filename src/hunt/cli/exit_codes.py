@@ -12,3 +12,5 @@ class ExitCode(IntEnum):
     STEAMWORKS_ERROR: ExitCode = _enum_auto()  # type: ignore[assignment]
     # Unsupported platform
     UNSUPPORTED_PLATFORM: ExitCode = _enum_auto()  # type: ignore[assignment]
+    # Invalid configuration
+    CONFIGURATION_ERROR: ExitCode = _enum_auto()  # type: ignore[assignment]
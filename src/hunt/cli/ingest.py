@@ -0,0 +1,169 @@
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from functools import partial
+from pathlib import Path
+from typing import Iterator
+
+from .backfill import batched, initialize_worker, remove_match_logs
+from .config import Config
+from .exit_codes import ExitCode
+from .progress import ProgressReporter
+from ..attributes.codec import EncodedMatch, encode_match
+from ..attributes.match import Match, write_match_log
+from ..attributes.parser import ParserBackend, parse_match, read_attributes
+from ..constants import DATABASE_BULK_BATCH_SIZE, DATABASE_PATH, DATABASE_TEST_SERVER_PATH, MATCH_LOG_SEGMENTS_PATH
+from ..database.client import Client as DatabaseClient
+from ..database.queries import MatchRecord, data_hash_exists, insert_matches
+from ..exceptions import ParserError
+from ..filesystem.scan import scan_files
+from ..filesystem.segments import MatchLogStorage, SegmentLocation, SegmentLog
+
+
+@dataclass(frozen=True)
+class ParsedSnapshot:
+    match: Match
+    encoded_match: EncodedMatch
+    # The modification time of the snapshot, used as the time the match was saved
+    time: datetime
+
+
+def collect_snapshots(paths: tuple[Path, ...]) -> list[Path]:
+    """
+    Collects the attributes file snapshots from files and directories of snapshots.
+    :param paths: the paths to snapshots, or to directories which are searched for ".xml" files
+    :return: the paths to the snapshots, ordered by their modification time
+    :raises OSError: if a path can't be read
+    """
+    file_paths: set[Path] = set()
+    for path in paths:
+        if path.is_dir():
+            file_paths.update(scan_files(path, suffix=".xml"))
+        else:
+            path.stat()  # Raise an OSError for missing files
+            file_paths.add(path)
+    return sorted(file_paths, key=lambda file_path: (file_path.stat().st_mtime, file_path))
+
+
+def parse_snapshot(file_path: Path, persona_name: str, parser_backend: ParserBackend) -> ParsedSnapshot | None:
+    """
+    Parses an attributes file snapshot and encodes its match, invoked in the worker processes.
+    :param file_path: the path to the snapshot
+    :param persona_name: the Steam persona name of the player who wrote the snapshot
+    :param parser_backend: the parser backend to use
+    :return: a ParsedSnapshot instance, or None if the snapshot couldn't be parsed
+    """
+    try:
+        match: Match = parse_match(read_attributes(file_path, backend=parser_backend), steam_name=persona_name)
+        return ParsedSnapshot(match, encode_match(match), datetime.fromtimestamp(file_path.stat().st_mtime))
+    except (OSError, ParserError) as exception:
+        logging.warning(f"Skipping the snapshot {str(file_path)!r}: {exception}")
+        return None
+
+
+def _unique_file_path(match: Match, time: datetime, used_file_paths: set[Path]) -> Path:
+    """
+    Generates the match log path of a match, moving the time forward while the path is taken.
+    Snapshots copied at the same time would overwrite each other's match logs otherwise.
+    :param match: a Match instance
+    :param time: the time the match was saved
+    :param used_file_paths: the paths used by the current ingest
+    :return: a path which isn't used by another match log
+    """
+    file_path: Path = match.generate_file_path(time=time)
+    while file_path in used_file_paths or file_path.exists():
+        time += timedelta(seconds=1)
+        file_path = match.generate_file_path(time=time)
+    used_file_paths.add(file_path)
+    return file_path
+
+
+def _save_snapshots(database: DatabaseClient, snapshots: list[ParsedSnapshot], saved_hashes: set[str],
+                    used_file_paths: set[Path], segment_log: SegmentLog | None = None) -> int:
+    """
+    Saves the new matches of a batch of snapshots to the match logs and to the database in a single transaction.
+    :param database: a DatabaseClient instance
+    :param snapshots: the parsed snapshots
+    :param saved_hashes: the hashes saved by the current ingest
+    :param used_file_paths: the paths used by the current ingest
+    :param segment_log: a SegmentLog instance to append the match logs to, None to save them to files
+    :return: the amount of saved matches
+    """
+    records: list[MatchRecord] = []
+    try:
+        for snapshot in snapshots:
+            match_hash: str = snapshot.encoded_match.digest
+            if match_hash in saved_hashes or data_hash_exists(database, match_hash=match_hash):
+                continue  # Consecutive snapshots usually contain the same match
+
+            # The match logs are the source of truth, they're written before the database is updated
+            if segment_log is not None:
+                location: SegmentLocation = segment_log.append(snapshot.encoded_match.document.encode(),
+                                                               snapshot.time)
+                records.append(snapshot.match.to_record(match_hash, location.file_path, snapshot.time,
+                                                        log_location=location))
+            else:
+                file_path: Path = _unique_file_path(snapshot.match, snapshot.time, used_file_paths)
+                write_match_log(file_path, snapshot.encoded_match.document)
+                records.append(snapshot.match.to_record(match_hash, file_path, snapshot.time))
+            saved_hashes.add(match_hash)
+        return insert_matches(database, records)
+    except Exception:
+        # Nothing was committed, the match logs written for the batch are removed (the last written match log first)
+        remove_match_logs(records, segment_log)
+        saved_hashes.difference_update(record.match_hash for record in records)
+        raise
+
+
+def ingest(config: Config) -> ExitCode:
+    """
+    Saves the matches of archived attributes file snapshots, the same way the live mode does, in batched commits.
+    :param config: the configuration provided by the user
+    :return: an exit code
+    """
+    assert config.persona_name is not None, "The persona name is required to ingest snapshots."
+    try:
+        file_paths: list[Path] = collect_snapshots(config.paths)
+    except OSError as exception:
+        logging.critical("Failed to read the snapshots.")
+        logging.debug(f"OS error: {exception=}")
+        return ExitCode.FILESYSTEM_ERROR
+    logging.info(f"Ingesting {len(file_paths)} snapshot(s).")
+
+    database: DatabaseClient
+    exit_stack: ExitStack
+    database_path: Path = DATABASE_PATH if not config.test_server else DATABASE_TEST_SERVER_PATH
+    with DatabaseClient(file_path=database_path, profile=config.database_profile) as database, \
+            ExitStack() as exit_stack:
+        try:
+            segment_log: SegmentLog | None = exit_stack.enter_context(SegmentLog(
+                MATCH_LOG_SEGMENTS_PATH, compression=config.match_log_compression)) \
+                if config.match_log_storage == MatchLogStorage.SEGMENTS else None
+        except OSError as exception:
+            logging.critical("Failed to open the match log segments, is another instance appending to them?")
+            logging.debug(f"OS error: {exception=}")
+            return ExitCode.FILESYSTEM_ERROR
+        saved_matches: int = 0
+        saved_hashes: set[str] = set()
+        used_file_paths: set[Path] = set()
+        progress: ProgressReporter = ProgressReporter(total=len(file_paths), unit="snapshot")
+        with ProcessPoolExecutor(max_workers=config.workers, initializer=initialize_worker) as executor:
+            try:
+                # The snapshots are parsed in parallel and saved in chronological order
+                consumed: int
+                batch: list[ParsedSnapshot]
+                results: Iterator[ParsedSnapshot | None] = executor.map(
+                    partial(parse_snapshot, persona_name=config.persona_name, parser_backend=config.parser_backend),
+                    file_paths, chunksize=16)
+                for consumed, batch in batched(results, DATABASE_BULK_BATCH_SIZE):
+                    saved_matches += _save_snapshots(database, batch, saved_hashes, used_file_paths, segment_log)
+                    progress.advance(consumed)
+            except KeyboardInterrupt:
+                executor.shutdown(wait=True, cancel_futures=True)
+                logging.warning(f"Ingest interrupted after saving {saved_matches} match(es).")
+                return ExitCode.SUCCESS
+
+    logging.info(f"Ingest completed, saved {saved_matches} new match(es).")
+    return ExitCode.SUCCESS
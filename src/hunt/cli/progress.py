@@ -0,0 +1,33 @@
+import logging
+import time
+from dataclasses import dataclass, field
+
+# The minimum amount of seconds between progress reports
+_PROGRESS_INTERVAL: float = 5.0
+
+
+@dataclass(kw_only=True)
+class ProgressReporter:
+    total: int
+    unit: str
+    processed: int = 0
+    _start_time: float = field(default_factory=time.perf_counter)
+    _last_report_time: float = field(init=False)
+
+    def __post_init__(self) -> None:
+        """Initialize the time of the last report."""
+        self._last_report_time = self._start_time
+
+    def advance(self, amount: int) -> None:
+        """
+        Advances the progress, logging the progress and the throughput periodically and once completed.
+        :param amount: the amount of processed items
+        """
+        self.processed = min(self.processed + amount, self.total)
+
+        current_time: float = time.perf_counter()
+        if current_time - self._last_report_time < _PROGRESS_INTERVAL and self.processed < self.total:
+            return
+        self._last_report_time = current_time
+        logging.info(f"Processed {self.processed}/{self.total} {self.unit}(s) "
+                     f"({self.processed / max(current_time - self._start_time, 1e-9):.0f} {self.unit}s/s).")
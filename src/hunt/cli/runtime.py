@@ -0,0 +1,312 @@
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, replace
+from functools import partial
+from pathlib import Path
+from sqlite3 import Cursor, Error as SqliteError
+from typing import Callable
+
+from ..attributes.fingerprint import FingerprintTracker
+from ..attributes.match import Match
+from ..attributes.parser import ParserBackend, parse_match, read_attributes
+from ..attributes.xml.elements import AttributeIndex
+from ..attributes.xml.scanner import fingerprint_match_attributes
+from ..constants import RUNTIME_QUEUE_SIZE
+from ..database.writer import DatabaseWriter
+from ..exceptions import ParserError, SteamworksError
+from ..filesystem.base import FileWatcher
+from ..filesystem.segments import SegmentLog
+from ..steam.identity import SteamIdentity
+
+
+@dataclass(frozen=True)
+class ParsedAttributes:
+    fingerprint: str
+    # None if the match data couldn't be parsed, the fingerprint is still recorded so it isn't parsed again
+    match: Match | None
+
+
+def parse_attributes_file(file_path: Path, fingerprint_tracker: FingerprintTracker, identity: SteamIdentity,
+                          parser_backend: ParserBackend,
+                          queued_fingerprint: str | None = None) -> ParsedAttributes | None:
+    """
+    Parses the match data from the attributes file, invoked in the parser thread.
+    :param file_path: the path of the file to parse
+    :param fingerprint_tracker: a FingerprintTracker instance, only read by the parser thread
+    :param identity: provides the Steam persona name of the player
+    :param parser_backend: the parser backend to use
+    :param queued_fingerprint: the fingerprint of the match data queued to be saved, which may not be saved yet
+    :return: a ParsedAttributes instance, or None if there's nothing to save
+    """
+    # If the file is empty (or was replaced in the meantime), skip parsing
+    try:
+        if not file_path.stat().st_size:
+            return None
+    except OSError:
+        return None
+
+    # Skip parsing if the match data hasn't changed since it was last processed
+    try:
+        fingerprint: str = fingerprint_match_attributes(file_path)
+    except ParserError as exception:
+        logging.debug(f"Failed to fingerprint the attributes file: {exception=}")
+        return None
+    if fingerprint == queued_fingerprint or fingerprint_tracker.is_unchanged(fingerprint):
+        return None
+
+    try:
+        # Attempt to parse the attributes file, keeping only the match data
+        parsed_attributes: AttributeIndex = read_attributes(file_path, backend=parser_backend)
+    except ParserError as exception:
+        # Skip the update
+        logging.error("Failed to parse the attributes file.")
+        logging.debug(f"Failed to parse the attributes file: {exception=}")
+        return None
+
+    # The file was modified while it was parsed (e.g. it was read while it was written), the modification is reported
+    #   again by the file watcher, the match data is parsed then
+    try:
+        if fingerprint_match_attributes(file_path) != fingerprint:
+            return None
+    except ParserError:
+        return None
+
+    # Parse the teams from the attributes file
+    try:
+        persona_name: str = identity.get_persona_name()
+        match: Match = parse_match(root=parsed_attributes, steam_name=persona_name)
+
+        # The cached persona name is outdated if the player isn't in the local team (e.g. the user was renamed)
+        if not _is_local_player(match, persona_name):
+            identity.refresh()
+            if (refreshed_persona_name := identity.get_persona_name()) != persona_name:
+                logging.debug(f"The persona name was refreshed: {persona_name=}, {refreshed_persona_name=}")
+                match = replace(match, player_name=refreshed_persona_name)
+        return ParsedAttributes(fingerprint, match)
+    except SteamworksError as exception:
+        logging.debug(f"Failed to get the user's display name: {exception=}")
+        return None
+    except ParserError as exception:
+        logging.debug(f"Failed to parse the attributes file: {exception=}")
+        return ParsedAttributes(fingerprint, None)  # The same match data would fail to parse again
+
+
+def _is_local_player(match: Match, persona_name: str) -> bool:
+    """
+    Checks if a player of the local team has the persona name.
+    :param match: a parsed Match instance
+    :param persona_name: the Steam persona name of the player
+    :return: True if the persona name belongs to the local team
+    """
+    return any(player.name == persona_name for team in match.teams if team.own_team for player in team.players)
+
+
+@dataclass(kw_only=True, eq=False)
+class MatchSource:
+    # A name which identifies the source in the log output
+    name: str
+    attributes_path: Path
+    # A running DatabaseWriter instance, which saves the matches of the source
+    writer: DatabaseWriter
+    fingerprint_tracker: FingerprintTracker
+    # Provides the persona name of the player, used by the parser threads
+    identity: SteamIdentity
+    # Appends the match logs to segments if provided, otherwise they're saved as files
+    segment_log: SegmentLog | None = None
+    # The fingerprint of the last parsed match data, recorded by the parse stage when it's queued, the fingerprint
+    #  tracker is only updated once the writer saves it
+    queued_fingerprint: str | None = None
+    # Statistics
+    modifications: int = 0
+    parsed_matches: int = 0
+    saved_matches: int = 0
+
+
+class MatchRuntime:
+    sources: tuple[MatchSource, ...]
+    parser_backend: ParserBackend
+    log_match: Callable[[Match], None]
+    queue_size: int
+    parser_workers: int
+    _loop: asyncio.AbstractEventLoop | None
+    _stop_event: asyncio.Event
+    # The modifications queue of each source, by attributes file path
+    _modifications: dict[Path, asyncio.Queue[Path | None]]
+    _drained: bool
+
+    def __init__(self, sources: tuple[MatchSource, ...], parser_backend: ParserBackend,
+                 log_match: Callable[[Match], None], queue_size: int = RUNTIME_QUEUE_SIZE,
+                 parser_workers: int | None = None):
+        """
+        Initialize the class.
+        :param sources: the sources to process, each with its own attributes file
+        :param parser_backend: the parser backend to use
+        :param log_match: invoked with every newly saved match
+        :param queue_size: the maximum amount of items waiting in front of each stage
+        :param parser_workers: the amount of parser threads shared by the sources (None for one per source)
+        """
+        self.sources = sources
+        self.parser_backend = parser_backend
+        self.log_match = log_match
+        self.queue_size = queue_size
+        self.parser_workers = parser_workers if parser_workers is not None else len(sources)
+        self._loop = None
+        self._drained = False
+
+    def run(self, file_watchers: tuple[FileWatcher, ...]) -> None:
+        """
+        Runs until interrupted (Ctrl-C) or stopped, the queued modifications are processed before returning.
+        The stages of each source are connected by bounded queues: the file watcher queues modifications,
+          the attributes file is parsed in the shared parser threads, the database writer saves the matches
+          and the saved matches of every source are logged on the event loop.
+        :param file_watchers: FileWatcher instances which invoke notify, started and stopped by the runtime
+        """
+        try:
+            asyncio.run(self._run(file_watchers))
+        except KeyboardInterrupt:
+            # The first interrupt drains the stages, a second interrupt aborts the shutdown
+            if not self._drained:
+                logging.warning("Shutdown interrupted, queued attributes file modifications were discarded.")
+
+    def stop(self) -> None:
+        """Stops the runtime while it's running, can be invoked from any thread."""
+        assert self._loop is not None, "The runtime isn't running."
+        self._loop.call_soon_threadsafe(self._stop_event.set)
+
+    def notify(self, file_path: Path) -> None:
+        """
+        Queues a modification of an attributes file, invoked by the file watchers.
+        Blocks while the queue is full, further modifications are coalesced by the watcher in the meantime.
+        :param file_path: the path of the modified file
+        """
+        assert self._loop is not None, "The runtime isn't running."
+        asyncio.run_coroutine_threadsafe(self._modifications[file_path].put(file_path), self._loop).result()
+
+    async def _run(self, file_watchers: tuple[FileWatcher, ...]) -> None:
+        """
+        Runs the stages until the runtime is stopped or cancelled, then drains them.
+        :param file_watchers: FileWatcher instances which invoke notify
+        """
+        self._loop = asyncio.get_running_loop()
+        self._stop_event = asyncio.Event()
+        self._modifications = {source.attributes_path: asyncio.Queue(self.queue_size) for source in self.sources}
+        saved_matches: asyncio.Queue[tuple[MatchSource, Match] | None] = asyncio.Queue(self.queue_size)
+
+        with ThreadPoolExecutor(max_workers=max(self.parser_workers, 1), thread_name_prefix="Parser") as executor:
+            source_stages: list[asyncio.Task[None]] = []
+            for source in self.sources:
+                parsed_attributes: asyncio.Queue[ParsedAttributes | None] = asyncio.Queue(self.queue_size)
+                source_stages.append(asyncio.create_task(self._parse_stage(source, executor, parsed_attributes)))
+                source_stages.append(asyncio.create_task(self._write_stage(source, parsed_attributes,
+                                                                           saved_matches)))
+            log_stage: asyncio.Task[None] = asyncio.create_task(self._log_stage(saved_matches))
+
+            for file_watcher in file_watchers:
+                file_watcher.start()
+            try:
+                await self._stop_event.wait()
+            except asyncio.CancelledError:
+                pass  # Interrupted, drain the stages
+
+            # Stop the watchers, pending bursts of modifications are still queued, then drain the stages in order
+            await self._loop.run_in_executor(None, _stop_file_watchers, file_watchers)
+            for modifications in self._modifications.values():
+                await modifications.put(None)
+            await asyncio.gather(*source_stages)
+            await saved_matches.put(None)
+            await log_stage
+        self._drained = True
+
+    async def _parse_stage(self, source: MatchSource, executor: ThreadPoolExecutor,
+                           parsed_attributes: asyncio.Queue[ParsedAttributes | None]) -> None:
+        """
+        Parses the attributes file of a source once per queued modification.
+        :param source: a MatchSource instance
+        :param executor: the executor of the parser threads
+        :param parsed_attributes: the queue of the write stage
+        """
+        assert self._loop is not None
+        modifications: asyncio.Queue[Path | None] = self._modifications[source.attributes_path]
+        while (file_path := await modifications.get()) is not None:
+            source.modifications += 1
+            parsed: ParsedAttributes | None = await self._loop.run_in_executor(
+                executor, parse_attributes_file, file_path, source.fingerprint_tracker, source.identity,
+                self.parser_backend, source.queued_fingerprint)
+            if parsed is not None:
+                source.parsed_matches += parsed.match is not None
+                source.queued_fingerprint = parsed.fingerprint
+                await parsed_attributes.put(parsed)
+        await parsed_attributes.put(None)
+
+    async def _write_stage(self, source: MatchSource, parsed_attributes: asyncio.Queue[ParsedAttributes | None],
+                           saved_matches: asyncio.Queue[tuple[MatchSource, Match] | None]) -> None:
+        """
+        Saves the parsed matches of a source through its database writer.
+        :param source: a MatchSource instance
+        :param parsed_attributes: the queue of parsed attributes files
+        :param saved_matches: the queue of the log stage
+        """
+        while (parsed := await parsed_attributes.get()) is not None:
+            try:
+                match_hash: str | None = await asyncio.wrap_future(source.writer.submit(
+                    partial(_write, source=source, parsed=parsed), on_commit=partial(_cache_match_hash, source)))
+            except (OSError, SqliteError) as exception:
+                logging.error("Failed to save the match.")
+                logging.debug(f"Failed to save the match: {exception=}")
+                # The match data is parsed again on the next modification
+                if source.queued_fingerprint == parsed.fingerprint:
+                    source.queued_fingerprint = None
+                continue
+            if match_hash is not None:
+                assert parsed.match is not None
+                source.saved_matches += 1
+                await saved_matches.put((source, parsed.match))
+
+    async def _log_stage(self, saved_matches: asyncio.Queue[tuple[MatchSource, Match] | None]) -> None:
+        """
+        Logs the saved matches of every source.
+        :param saved_matches: the queue of saved matches
+        """
+        while (item := await saved_matches.get()) is not None:
+            source, match = item
+            if len(self.sources) > 1:
+                logging.info(f"Source: {source.name}")
+            self.log_match(match)
+
+
+def _write(cursor: Cursor, source: MatchSource, parsed: ParsedAttributes) -> str | None:
+    """
+    Saves a match to the match logs and the database, invoked in the writer thread of the source.
+    :param cursor: the cursor of the writer's transaction
+    :param source: the MatchSource instance of the match
+    :param parsed: a ParsedAttributes instance
+    :return: the hash of the saved match, None if it couldn't be parsed or was already saved
+    """
+    # The fingerprint is updated once the match is written, a match which fails to be written is parsed again
+    match_hash: str | None = None
+    if parsed.match is not None:
+        match_hash = parsed.match.write(cursor, database=source.writer.database, segment_log=source.segment_log)
+    source.fingerprint_tracker.update(parsed.fingerprint, cursor=cursor)
+    return match_hash
+
+
+def _cache_match_hash(source: MatchSource, match_hash: str | None) -> None:
+    """
+    Caches the hash of a saved match once it's committed, invoked in the writer thread of the source.
+    :param source: the MatchSource instance of the match
+    :param match_hash: the hash of the saved match, or None
+    """
+    if match_hash is not None:
+        source.writer.database.hash_cache.add(match_hash)
+
+
+def _stop_file_watchers(file_watchers: tuple[FileWatcher, ...]) -> None:
+    """
+    Stops file watchers and waits until their threads terminate.
+    :param file_watchers: FileWatcher instances
+    """
+    for file_watcher in file_watchers:
+        file_watcher.stop()
+    for file_watcher in file_watchers:
+        file_watcher.join()
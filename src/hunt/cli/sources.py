@@ -0,0 +1,65 @@
+from dataclasses import dataclass
+from pathlib import Path
+
+from ..constants import DATABASE_PATH, DATABASE_TEST_SERVER_PATH, HUNT_SHOWDOWN_APP_ID, \
+    HUNT_SHOWDOWN_TEST_SERVER_APP_ID
+
+# The profiles directory of an install, relative to the install directory
+_PROFILES_DIRECTORY: Path = Path("user/profiles")
+_DEFAULT_PROFILE_NAME: str = "default"
+_APP_NAMES: dict[int, str] = {HUNT_SHOWDOWN_APP_ID: "live", HUNT_SHOWDOWN_TEST_SERVER_APP_ID: "test-server"}
+
+
+@dataclass(frozen=True)
+class SourceConfig:
+    # A name which identifies the source in the log output
+    name: str
+    attributes_path: Path
+    # The persona name of the player, None to use the persona name of the logged-in Steam user
+    persona_name: str | None
+    database_path: Path
+
+
+def profile_database_path(app_id: int, profile_name: str) -> Path:
+    """
+    Generates the path to the database of a game profile, the default profiles use the existing databases.
+    :param app_id: the app id of the game
+    :param profile_name: the name of the profile directory
+    :return: the path to the database
+    """
+    database_path: Path = DATABASE_PATH if app_id != HUNT_SHOWDOWN_TEST_SERVER_APP_ID else DATABASE_TEST_SERVER_PATH
+    if profile_name == _DEFAULT_PROFILE_NAME:
+        return database_path
+    return database_path.with_stem(f"{database_path.stem}_{profile_name}")
+
+
+def discover_sources(install_directories: dict[int, Path], all_profiles: bool,
+                     profile_personas: dict[str, str] | None = None) -> tuple[SourceConfig, ...]:
+    """
+    Generates the sources of game installs,
+      the default profiles use the persona name of the logged-in Steam user unless another one is configured.
+    :param install_directories: the install directories, by app id
+    :param all_profiles: True to watch every profile which has an attributes file, False for the default profile
+    :param profile_personas: the persona names of the profiles, by source name
+    :return: a tuple of SourceConfig instances
+    :raises ValueError: if the persona name of a profile other than the default profiles isn't configured
+    """
+    profile_personas = profile_personas or {}
+    sources: list[SourceConfig] = []
+    unresolved_names: list[str] = []
+    for app_id, install_directory in install_directories.items():
+        profiles_directory: Path = install_directory / _PROFILES_DIRECTORY
+        attributes_paths: list[Path] = sorted(profiles_directory.glob("*/attributes.xml")) if all_profiles else [
+            profiles_directory / _DEFAULT_PROFILE_NAME / "attributes.xml"]
+        for attributes_path in attributes_paths:
+            profile_name: str = attributes_path.parent.name
+            name: str = f"{_APP_NAMES.get(app_id, app_id)}/{profile_name}"
+            persona_name: str | None = profile_personas.get(name)
+            # Other profiles belong to other players, their matches can't be attributed to the logged-in user
+            if persona_name is None and profile_name != _DEFAULT_PROFILE_NAME:
+                unresolved_names.append(name)
+            sources.append(SourceConfig(name, attributes_path, persona_name,
+                                        database_path=profile_database_path(app_id, profile_name)))
+    if unresolved_names:
+        raise ValueError(f"Unresolved persona names of profiles: {', '.join(unresolved_names)}")
+    return tuple(sources)
@@ -7,18 +7,39 @@ HUNT_SHOWDOWN_TEST_SERVER_APP_ID: int = 770720  # Hunt: Showdown (Test Server) A
 WORKING_DIRECTORY: Path = Path.cwd()
 RESOURCES_PATH: Path = WORKING_DIRECTORY / "resources"
 MATCH_LOGS_PATH: Path = RESOURCES_PATH / "logs"
+MATCH_LOG_SEGMENTS_PATH: Path = MATCH_LOGS_PATH / "segments"
+MATCH_LOG_SEGMENT_SIZE: int = 16 << 20  # The size in bytes after which a new match log segment is started
+MATCH_LOG_ARCHIVE_INTERVAL: float = 3600.0  # The amount of seconds between each compression of archived match logs
+MATCH_LOG_MAPPED_SEGMENTS: int = 16  # The maximum amount of match log segments memory-mapped by a reader at once
 
 # Steam
 STEAMWORKS_BINARIES_PATH: Path = RESOURCES_PATH / "steam"
 STEAMWORKS_SDK_PATH: Path = STEAMWORKS_BINARIES_PATH / "steamworks_sdk.zip"
 
+# Attributes (the only attributes required to parse match data)
+MATCH_ATTRIBUTE_PREFIXES: tuple[str, ...] = ("MissionBag", "MissionAccoladeEntry_")
+MATCH_ATTRIBUTE_NAMES: tuple[str, ...] = ("Unlocks/UnlockRank", "Region", "SecondaryRegion")
+
 # Formatting
 STAR_SYMBOL: str = "★"
 MMR_RANGES: tuple[int, ...] = (0, 2000, 2300, 2600, 2750, 3001)
 
+# File watching
+WATCHDOG_QUIET_PERIOD: float = 0.5  # The amount of seconds without modifications after which a burst is over
+WATCHDOG_MAX_DELAY: float = 5.0  # The maximum amount of seconds a burst of modifications can delay processing
+WATCHDOG_POLL_INTERVAL: float = 1.0  # The amount of seconds between each stat call of the polling watcher
+
+# Runtime
+RUNTIME_QUEUE_SIZE: int = 4  # The maximum amount of items waiting in front of each processing stage
+
 # Database
 DATABASE_PATH: Path = RESOURCES_PATH / "match_data.db"
 DATABASE_TEST_SERVER_PATH: Path = RESOURCES_PATH / "match_data_ts.db"
+DATABASE_HASH_CACHE_CAPACITY: int = 1 << 18  # The maximum amount of match hashes kept in memory
+DATABASE_MIGRATION_BATCH_SIZE: int = 10000  # The amount of rows copied at once when rebuilding tables
+DATABASE_BULK_BATCH_SIZE: int = 2000  # The amount of matches saved per transaction by bulk commands
+DATABASE_WRITER_BATCH_SIZE: int = 64  # The maximum amount of write requests committed in a single transaction
+DATABASE_WRITER_MAX_DELAY: float = 0.02  # The maximum amount of seconds a write request waits before it's committed
 
 
 # Helper function to generate create table queries
@@ -26,7 +47,12 @@ def _create_table_helper(table_name: str, fields: tuple[str, ...]) -> str:
     return f"CREATE TABLE IF NOT EXISTS {table_name} ({', '.join(fields)})"
 
 
-# Tables
+# Helper function to generate create index queries
+def _create_index_helper(index_name: str, table_name: str, columns: tuple[str, ...]) -> str:
+    return f"CREATE INDEX IF NOT EXISTS {index_name} ON {table_name} ({', '.join(columns)})"
+
+
+# Tables (the initial schema, later schema changes are applied by hunt.database.migrations)
 _PLAYER_LOG_COLUMNS: tuple[str, ...] = ("id INTEGER PRIMARY KEY",
                                         "profile_id INTEGER UNIQUE",
                                         "name TEXT NOT NULL", "mmr INTEGER DEFAULT 0 NOT NULL",
@@ -35,4 +61,20 @@ _PLAYER_LOG_COLUMNS: tuple[str, ...] = ("id INTEGER PRIMARY KEY",
 DATABASE_TABLE_QUERIES: tuple[str, ...] = (
     _create_table_helper("data_hashes", ("id INTEGER PRIMARY KEY", "hash varchar(64) UNIQUE", "path TEXT NOT NULL")),
     _create_table_helper("player_log_bountyhunt", _PLAYER_LOG_COLUMNS),
-    _create_table_helper("player_log_quickplay", _PLAYER_LOG_COLUMNS))
+    _create_table_helper("player_log_quickplay", _PLAYER_LOG_COLUMNS),
+    _create_table_helper("application_state", ("key TEXT PRIMARY KEY", "value TEXT NOT NULL")),
+    # Matches (time is a UNIX timestamp) and every player in each match
+    _create_table_helper("matches", ("id INTEGER PRIMARY KEY", "hash varchar(64) UNIQUE NOT NULL",
+                                     "time INTEGER NOT NULL", "is_quickplay INTEGER NOT NULL",
+                                     "is_hunter_dead INTEGER NOT NULL", "bloodline_rank INTEGER NOT NULL",
+                                     "region TEXT NOT NULL")),
+    _create_table_helper("match_players", ("id INTEGER PRIMARY KEY",
+                                           "match_id INTEGER NOT NULL REFERENCES matches (id)",
+                                           "team INTEGER NOT NULL", "profile_id INTEGER NOT NULL",
+                                           "name TEXT NOT NULL", "mmr INTEGER NOT NULL",
+                                           "kills INTEGER NOT NULL", "deaths INTEGER NOT NULL")),
+    # Covering indexes for time range and player history queries
+    _create_index_helper("matches_time", "matches", ("time", "is_quickplay")),
+    _create_index_helper("match_players_match_id", "match_players", ("match_id",)),
+    _create_index_helper("match_players_profile_id", "match_players",
+                         ("profile_id", "match_id", "team", "name", "mmr", "kills", "deaths")))
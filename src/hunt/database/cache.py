@@ -0,0 +1,50 @@
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Iterable
+
+
+@dataclass(kw_only=True)
+class MatchHashCache:
+    capacity: int
+    hits: int = 0
+    misses: int = 0
+    _hashes: OrderedDict[str, None] = field(default_factory=OrderedDict)
+
+    def load(self, match_hashes: Iterable[str]) -> None:
+        """
+        Preloads match hashes, ordered from the least to the most recently used.
+        :param match_hashes: the hashes to preload
+        """
+        for match_hash in match_hashes:
+            self.add(match_hash)
+
+    def lookup(self, match_hash: str) -> bool:
+        """
+        Checks if a match hash is known without querying the database.
+        A missing hash is never known to be missing: other processes (e.g. a backfill) may save hashes to the same
+          database, only the database answers definitively.
+        :param match_hash: the hash to check for
+        :return: True if the hash is known, False if the database has to be queried
+        """
+        if match_hash in self._hashes:
+            self._hashes.move_to_end(match_hash)
+            self.hits += 1
+            return True
+
+        self.misses += 1
+        return False
+
+    def add(self, match_hash: str) -> None:
+        """
+        Caches a match hash which is stored in the database, evicting the least recently used hash if required.
+        :param match_hash: the hash to cache
+        """
+        self._hashes[match_hash] = None
+        self._hashes.move_to_end(match_hash)
+        if len(self._hashes) > self.capacity:
+            # Evicted hashes are still stored in the database
+            self._hashes.popitem(last=False)
+
+    def __len__(self) -> int:
+        """Return the amount of cached hashes."""
+        return len(self._hashes)
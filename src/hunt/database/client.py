@@ -1,32 +1,103 @@
 from __future__ import annotations
 
-from contextlib import closing
-from dataclasses import dataclass
+from contextlib import closing, contextmanager
+from dataclasses import dataclass, field
+from enum import StrEnum
 from pathlib import Path
 from sqlite3 import Connection, Cursor, connect as sqlite3_connect
 from types import TracebackType
+from typing import Generator
 
-from ..constants import DATABASE_TABLE_QUERIES
+from .cache import MatchHashCache
+from .migrations import migrate
+from ..constants import DATABASE_HASH_CACHE_CAPACITY
+
+
+class DatabaseProfile(StrEnum):
+    # SQLite defaults: a rollback journal which is synchronized on every commit
+    #   (the journal mode persists in the database, it's reset after a performance run)
+    DURABLE = "durable"
+    # A write-ahead log which is synchronized on checkpoints, larger caches and memory-mapped reads
+    PERFORMANCE = "performance"
+
+
+@dataclass(frozen=True)
+class _ProfileSettings:
+    pragmas: tuple[str, ...]
+    cached_statements: int
+    optimize_on_close: bool
+
+
+_PROFILE_SETTINGS: dict[DatabaseProfile, _ProfileSettings] = {
+    DatabaseProfile.DURABLE: _ProfileSettings(
+        pragmas=("PRAGMA journal_mode = DELETE",
+                 "PRAGMA synchronous = FULL"),
+        cached_statements=128, optimize_on_close=False),
+    DatabaseProfile.PERFORMANCE: _ProfileSettings(
+        pragmas=("PRAGMA journal_mode = WAL",
+                 "PRAGMA synchronous = NORMAL",
+                 "PRAGMA cache_size = -16384",  # 16 MiB
+                 "PRAGMA mmap_size = 268435456",  # 256 MiB
+                 "PRAGMA temp_store = MEMORY"),
+        cached_statements=256, optimize_on_close=True)}
+
+# The most recent matches are read backwards from the time index, the cost doesn't depend on the amount of saved
+#   matches
+_HASH_CACHE_QUERY: str = "SELECT hash FROM matches ORDER BY time DESC LIMIT ?"
+# Every saved match has a data hash, including the matches saved by legacy versions (without match data), which are
+#   read in the order of the primary key
+_HASH_CACHE_FILL_QUERY: str = "SELECT hash FROM data_hashes LIMIT ?"
 
 
 @dataclass(kw_only=True)
 class Client:
     file_path: Path
+    profile: DatabaseProfile = DatabaseProfile.DURABLE
+    hash_cache_capacity: int = DATABASE_HASH_CACHE_CAPACITY
+    hash_cache: MatchHashCache = field(init=False)
     _connection: Connection | None = None
 
     def __post_init__(self) -> None:
         """Setup the database connection."""
-        self._connection = sqlite3_connect(f"file:{self.file_path}", check_same_thread=False, uri=True)
+        settings: _ProfileSettings = _PROFILE_SETTINGS[self.profile]
+        self._connection = sqlite3_connect(f"file:{self.file_path}", check_same_thread=False, uri=True,
+                                           cached_statements=settings.cached_statements)
+        self._setup_profile()
         self._setup_database()
+        self._setup_hash_cache()
+
+    def _setup_profile(self) -> None:
+        """Applies the pragmas of the database profile."""
+        cursor: Cursor
+        with closing(self.cursor()) as cursor:
+            for pragma in _PROFILE_SETTINGS[self.profile].pragmas:
+                cursor.execute(pragma)
 
     def _setup_database(self) -> None:
-        """Sets up the database by creating the required tables."""
+        """
+        Sets up the database by migrating the schema to the latest version.
+        :raises DatabaseError: if the database was created by a newer version of the application (migrate)
+        """
+        assert self._connection is not None
+        migrate(self._connection)
+
+    def _setup_hash_cache(self) -> None:
+        """
+        Preloads the hashes of the most recent matches into the hash cache.
+        If there are fewer matches than the capacity of the cache, it's filled with the other data hashes.
+        """
+        self.hash_cache = MatchHashCache(capacity=self.hash_cache_capacity)
+
         cursor: Cursor
         with closing(self.cursor()) as cursor:
-            # Setup each table
-            for table_query in DATABASE_TABLE_QUERIES:
-                cursor.execute(table_query)
-        self.save()
+            match_hashes: list[str] = [
+                row[0].hex() for row in cursor.execute(_HASH_CACHE_QUERY, (self.hash_cache_capacity,))]
+            data_hashes: list[str] = [] if len(match_hashes) >= self.hash_cache_capacity else [
+                row[0].hex() for row in cursor.execute(_HASH_CACHE_FILL_QUERY, (self.hash_cache_capacity,))]
+
+        # The hashes are preloaded from the least to the most recent, the most recent matches are evicted last
+        self.hash_cache.load(data_hashes)
+        self.hash_cache.load(reversed(match_hashes))
 
     def cursor(self) -> Cursor:
         """Returns a new Cursor instance."""
@@ -38,9 +109,29 @@ class Client:
         assert self._connection is not None
         self._connection.commit()
 
+    @contextmanager
+    def transaction(self) -> Generator[Cursor, None, None]:
+        """
+        Executes statements in a single transaction,
+          the changes are committed if no exceptions are raised, otherwise they're rolled back.
+        :return: a generator which yields a Cursor instance
+        """
+        assert self._connection is not None
+
+        cursor: Cursor
+        with closing(self.cursor()) as cursor:
+            try:
+                yield cursor
+            except BaseException:
+                self._connection.rollback()
+                raise
+        self.save()
+
     def close(self) -> None:
         """Closes the connection."""
         assert self._connection is not None
+        if _PROFILE_SETTINGS[self.profile].optimize_on_close:
+            self._connection.execute("PRAGMA optimize")
         self._connection.close()
 
     # Context manager support
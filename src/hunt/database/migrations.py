@@ -0,0 +1,162 @@
+import os
+from contextlib import closing
+from dataclasses import dataclass
+from sqlite3 import Connection, Cursor
+from typing import Any, Callable, TypeAlias
+
+from ..constants import DATABASE_MIGRATION_BATCH_SIZE, DATABASE_TABLE_QUERIES, MATCH_LOGS_PATH
+from ..exceptions import DatabaseError
+
+Row: TypeAlias = tuple[Any, ...]
+
+
+@dataclass(frozen=True)
+class Migration:
+    version: int
+    description: str
+    apply: Callable[[Cursor], None]
+
+
+def rebuild_table(cursor: Cursor, table_name: str, columns: tuple[str, ...], copied_columns: tuple[str, ...],
+                  convert: Callable[[Row], Row] | None = None, without_rowid: bool = False,
+                  batch_size: int = DATABASE_MIGRATION_BATCH_SIZE) -> None:
+    """
+    Rebuilds a table with new column definitions, copying the rows in batches.
+    Indexes of the previous table are dropped and have to be recreated.
+    :param cursor: the cursor of the migration transaction
+    :param table_name: the name of the table to rebuild
+    :param columns: the column definitions of the rebuilt table
+    :param copied_columns: the names of the columns copied to the rebuilt table
+    :param convert: converts each copied row, if provided
+    :param without_rowid: True if the rebuilt table is a WITHOUT ROWID table
+    :param batch_size: the amount of rows copied at once
+    """
+    rebuilt_table_name: str = f"{table_name}_rebuild"
+    cursor.execute(f"CREATE TABLE {rebuilt_table_name} ({', '.join(columns)})"
+                   f"{' WITHOUT ROWID' if without_rowid else ''}")
+
+    # Copy the rows in batches (ordered by rowid) to keep memory usage bounded
+    select_query: str = f"SELECT rowid, {', '.join(copied_columns)} FROM {table_name} " \
+                        f"WHERE rowid > ? ORDER BY rowid LIMIT ?"
+    insert_query: str = f"INSERT INTO {rebuilt_table_name} ({', '.join(copied_columns)}) " \
+                        f"VALUES ({', '.join('?' for _ in copied_columns)})"
+    last_rowid: int = -1 << 63
+    while rows := cursor.execute(select_query, (last_rowid, batch_size)).fetchall():
+        cursor.executemany(insert_query, (convert(row[1:]) if convert is not None else row[1:] for row in rows))
+        last_rowid = rows[-1][0]
+
+    cursor.execute(f"DROP TABLE {table_name}")
+    cursor.execute(f"ALTER TABLE {rebuilt_table_name} RENAME TO {table_name}")
+
+
+def _create_initial_schema(cursor: Cursor) -> None:
+    """
+    Creates the initial schema.
+    Databases created before versioning was introduced already contain some (or all) of the tables.
+    :param cursor: the cursor of the migration transaction
+    """
+    for query in DATABASE_TABLE_QUERIES:
+        cursor.execute(query)
+
+
+def _compact_match_hashes(cursor: Cursor) -> None:
+    """
+    Stores match hashes as 32 byte digests rather than hex strings,
+      and match log paths relative to the match logs directory.
+    The data hashes are keyed by the digest, which removes the rowid and the separate unique index.
+    :param cursor: the cursor of the migration transaction
+    """
+    # Equivalent to relative_log_path, constructing a Path for each row dominates the migration time otherwise
+    logs_path_prefix: str = f"{MATCH_LOGS_PATH}{os.sep}"
+
+    def _convert_data_hash(row: Row) -> Row:
+        match_hash, path = row
+        if path.startswith(logs_path_prefix):
+            path = path[len(logs_path_prefix):].replace(os.sep, "/")
+        return bytes.fromhex(match_hash), path
+
+    rebuild_table(cursor, "data_hashes", columns=("hash BLOB PRIMARY KEY", "path TEXT NOT NULL"),
+                  copied_columns=("hash", "path"), convert=_convert_data_hash, without_rowid=True)
+
+    # The match ids are copied, the players in each match keep referencing the same match
+    match_columns: tuple[str, ...] = ("id", "hash", "time", "is_quickplay", "is_hunter_dead", "bloodline_rank",
+                                      "region")
+    rebuild_table(cursor, "matches",
+                  columns=("id INTEGER PRIMARY KEY", "hash BLOB UNIQUE NOT NULL", "time INTEGER NOT NULL",
+                           "is_quickplay INTEGER NOT NULL", "is_hunter_dead INTEGER NOT NULL",
+                           "bloodline_rank INTEGER NOT NULL", "region TEXT NOT NULL"),
+                  copied_columns=match_columns, convert=lambda row: (row[0], bytes.fromhex(row[1]), *row[2:]))
+    cursor.execute("CREATE INDEX matches_time ON matches (time, is_quickplay)")
+
+
+def _index_match_log_segments(cursor: Cursor) -> None:
+    """
+    Adds the offset index of match logs stored in segments, the path of such a match log is the path of its segment.
+    The offset and the length are NULL for match logs stored as files.
+    :param cursor: the cursor of the migration transaction
+    """
+    cursor.execute("ALTER TABLE data_hashes ADD COLUMN log_offset INTEGER")
+    cursor.execute("ALTER TABLE data_hashes ADD COLUMN log_length INTEGER")
+
+
+def _cover_match_hashes(cursor: Cursor) -> None:
+    """
+    Adds the match hash to the time index, time range queries of the match archive don't read the matches table.
+    :param cursor: the cursor of the migration transaction
+    """
+    cursor.execute("DROP INDEX matches_time")
+    cursor.execute("CREATE INDEX matches_time ON matches (time, is_quickplay, hash)")
+
+
+# Migrations must never be modified once released, schema changes require a new migration
+MIGRATIONS: tuple[Migration, ...] = (
+    Migration(1, "Create the initial schema", _create_initial_schema),
+    Migration(2, "Store match hashes as digests and match log paths relative to the logs", _compact_match_hashes),
+    Migration(3, "Index the match logs stored in segments", _index_match_log_segments),
+    Migration(4, "Cover the match hashes by the time index", _cover_match_hashes),
+)
+
+
+def get_schema_version(connection: Connection) -> int:
+    """
+    Reads the schema version of a database.
+    :param connection: a sqlite3 Connection instance
+    :return: the schema version, 0 if the database isn't versioned
+    """
+    cursor: Cursor
+    with closing(connection.cursor()) as cursor:
+        return int(cursor.execute("PRAGMA user_version").fetchone()[0])
+
+
+def migrate(connection: Connection, migrations: tuple[Migration, ...] = MIGRATIONS) -> int:
+    """
+    Applies every pending migration, each in its own transaction.
+    No statements other than reading the schema version are executed if the schema is up-to-date.
+    :param connection: a sqlite3 Connection instance
+    :param migrations: the migrations, ordered by version
+    :return: the amount of applied migrations
+    :raises DatabaseError: if the database was created by a newer version of the application
+    """
+    schema_version: int = get_schema_version(connection)
+    latest_version: int = migrations[-1].version if migrations else 0
+    if schema_version > latest_version:
+        raise DatabaseError(f"The database schema version ({schema_version}) is newer than the latest supported "
+                            f"schema version ({latest_version}).")
+
+    applied_migrations: int = 0
+    for migration in migrations:
+        if migration.version <= schema_version:
+            continue
+
+        cursor: Cursor
+        with closing(connection.cursor()) as cursor:
+            cursor.execute("BEGIN")
+            try:
+                migration.apply(cursor)
+                cursor.execute(f"PRAGMA user_version = {migration.version:d}")
+            except BaseException:
+                connection.rollback()
+                raise
+        connection.commit()
+        applied_migrations += 1
+    return applied_migrations
@@ -0,0 +1,26 @@
+from pathlib import Path
+
+from ..constants import MATCH_LOGS_PATH
+
+
+def relative_log_path(file_path: Path) -> str:
+    """
+    Converts a match log path to the path stored in the database.
+    :param file_path: the path to a match log
+    :return: the path relative to the match logs directory, or
+             the unmodified path if the match log isn't in the match logs directory
+    """
+    try:
+        return file_path.relative_to(MATCH_LOGS_PATH).as_posix()
+    except ValueError:
+        return str(file_path)
+
+
+def resolve_log_path(path: str) -> Path:
+    """
+    Converts a path stored in the database to the path of the match log.
+    :param path: a path stored in the database
+    :return: the path to the match log
+    """
+    # Paths outside the match logs directory are stored as absolute paths, which are kept when joined
+    return MATCH_LOGS_PATH / path
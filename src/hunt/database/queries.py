@@ -1,34 +1,107 @@
+from concurrent.futures import Future
 from contextlib import closing
+from dataclasses import dataclass
+from datetime import datetime
+from functools import partial
 from pathlib import Path
+from typing import Generator, Iterable
 
 from .client import Client as DatabaseClient, Cursor
+from .paths import relative_log_path, resolve_log_path
+from .writer import DatabaseWriter
+from ..filesystem.segments import SegmentLocation
+
+
+@dataclass(frozen=True)
+class PlayerRecord:
+    team: int
+    profile_id: int
+    name: str
+    mmr: int
+    kills: int
+    deaths: int
+
+
+@dataclass(frozen=True)
+class MatchRecord:
+    match_hash: str
+    file_path: Path
+    time: datetime
+    is_quickplay: bool
+    is_hunter_dead: bool
+    bloodline_rank: int
+    region: str
+    players: tuple[PlayerRecord, ...]
+    # The record of the match log if it's stored in a segment (file_path is the path of the segment)
+    log_location: SegmentLocation | None = None
+
+
+@dataclass(frozen=True)
+class PlayerEncounter:
+    time: datetime
+    is_quickplay: bool
+    team: int
+    name: str
+    mmr: int
+    kills: int
+    deaths: int
+
+
+@dataclass(frozen=True)
+class ArchivedMatchLog:
+    match_hash: str
+    time: datetime
+    is_quickplay: bool
+    # The path of a match log file, or the location of a match log in a segment
+    location: Path | SegmentLocation
 
 
 def data_hash_exists(database: DatabaseClient, match_hash: str) -> bool:
     """
     Checks if a match hash already exists in the database
     :param database: a DatabaseClient instance
-    :param match_hash: the hash to check for
+    :param match_hash: the hash to check for (a hex digest)
     :return: True if a hash is already in the database, otherwise False
     """
+    # Answer from the hash cache if possible, hashes which aren't cached are looked up by the primary key
+    if database.hash_cache.lookup(match_hash):
+        return True
+
     cursor: Cursor
     with closing(database.cursor()) as cursor:
         query: str = "SELECT EXISTS(SELECT 1 FROM data_hashes WHERE hash = ?)"
-        return cursor.execute(query, (match_hash,)).fetchone()[0] >= 1
+        exists: bool = cursor.execute(query, (bytes.fromhex(match_hash),)).fetchone()[0] >= 1
+
+    if exists:
+        database.hash_cache.add(match_hash)
+    return exists
 
 
 def insert_match_hash(database: DatabaseClient, match_hash: str, file_path: Path) -> None:
     """
     Saves a match hash to the database.
     :param database: a DatabaseClient instance
-    :param match_hash: the hash to save
-    :param file_path: the path to the file
+    :param match_hash: the hash to save (a hex digest)
+    :param file_path: the path to the file, stored relative to the match logs directory
     """
     cursor: Cursor
-    with closing(database.cursor()) as cursor:
+    with database.transaction() as cursor:
         query: str = "INSERT INTO data_hashes (hash, path) VALUES (?, ?)"
-        cursor.execute(query, (match_hash, str(file_path)))
-    database.save()
+        cursor.execute(query, (bytes.fromhex(match_hash), relative_log_path(file_path)))
+    database.hash_cache.add(match_hash)
+
+
+def _player_log_upsert_query(is_quickplay: bool) -> str:
+    """
+    Generates a query which inserts a player into the player log, or updates the player if it already exists.
+    The parameters are the profile id, name, MMR, kills and deaths of the player.
+    :param is_quickplay: True if the match was a quickplay match
+    :return: an upsert query
+    """
+    table_name: str = "player_log_quickplay" if is_quickplay else "player_log_bountyhunt"
+    return f"INSERT INTO {table_name} (profile_id, name, mmr, kills, deaths, encounters) VALUES (?, ?, ?, ?, ?, 1) " \
+           "ON CONFLICT (profile_id) DO UPDATE SET name = excluded.name, mmr = excluded.mmr, " \
+           "kills = kills + excluded.kills, deaths = deaths + excluded.deaths, encounters = encounters + 1"
 
 
 def update_player_data(database: DatabaseClient, profile_id: int, name: str, mmr: int,
@@ -43,22 +116,307 @@ def update_player_data(database: DatabaseClient, profile_id: int, name: str, mmr
     :param deaths: the amount of times we died to the player
     :param is_quickplay: True if the match was a quickplay match
     """
-    # Construct the queries to execute (the strings are duplicated for easier code refactoring/highlighting)
-    insert_query: str = "INSERT OR IGNORE INTO player_log_bountyhunt (profile_id, name) VALUES (?, ?)"
-    update_query: str = "UPDATE player_log_bountyhunt SET name = ?, mmr = ?, " \
-                        "kills = kills + ?, deaths = deaths + ?, " \
-                        "encounters = encounters + 1 WHERE profile_id = ?"
-    if is_quickplay:
-        insert_query = "INSERT OR IGNORE INTO player_log_quickplay (profile_id, name) VALUES (?, ?)"
-        update_query = "UPDATE player_log_quickplay SET name = ?, mmr = ?, " \
-                       "kills = kills + ?, deaths = deaths + ?, " \
-                       "encounters = encounters + 1 WHERE profile_id = ?"
+    cursor: Cursor
+    with database.transaction() as cursor:
+        cursor.execute(_player_log_upsert_query(is_quickplay), (profile_id, name, mmr, kills, deaths))
+
+
+def _match_log_row(match: MatchRecord, digest: bytes) -> tuple[bytes, str, int | None, int | None]:
+    """
+    Generates the data hashes row of a match.
+    :param match: the match to save
+    :param digest: the match hash as a digest
+    :return: the hash, the path, the offset and the length of the match log
+    """
+    if match.log_location is None:
+        return digest, relative_log_path(match.file_path), None, None
+    return digest, relative_log_path(match.file_path), match.log_location.offset, match.log_location.length
+
+
+def _insert_match_rows(cursor: Cursor, match: MatchRecord, digest: bytes, update_player_log: bool = True) -> None:
+    """
+    Saves a match, the players in the match and updates the player log, the match hash must already be saved.
+    :param cursor: the cursor of the current transaction
+    :param match: the match to save
+    :param digest: the match hash as a digest
+    :param update_player_log: False if the players of the match are already counted in the player log
+    """
+    # Save the match and the players in the match
+    query: str = "INSERT INTO matches (hash, time, is_quickplay, is_hunter_dead, bloodline_rank, region) " \
+                 "VALUES (?, ?, ?, ?, ?, ?)"
+    cursor.execute(query, (digest, int(match.time.timestamp()), match.is_quickplay,
+                           match.is_hunter_dead, match.bloodline_rank, match.region))
+    match_id: int | None = cursor.lastrowid
+    query = "INSERT INTO match_players (match_id, team, profile_id, name, mmr, kills, deaths) " \
+            "VALUES (?, ?, ?, ?, ?, ?, ?)"
+    cursor.executemany(query, ((match_id, player.team, player.profile_id, player.name, player.mmr,
+                                player.kills, player.deaths) for player in match.players))
+
+    # Update the player log
+    if not update_player_log:
+        return
+    cursor.executemany(_player_log_upsert_query(match.is_quickplay),
+                       ((player.profile_id, player.name, player.mmr, player.kills, player.deaths)
+                        for player in match.players))
+
+
+def write_match(cursor: Cursor, match: MatchRecord) -> bool:
+    """
+    Saves a match, the players in the match and updates the player log in the current transaction.
+    The match hash isn't added to the hash cache, the caller adds it once the transaction is committed.
+    :param cursor: the cursor of the current transaction
+    :param match: the match to save
+    :return: True if the match was saved, False if the match is already saved
+    """
+    digest: bytes = bytes.fromhex(match.match_hash)
+    cursor.execute("INSERT INTO data_hashes (hash, path, log_offset, log_length) VALUES (?, ?, ?, ?) "
+                   "ON CONFLICT DO NOTHING", _match_log_row(match, digest))
+    if cursor.rowcount >= 1:
+        _insert_match_rows(cursor, match, digest)
+        return True
+
+    # Databases created before the matches table only saved the hash and updated the player log, the match data of
+    #   these hashes is saved without counting the players again and the hash is pointed to the saved match log
+    query: str = "SELECT EXISTS(SELECT 1 FROM matches WHERE hash = ?)"
+    if cursor.execute(query, (digest,)).fetchone()[0] >= 1:
+        return False  # The match (or a duplicate of it) is already saved
+    _, path, log_offset, log_length = _match_log_row(match, digest)
+    cursor.execute("UPDATE data_hashes SET path = ?, log_offset = ?, log_length = ? WHERE hash = ?",
+                   (path, log_offset, log_length, digest))
+    _insert_match_rows(cursor, match, digest, update_player_log=False)
+    return True
+
+
+def submit_match(writer: DatabaseWriter, match: MatchRecord) -> Future[bool]:
+    """
+    Queues a match to be saved by the database writer, the match hash is cached once it's committed.
+    :param writer: a DatabaseWriter instance
+    :param match: the match to save
+    :return: a Future instance which completes with True if the match was saved, False if it already exists
+    """
+    def cache_match_hash(saved: bool) -> None:
+        if saved:
+            writer.database.hash_cache.add(match.match_hash)
+    return writer.submit(partial(write_match, match=match), on_commit=cache_match_hash)
+
+
+def insert_match(database: DatabaseClient, match: MatchRecord) -> None:
+    """
+    Saves a match, the players in the match and updates the player log in a single transaction.
+    :param database: a DatabaseClient instance
+    :param match: the match to save
+    :raises IntegrityError: if the match hash already exists, no changes are made
+    """
+    digest: bytes = bytes.fromhex(match.match_hash)
+    cursor: Cursor
+    with database.transaction() as cursor:
+        cursor.execute("INSERT INTO data_hashes (hash, path, log_offset, log_length) VALUES (?, ?, ?, ?)",
+                       _match_log_row(match, digest))
+        _insert_match_rows(cursor, match, digest)
+    database.hash_cache.add(match.match_hash)
+
+
+def insert_matches(database: DatabaseClient, matches: Iterable[MatchRecord]) -> int:
+    """
+    Saves multiple matches in a single transaction, skipping matches whose hash already exists.
+    :param database: a DatabaseClient instance
+    :param matches: the matches to save, in chronological order
+    :return: the amount of saved matches
+    """
+    inserted_hashes: list[str] = []
+
+    cursor: Cursor
+    with database.transaction() as cursor:
+        inserted_hashes.extend(match.match_hash for match in matches if write_match(cursor, match))
+
+    for match_hash in inserted_hashes:
+        database.hash_cache.add(match_hash)
+    return len(inserted_hashes)
+
+
+def fetch_match_log_paths(database: DatabaseClient) -> set[str]:
+    """
+    Fetches the paths of every saved match log stored as a file, as stored in the database.
+    Match logs whose hash is saved without its match data (e.g. by legacy databases) aren't included.
+    :param database: a DatabaseClient instance
+    :return: a set of paths, relative to the match logs directory if possible
+    """
+    cursor: Cursor
+    with closing(database.cursor()) as cursor:
+        query: str = "SELECT data_hashes.path FROM data_hashes JOIN matches ON matches.hash = data_hashes.hash " \
+                     "WHERE data_hashes.log_offset IS NULL"
+        return {row[0] for row in cursor.execute(query)}
+
+
+def fetch_segment_offsets(database: DatabaseClient) -> set[tuple[str, int]]:
+    """
+    Fetches the locations of every saved match log stored in a segment.
+    Match logs whose hash is saved without its match data aren't included.
+    :param database: a DatabaseClient instance
+    :return: a set of (segment path, offset) tuples, the paths as stored in the database
+    """
+    cursor: Cursor
+    with closing(database.cursor()) as cursor:
+        query: str = "SELECT data_hashes.path, data_hashes.log_offset FROM data_hashes " \
+                     "JOIN matches ON matches.hash = data_hashes.hash WHERE data_hashes.log_offset IS NOT NULL"
+        return {(path, offset) for path, offset in cursor.execute(query)}
+
+
+def fetch_match_log(database: DatabaseClient, match_hash: str) -> Path | SegmentLocation | None:
+    """
+    Fetches the location of a saved match log from the offset index.
+    :param database: a DatabaseClient instance
+    :param match_hash: the hash of the match (a hex digest)
+    :return: the path of a match log file, the location of a match log in a segment, or None if it isn't saved
+    """
+    cursor: Cursor
+    with closing(database.cursor()) as cursor:
+        query: str = "SELECT path, log_offset, log_length FROM data_hashes WHERE hash = ?"
+        row: tuple[str, int | None, int | None] | None = cursor.execute(
+            query, (bytes.fromhex(match_hash),)).fetchone()
+    if row is None:
+        return None
+    return _match_log_location(*row)
+
+
+def _match_log_location(path: str, offset: int | None, length: int | None) -> Path | SegmentLocation:
+    """
+    Converts the data hashes columns of a match log to its location.
+    :param path: the path as stored in the database
+    :param offset: the offset of the record in the segment, None for match log files
+    :param length: the length of the record in the segment, None for match log files
+    :return: the path of a match log file, or the location of a match log in a segment
+    """
+    if offset is None or length is None:
+        return resolve_log_path(path)
+    return SegmentLocation(resolve_log_path(path), offset, length)
+
+
+def fetch_archived_match_logs(database: DatabaseClient, since: datetime | None = None, until: datetime | None = None,
+                              is_quickplay: bool | None = None,
+                              offset: int = 0) -> Generator[ArchivedMatchLog, None, None]:
+    """
+    Fetches the match logs of the saved matches from the time index, ordered by time.
+    The rows are fetched lazily, a time range only reads the index entries (and the match logs) in the range.
+    :param database: a DatabaseClient instance
+    :param since: if provided, only matches from this point in time onwards are fetched
+    :param until: if provided, only matches before this point in time are fetched
+    :param is_quickplay: if provided, only quickplay (True) or bounty hunt (False) matches are fetched
+    :param offset: the amount of matches skipped, in time order
+    :return: a generator which yields an ArchivedMatchLog instance for each match
+    """
+    query: str = "SELECT matches.hash, matches.time, matches.is_quickplay, " \
+                 "data_hashes.path, data_hashes.log_offset, data_hashes.log_length " \
+                 "FROM matches JOIN data_hashes ON data_hashes.hash = matches.hash " \
+                 "WHERE matches.time >= ? AND matches.time < ?"
+    parameters: list[int] = [int(since.timestamp()) if since is not None else 0,
+                             int(until.timestamp()) if until is not None else 2 ** 63 - 1]
+    if is_quickplay is not None:
+        query += " AND matches.is_quickplay = ?"
+        parameters.append(is_quickplay)
+    query += " ORDER BY matches.time LIMIT -1 OFFSET ?"
+    parameters.append(offset)
 
     cursor: Cursor
     with closing(database.cursor()) as cursor:
-        # Insert the data if it doesn't exist
-        cursor.execute(insert_query, (profile_id, name))
+        match_hash: bytes
+        time: int
+        quickplay: int
+        path: str
+        log_offset: int | None
+        log_length: int | None
+        for match_hash, time, quickplay, path, log_offset, log_length in cursor.execute(query, parameters):
+            yield ArchivedMatchLog(match_hash.hex(), datetime.fromtimestamp(time), bool(quickplay),
+                                   _match_log_location(path, log_offset, log_length))
+
 
-        # Update all relevant values
-        cursor.execute(update_query, (name, mmr, kills, deaths, profile_id))
-    database.save()
+def count_matches(database: DatabaseClient) -> int:
+    """
+    Counts the saved matches.
+    :param database: a DatabaseClient instance
+    :return: the amount of saved matches
+    """
+    cursor: Cursor
+    with closing(database.cursor()) as cursor:
+        return int(cursor.execute("SELECT COUNT(*) FROM matches").fetchone()[0])
+
+
+def relocate_match_log(cursor: Cursor, match_hash: str, location: SegmentLocation) -> None:
+    """
+    Points a saved match to its match log in a segment in the current transaction, used to convert match log files.
+    :param cursor: the cursor of the current transaction
+    :param match_hash: the hash of the match (a hex digest)
+    :param location: the location of the match log in a segment
+    """
+    cursor.execute("UPDATE data_hashes SET path = ?, log_offset = ?, log_length = ? WHERE hash = ?",
+                   (relative_log_path(location.file_path), location.offset, location.length,
+                    bytes.fromhex(match_hash)))
+
+
+def rename_match_logs(cursor: Cursor, file_paths: list[tuple[Path, Path]]) -> None:
+    """
+    Points saved matches to the new paths of their match log files in the current transaction,
+      used to compress archived match logs. Paths which aren't saved in the database are ignored.
+    :param cursor: the cursor of the current transaction
+    :param file_paths: the (current path, new path) tuples of the match log files
+    """
+    cursor.executemany("UPDATE data_hashes SET path = ? WHERE path = ? AND log_offset IS NULL",
+                       ((relative_log_path(new_file_path), relative_log_path(file_path))
+                        for file_path, new_file_path in file_paths))
+
+
+def fetch_player_history(database: DatabaseClient, profile_id: int,
+                         since: datetime | None = None) -> tuple[PlayerEncounter, ...]:
+    """
+    Fetches every encounter with a player, ordered by time.
+    :param database: a DatabaseClient instance
+    :param profile_id: the profile id of the player
+    :param since: if provided, only encounters from this point in time onwards are fetched
+    :return: a tuple of PlayerEncounter instances
+    """
+    cursor: Cursor
+    with closing(database.cursor()) as cursor:
+        query: str = "SELECT matches.time, matches.is_quickplay, match_players.team, match_players.name, " \
+                     "match_players.mmr, match_players.kills, match_players.deaths " \
+                     "FROM match_players JOIN matches ON matches.id = match_players.match_id " \
+                     "WHERE match_players.profile_id = ? AND matches.time >= ? ORDER BY matches.time"
+        rows: list[tuple[int, int, int, str, int, int, int]] = cursor.execute(
+            query, (profile_id, int(since.timestamp()) if since is not None else 0)).fetchall()
+    return tuple(PlayerEncounter(datetime.fromtimestamp(time), bool(is_quickplay), team, name, mmr, kills, deaths)
+                 for time, is_quickplay, team, name, mmr, kills, deaths in rows)
+
+
+def get_application_state(database: DatabaseClient, key: str) -> str | None:
+    """
+    Fetches a persisted application state value.
+    :param database: a DatabaseClient instance
+    :param key: the key of the value
+    :return: the value if it exists, otherwise None
+    """
+    cursor: Cursor
+    with closing(database.cursor()) as cursor:
+        query: str = "SELECT value FROM application_state WHERE key = ?"
+        row: tuple[str] | None = cursor.execute(query, (key,)).fetchone()
+        return row[0] if row is not None else None
+
+
+def set_application_state(database: DatabaseClient, key: str, value: str) -> None:
+    """
+    Persists an application state value, replacing the previous value.
+    :param database: a DatabaseClient instance
+    :param key: the key of the value
+    :param value: the value to persist
+    """
+    cursor: Cursor
+    with database.transaction() as cursor:
+        write_application_state(cursor, key=key, value=value)
+
+
+def write_application_state(cursor: Cursor, key: str, value: str) -> None:
+    """
+    Persists an application state value in the current transaction, replacing the previous value.
+    :param cursor: the cursor of the current transaction
+    :param key: the key of the value
+    :param value: the value to persist
+    """
+    cursor.execute("INSERT OR REPLACE INTO application_state (key, value) VALUES (?, ?)", (key, value))
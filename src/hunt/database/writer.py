@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass
+from sqlite3 import Cursor
+from types import TracebackType
+from typing import Any, Callable, Generic, TypeVar
+
+from .client import Client as DatabaseClient
+from ..constants import DATABASE_WRITER_BATCH_SIZE, DATABASE_WRITER_MAX_DELAY
+from ..exceptions import DatabaseError
+
+_T = TypeVar("_T")
+
+
+@dataclass(frozen=True)
+class _WriteRequest(Generic[_T]):
+    function: Callable[[Cursor], _T]
+    on_commit: Callable[[_T], None] | None
+    future: Future[_T]
+
+
+class DatabaseWriter:
+    database: DatabaseClient
+    batch_size: int
+    max_delay: float
+    # Statistics
+    requests: int
+    transactions: int
+    _queue: queue.SimpleQueue[_WriteRequest[Any] | None]
+    _thread: threading.Thread
+    _stopped: bool
+
+    def __init__(self, database: DatabaseClient, batch_size: int = DATABASE_WRITER_BATCH_SIZE,
+                 max_delay: float = DATABASE_WRITER_MAX_DELAY):
+        """
+        Initialize the class.
+        Once started, the database must only be used through the writer.
+        :param database: a DatabaseClient instance, owned by the writer thread
+        :param batch_size: the maximum amount of requests committed in a single transaction
+        :param max_delay: the maximum amount of seconds a request waits for other requests before it's committed
+        """
+        self.database = database
+        self.batch_size = batch_size
+        self.max_delay = max_delay
+        self.requests = self.transactions = 0
+
+        self._queue = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._run, name="DatabaseWriter", daemon=True)
+        self._stopped = False
+
+    def start(self) -> None:
+        """Start the writer thread."""
+        self._thread.start()
+
+    def join(self) -> None:
+        """Wait until the writer thread terminates."""
+        self._thread.join()
+
+    def stop(self) -> None:
+        """Stop the writer thread, the queued requests are committed before the thread terminates."""
+        self._stopped = True
+        self._queue.put(None)
+
+    def submit(self, function: Callable[[Cursor], _T], on_commit: Callable[[_T], None] | None = None) -> Future[_T]:
+        """
+        Queues a write request, which is executed in the writer thread and grouped with other requests into a
+          single transaction. A request which raises an exception is rolled back without affecting the others.
+        :param function: executes the statements of the request with the cursor of the transaction, without committing
+        :param on_commit: invoked in the writer thread with the result of the request once it's committed
+        :return: a Future instance which completes with the result of the request once it's committed
+        :raises DatabaseError: if the writer was stopped
+        """
+        if self._stopped:
+            raise DatabaseError("The database writer was stopped.")
+        future: Future[_T] = Future()
+        self._queue.put(_WriteRequest(function, on_commit, future))
+        return future
+
+    def _collect_batch(self, request: _WriteRequest[Any]) -> tuple[list[_WriteRequest[Any]], bool]:
+        """
+        Collects requests until the batch is full or the first request waited for the maximum delay.
+        :param request: the first request of the batch
+        :return: the requests of the batch and True if the writer was stopped
+        """
+        batch: list[_WriteRequest[Any]] = [request]
+        deadline: float = time.monotonic() + self.max_delay
+        while len(batch) < self.batch_size:
+            try:
+                next_request: _WriteRequest[Any] | None = self._queue.get(timeout=max(deadline - time.monotonic(), 0))
+            except queue.Empty:
+                break
+            if next_request is None:
+                return batch, True
+            batch.append(next_request)
+        return batch, False
+
+    def _commit_batch(self, batch: list[_WriteRequest[Any]]) -> None:
+        """
+        Executes the requests of a batch in a single transaction, each request in its own savepoint.
+        :param batch: the requests to execute
+        """
+        results: list[tuple[_WriteRequest[Any], Any, BaseException | None]] = []
+        try:
+            cursor: Cursor
+            with self.database.transaction() as cursor:
+                cursor.execute("BEGIN")
+                for request in batch:
+                    if not request.future.set_running_or_notify_cancel():
+                        continue
+                    cursor.execute("SAVEPOINT write_request")
+                    try:
+                        results.append((request, request.function(cursor), None))
+                    except Exception as exception:
+                        cursor.execute("ROLLBACK TO write_request")
+                        results.append((request, None, exception))
+                    cursor.execute("RELEASE write_request")
+        except Exception as exception:
+            # Nothing was committed
+            for request in batch:
+                if not request.future.done():
+                    request.future.set_exception(exception)
+            return
+
+        self.transactions += 1
+        self.requests += len(results)
+        for request, result, request_exception in results:
+            if request_exception is not None:
+                request.future.set_exception(request_exception)
+                continue
+            try:
+                if request.on_commit is not None:
+                    request.on_commit(result)
+            except Exception as exception:
+                request.future.set_exception(exception)
+                continue
+            request.future.set_result(result)
+
+    def _run(self) -> None:
+        """Commits the queued requests in batches until the writer is stopped."""
+        stopped: bool = False
+        while not stopped:
+            request: _WriteRequest[Any] | None = self._queue.get()
+            if request is None:
+                return
+            batch, stopped = self._collect_batch(request)
+            self._commit_batch(batch)
+
+    # Context manager support
+    def __enter__(self) -> DatabaseWriter:
+        """Start the writer thread when entering the scope."""
+        self.start()
+        return self
+
+    def __exit__(self, exc_type: type[BaseException] | None, exc_val: BaseException | None,
+                 exc_tb: TracebackType | None) -> None:
+        """Commit the queued requests and stop the writer thread when exiting the scope."""
+        self.stop()
+        self.join()
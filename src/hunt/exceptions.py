@@ -12,3 +12,7 @@ class ParserError(Error):
 
 class SteamworksError(Error):
     """Steamworks API-related exceptions."""
+
+
+class DatabaseError(Error):
+    """Database-related exceptions."""
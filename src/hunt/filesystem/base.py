@@ -0,0 +1,147 @@
+import threading
+import time
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Callable
+
+from ..constants import WATCHDOG_MAX_DELAY, WATCHDOG_QUIET_PERIOD
+
+
+class Debouncer:
+    callback: Callable[[Path], None]
+    quiet_period: float
+    max_delay: float
+    # Statistics
+    events: int
+    collapsed_events: int
+    invocations: int
+    _condition: threading.Condition
+    _thread: threading.Thread
+    _pending_file_path: Path | None
+    _first_event_time: float
+    _last_event_time: float
+    _stopped: bool
+
+    def __init__(self, callback: Callable[[Path], None],
+                 quiet_period: float = WATCHDOG_QUIET_PERIOD, max_delay: float = WATCHDOG_MAX_DELAY):
+        """
+        Initialize the class.
+        :param callback: the callback to invoke once a burst of events is over
+        :param quiet_period: the amount of seconds without events after which a burst is over
+        :param max_delay: the maximum amount of seconds a burst can delay the callback
+        """
+        self.callback = callback
+        self.quiet_period = quiet_period
+        self.max_delay = max_delay
+        self.events = self.collapsed_events = self.invocations = 0
+
+        self._condition = threading.Condition()
+        self._thread = threading.Thread(target=self._run, name="Debouncer", daemon=True)
+        self._pending_file_path = None
+        self._first_event_time = self._last_event_time = 0.0
+        self._stopped = False
+
+    def start(self) -> None:
+        """Start the callback thread."""
+        self._thread.start()
+
+    def join(self) -> None:
+        """Wait until the callback thread terminates."""
+        self._thread.join()
+
+    def stop(self) -> None:
+        """Stop the callback thread, a pending burst is processed before the thread terminates."""
+        with self._condition:
+            self._stopped = True
+            self._condition.notify()
+
+    def notify(self, file_path: Path) -> None:
+        """
+        Records an event, the callback is invoked once the burst of events is over.
+        :param file_path: the path of the modified file
+        """
+        with self._condition:
+            self.events += 1
+            self._last_event_time = time.monotonic()
+            if self._pending_file_path is not None:
+                self.collapsed_events += 1
+            else:
+                self._first_event_time = self._last_event_time
+            self._pending_file_path = file_path
+            self._condition.notify()
+
+    def _wait_for_burst(self) -> Path | None:
+        """
+        Waits until a burst of events is over, the condition must be held.
+        :return: the path of the modified file, or None if the debouncer was stopped without a pending burst
+        """
+        while True:
+            file_path: Path | None = self._pending_file_path
+            if file_path is None:
+                if self._stopped:
+                    return None
+                self._condition.wait()
+                continue
+
+            # Wait for the quiet period, but no longer than the maximum delay since the burst started
+            remaining_time: float = min(self._last_event_time + self.quiet_period,
+                                        self._first_event_time + self.max_delay) - time.monotonic()
+            if remaining_time <= 0 or self._stopped:
+                self._pending_file_path = None
+                self.invocations += 1
+                return file_path
+            self._condition.wait(remaining_time)
+
+    def _run(self) -> None:
+        """Invokes the callback once per burst, callbacks never overlap."""
+        while True:
+            with self._condition:
+                file_path: Path | None = self._wait_for_burst()
+            if file_path is None:
+                return
+            self.callback(file_path)
+
+
+class FileWatcher(ABC):
+    file_path: Path
+    callback: Callable[[Path], None]
+    debouncer: Debouncer
+    # The amount of times the watcher woke up, including wakeups caused by unrelated changes
+    wakeups: int
+    # The amount of CPU seconds used by the watcher thread
+    cpu_time: float
+
+    def __init__(self, file_path: Path, callback: Callable[[Path], None],
+                 quiet_period: float = WATCHDOG_QUIET_PERIOD, max_delay: float = WATCHDOG_MAX_DELAY):
+        """
+        Initialize the class.
+        :param file_path: the file path to monitor for changes
+        :param callback: the callback to invoke when changes are detected, once per burst of modifications
+        :param quiet_period: the amount of seconds without modifications after which a burst is over
+        :param max_delay: the maximum amount of seconds a burst can delay the callback
+        """
+        self.file_path = file_path
+        self.callback = callback
+        self.debouncer = Debouncer(callback, quiet_period=quiet_period, max_delay=max_delay)
+        self.wakeups = 0
+        self.cpu_time = 0.0
+
+    @abstractmethod
+    def start(self) -> None:
+        """Start watching for changes."""
+        self.debouncer.start()
+
+    @abstractmethod
+    def join(self) -> None:
+        """Wait until the watcher threads terminate."""
+        self.debouncer.join()
+
+    @abstractmethod
+    def stop(self) -> None:
+        """Stop watching for changes, a pending burst of modifications is still processed."""
+        self.debouncer.stop()
+
+    def _record_wakeup(self) -> None:
+        """Records a wakeup of the watcher thread, invoked from the watcher thread."""
+        self.wakeups += 1
+        self.cpu_time = time.thread_time()
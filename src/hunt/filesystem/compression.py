@@ -0,0 +1,101 @@
+import gzip
+import lzma
+import os
+import zlib
+from enum import StrEnum
+from pathlib import Path
+
+
+class MatchLogCompression(StrEnum):
+    # Match logs are stored as plain JSON documents
+    NONE = "none"
+    # The stdlib gzip codec, fast to compress and to read
+    GZIP = "gzip"
+    # The stdlib lzma (xz) codec, smaller but slower to compress
+    LZMA = "lzma"
+
+
+_GZIP_MAGIC: bytes = b"\x1f\x8b"
+_LZMA_MAGIC: bytes = b"\xfd7zXZ\x00"
+# The suffix appended to the name of compressed match log files
+COMPRESSION_SUFFIXES: dict[MatchLogCompression, str] = {MatchLogCompression.GZIP: ".gz",
+                                                        MatchLogCompression.LZMA: ".xz"}
+# The suffixes of plain and compressed match log files
+MATCH_LOG_SUFFIXES: tuple[str, ...] = (".json", *(f".json{suffix}" for suffix in COMPRESSION_SUFFIXES.values()))
+
+
+def compress(data: bytes, compression: MatchLogCompression) -> bytes:
+    """
+    Compresses match log data.
+    :param data: the data to compress
+    :param compression: the codec to use
+    :return: the compressed data, or the unmodified data if compression is disabled
+    """
+    match compression:
+        case MatchLogCompression.GZIP:
+            # The modification time is omitted, compressing the same data always yields the same bytes
+            return gzip.compress(data, mtime=0)
+        case MatchLogCompression.LZMA:
+            return lzma.compress(data)
+    return data
+
+
+def decompress(data: bytes) -> bytes:
+    """
+    Decompresses match log data, the codec is detected from the data.
+    :param data: plain or compressed data
+    :return: the decompressed data, or the unmodified data if it isn't compressed
+    :raises OSError: if the compressed data is corrupted
+    """
+    try:
+        if data.startswith(_GZIP_MAGIC):
+            return gzip.decompress(data)
+        if data.startswith(_LZMA_MAGIC):
+            return lzma.decompress(data)
+    except (EOFError, zlib.error, lzma.LZMAError) as exception:
+        raise OSError(f"The compressed data is corrupted: {exception}") from exception
+    return data
+
+
+def read_match_log(file_path: Path) -> bytes:
+    """
+    Reads a plain or compressed match log file.
+    A plain match log which was compressed since its path was stored is read from its compressed copy.
+    :param file_path: the path to the match log
+    :return: the JSON document of the match
+    :raises OSError: if the match log can't be read or is corrupted
+    """
+    try:
+        return decompress(file_path.read_bytes())
+    except FileNotFoundError:
+        for suffix in COMPRESSION_SUFFIXES.values():
+            compressed_path: Path = file_path.with_name(f"{file_path.name}{suffix}")
+            if compressed_path.is_file():
+                return decompress(compressed_path.read_bytes())
+        raise
+
+
+def uncompressed_path(file_path: Path) -> Path:
+    """
+    Removes the compression suffix from the path of a match log file.
+    :param file_path: the path to a plain or compressed match log
+    :return: the path of the plain match log
+    """
+    return file_path.with_suffix("") if file_path.suffix in COMPRESSION_SUFFIXES.values() else file_path
+
+
+def compress_file(file_path: Path, compression: MatchLogCompression) -> Path:
+    """
+    Writes a compressed copy of a match log file, the plain match log is kept.
+    The copy is written to a temporary file first, an interrupted compression never leaves a partial copy.
+    :param file_path: the path to a plain match log
+    :param compression: the codec to use, compression must be enabled
+    :return: the path of the compressed copy
+    :raises OSError: if the match log can't be read or the copy can't be written
+    """
+    assert compression != MatchLogCompression.NONE, "Compression is disabled."
+    compressed_path: Path = file_path.with_name(f"{file_path.name}{COMPRESSION_SUFFIXES[compression]}")
+    temporary_path: Path = compressed_path.with_name(f"{compressed_path.name}.tmp")
+    temporary_path.write_bytes(compress(file_path.read_bytes(), compression))
+    os.replace(temporary_path, compressed_path)
+    return compressed_path
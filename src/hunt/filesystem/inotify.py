@@ -0,0 +1,170 @@
+import ctypes
+import os
+import select
+import struct
+import sys
+import threading
+from pathlib import Path
+from typing import Callable, Generator
+
+from .base import FileWatcher
+from ..constants import WATCHDOG_MAX_DELAY, WATCHDOG_QUIET_PERIOD
+from ..exceptions import UnsupportedPlatformError
+
+# https://man7.org/linux/man-pages/man7/inotify.7.html
+_IN_MODIFY: int = 0x00000002
+_IN_ATTRIB: int = 0x00000004
+_IN_CLOSE_WRITE: int = 0x00000008
+_IN_MOVE_SELF: int = 0x00000800
+_IN_DELETE_SELF: int = 0x00000400
+_IN_IGNORED: int = 0x00008000
+_IN_NONBLOCK: int = 0o4000
+_IN_CLOEXEC: int = 0o2000000
+_WATCH_MASK: int = _IN_MODIFY | _IN_ATTRIB | _IN_CLOSE_WRITE | _IN_MOVE_SELF | _IN_DELETE_SELF
+# struct inotify_event: wd, mask, cookie, len (followed by a name which is empty for file watches)
+_EVENT_HEADER: struct.Struct = struct.Struct("iIII")
+_EVENT_BUFFER_SIZE: int = 64 * (_EVENT_HEADER.size + 256)
+# The amount of seconds between attempts to watch the file again after it was deleted or replaced
+_REWATCH_INTERVAL: float = 0.5
+
+
+class _Inotify:
+    _libc: ctypes.CDLL
+
+    def __init__(self) -> None:
+        """
+        Initialize the class.
+        :raises UnsupportedPlatformError: if inotify isn't available on the current platform
+        """
+        if not sys.platform.startswith("linux"):
+            raise UnsupportedPlatformError("inotify is only available on Linux.")
+        try:
+            self._libc = ctypes.CDLL(None, use_errno=True)
+            self._libc.inotify_init1.argtypes = (ctypes.c_int,)
+            self._libc.inotify_add_watch.argtypes = (ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32)
+            self._libc.inotify_rm_watch.argtypes = (ctypes.c_int, ctypes.c_int)
+        except (OSError, AttributeError) as exception:
+            raise UnsupportedPlatformError("The C library doesn't support inotify.") from exception
+
+    def init(self) -> int:
+        """
+        Creates an inotify instance.
+        :return: a non-blocking file descriptor
+        :raises OSError: if the instance couldn't be created
+        """
+        file_descriptor: int = self._libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if file_descriptor < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed.")
+        return file_descriptor
+
+    def add_watch(self, file_descriptor: int, file_path: Path) -> int | None:
+        """
+        Watches a file.
+        :param file_descriptor: the inotify file descriptor
+        :param file_path: the path to the file
+        :return: the watch descriptor, or None if the file couldn't be watched (e.g. it doesn't exist)
+        """
+        watch_descriptor: int = self._libc.inotify_add_watch(file_descriptor, os.fsencode(file_path), _WATCH_MASK)
+        return watch_descriptor if watch_descriptor >= 0 else None
+
+    def rm_watch(self, file_descriptor: int, watch_descriptor: int) -> None:
+        """
+        Stops watching a file.
+        :param file_descriptor: the inotify file descriptor
+        :param watch_descriptor: the watch descriptor
+        """
+        self._libc.inotify_rm_watch(file_descriptor, watch_descriptor)
+
+
+def _read_events(file_descriptor: int) -> Generator[tuple[int, int], None, None]:
+    """
+    Reads the pending inotify events.
+    :param file_descriptor: the inotify file descriptor
+    :return: a generator which yields the watch descriptor and the mask of each event
+    """
+    try:
+        buffer: bytes = os.read(file_descriptor, _EVENT_BUFFER_SIZE)
+    except BlockingIOError:
+        return
+
+    offset: int = 0
+    while offset < len(buffer):
+        watch_descriptor, mask, _, name_length = _EVENT_HEADER.unpack_from(buffer, offset)
+        offset += _EVENT_HEADER.size + name_length
+        yield watch_descriptor, mask
+
+
+class InotifyWatcher(FileWatcher):
+    _inotify: _Inotify
+    _file_descriptor: int
+    _watch_descriptor: int | None
+    _thread: threading.Thread
+    _wakeup_pipe: tuple[int, int]
+
+    def __init__(self, file_path: Path, callback: Callable[[Path], None],
+                 quiet_period: float = WATCHDOG_QUIET_PERIOD, max_delay: float = WATCHDOG_MAX_DELAY):
+        """
+        Initialize the class.
+        Only the file itself is watched, changes to other files in the directory don't wake the watcher up.
+        :param file_path: the file path to monitor for changes
+        :param callback: the callback to invoke when changes are detected, once per burst of modifications
+        :param quiet_period: the amount of seconds without modifications after which a burst is over
+        :param max_delay: the maximum amount of seconds a burst can delay the callback
+        :raises UnsupportedPlatformError: if inotify isn't available on the current platform
+        """
+        super().__init__(file_path, callback, quiet_period=quiet_period, max_delay=max_delay)
+        self._inotify = _Inotify()
+        self._thread = threading.Thread(target=self._run, name="InotifyWatcher", daemon=True)
+        self._wakeup_pipe = os.pipe()
+
+    def start(self) -> None:
+        """Start watching the file, modifications made after this call are detected."""
+        self._file_descriptor = self._inotify.init()
+        self._watch_descriptor = self._inotify.add_watch(self._file_descriptor, self.file_path)
+        super().start()
+        self._thread.start()
+
+    def join(self) -> None:
+        """Wait until the watcher thread terminates."""
+        self._thread.join()
+        super().join()
+
+    def stop(self) -> None:
+        """Stop watching the file."""
+        os.write(self._wakeup_pipe[1], b"\0")
+        super().stop()
+
+    def _run(self) -> None:
+        """Waits for inotify events, the file is watched again whenever it's deleted or replaced."""
+        file_descriptor: int = self._file_descriptor
+        watch_descriptor: int | None = self._watch_descriptor
+        try:
+            while True:
+                # Retry watching the file periodically if it doesn't exist
+                readable, _, _ = select.select((file_descriptor, self._wakeup_pipe[0]), (), (),
+                                               _REWATCH_INTERVAL if watch_descriptor is None else None)
+                if self._wakeup_pipe[0] in readable:
+                    return
+
+                modified: bool = False
+                for event_watch_descriptor, mask in _read_events(file_descriptor):
+                    if event_watch_descriptor != watch_descriptor:
+                        continue  # A stale event of a previous watch
+                    modified = modified or bool(mask & (_IN_MODIFY | _IN_CLOSE_WRITE | _IN_ATTRIB))
+
+                    # The file was deleted or replaced (e.g. by renaming a temporary file over it)
+                    if mask & (_IN_MOVE_SELF | _IN_DELETE_SELF | _IN_IGNORED):
+                        if not mask & _IN_IGNORED:
+                            self._inotify.rm_watch(file_descriptor, event_watch_descriptor)
+                        watch_descriptor = None
+                if watch_descriptor is None:
+                    watch_descriptor = self._inotify.add_watch(file_descriptor, self.file_path)
+                    modified = modified or watch_descriptor is not None
+
+                if modified:
+                    self.debouncer.notify(self.file_path)
+                self._record_wakeup()
+        finally:
+            os.close(file_descriptor)
+            for pipe_descriptor in self._wakeup_pipe:
+                os.close(pipe_descriptor)
@@ -0,0 +1,80 @@
+import os
+import threading
+from pathlib import Path
+from typing import Callable, TypeAlias
+
+from .base import FileWatcher
+from ..constants import WATCHDOG_MAX_DELAY, WATCHDOG_POLL_INTERVAL, WATCHDOG_QUIET_PERIOD
+
+# The modification time (in nanoseconds), the size and the inode of a file, None if the file doesn't exist
+FileSignature: TypeAlias = tuple[int, int, int] | None
+
+
+def stat_signature(file_path: Path) -> FileSignature:
+    """
+    Reads the signature of a file, which changes whenever the file is modified or replaced.
+    :param file_path: the path to the file
+    :return: the signature of the file
+    """
+    try:
+        stat_result: os.stat_result = os.stat(file_path)
+    except OSError:
+        return None
+    return stat_result.st_mtime_ns, stat_result.st_size, stat_result.st_ino
+
+
+class PollingWatcher(FileWatcher):
+    poll_interval: float
+    _signature: FileSignature
+    _thread: threading.Thread
+    _stop_event: threading.Event
+
+    def __init__(self, file_path: Path, callback: Callable[[Path], None],
+                 quiet_period: float = WATCHDOG_QUIET_PERIOD, max_delay: float = WATCHDOG_MAX_DELAY,
+                 poll_interval: float = WATCHDOG_POLL_INTERVAL):
+        """
+        Initialize the class.
+        Polling works on network mounts and in containers, where filesystem notifications are unreliable.
+        :param file_path: the file path to monitor for changes
+        :param callback: the callback to invoke when changes are detected, once per burst of modifications
+        :param quiet_period: the amount of seconds without modifications after which a burst is over
+        :param max_delay: the maximum amount of seconds a burst can delay the callback
+        :param poll_interval: the amount of seconds between each stat call
+        """
+        super().__init__(file_path, callback, quiet_period=quiet_period, max_delay=max_delay)
+        self.poll_interval = poll_interval
+        self._signature = None
+        self._thread = threading.Thread(target=self._run, name="PollingWatcher", daemon=True)
+        self._stop_event = threading.Event()
+
+    def start(self) -> None:
+        """Start polling, modifications made after this call are detected."""
+        self._signature = stat_signature(self.file_path)
+        super().start()
+        self._thread.start()
+
+    def join(self) -> None:
+        """Wait until the polling thread terminates."""
+        self._thread.join()
+        super().join()
+
+    def stop(self) -> None:
+        """Stop polling, a modification made before this call is still detected."""
+        self._stop_event.set()
+
+    def _poll(self) -> None:
+        """Compares the signature of the file to the signature of the previous poll."""
+        current_signature: FileSignature = stat_signature(self.file_path)
+        if current_signature != self._signature:
+            self._signature = current_signature
+            if current_signature is not None:
+                self.debouncer.notify(self.file_path)
+
+    def _run(self) -> None:
+        """Compares the signature of the file at every poll interval, then stops the debouncer."""
+        while not self._stop_event.wait(self.poll_interval):
+            self._poll()
+            self._record_wakeup()
+        # A modification made since the last poll is part of the pending burst
+        self._poll()
+        super().stop()
@@ -0,0 +1,20 @@
+import os
+from pathlib import Path
+from typing import Generator
+
+
+def scan_files(directory: Path, suffix: str | tuple[str, ...]) -> Generator[Path, None, None]:
+    """
+    Walks a directory tree, yielding every file with a given suffix.
+    Symbolic links to directories aren't followed.
+    :param directory: the directory to walk
+    :param suffix: the file name suffix, e.g. ".json", or a tuple of suffixes
+    :return: a generator which yields the path of each file, in no particular order
+    """
+    entry: os.DirEntry[str]
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                yield from scan_files(Path(entry.path), suffix)
+            elif entry.name.endswith(suffix) and entry.is_file():
+                yield Path(entry.path)
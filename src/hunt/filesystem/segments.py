@@ -0,0 +1,355 @@
+from __future__ import annotations
+
+import mmap
+import os
+import struct
+import sys
+import threading
+import zlib
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from enum import StrEnum
+from pathlib import Path
+from types import TracebackType
+from typing import BinaryIO, Generator
+
+from .compression import MatchLogCompression, compress, decompress
+from ..constants import MATCH_LOG_MAPPED_SEGMENTS, MATCH_LOG_SEGMENT_SIZE
+from ..exceptions import ParserError
+
+if sys.platform == "win32":
+    import msvcrt
+else:
+    import fcntl
+
+SEGMENT_SUFFIX: str = ".segment"
+# The file locked by the process appending to the segments of a directory
+_LOCK_FILE_NAME: str = ".lock"
+# Every segment starts with a magic number, followed by the records
+_SEGMENT_MAGIC: bytes = b"HMTSEG\x00\x01"
+# The length of the payload, the CRC-32 of the payload and the time of the record (a UNIX timestamp)
+_RECORD_HEADER: struct.Struct = struct.Struct("<IId")
+
+
+class MatchLogStorage(StrEnum):
+    # One JSON file per match, in a directory tree by date and mode
+    FILES = "files"
+    # Length-prefixed records appended to rotating segment files, located by the offset index of the database
+    SEGMENTS = "segments"
+
+
+@dataclass(frozen=True)
+class SegmentLocation:
+    file_path: Path
+    # The offset of the record header in the segment
+    offset: int
+    # The length of the stored (possibly compressed) payload
+    length: int
+
+
+@dataclass(frozen=True)
+class SegmentRecord:
+    location: SegmentLocation
+    time: datetime
+    # The decompressed payload
+    payload: bytes
+
+
+def segment_file_path(directory: Path, index: int) -> Path:
+    """
+    Generates the path of a segment.
+    :param directory: the segments directory
+    :param index: the index of the segment
+    :return: the path to the segment
+    """
+    return directory / f"{index:08d}{SEGMENT_SUFFIX}"
+
+
+def _lock_directory(directory: Path) -> BinaryIO:
+    """
+    Takes the lock of a segments directory, the lock is released once the returned file is closed.
+    :param directory: the segments directory
+    :return: the lock file, opened
+    :raises OSError: if the lock file can't be opened or the lock is held by another process
+    """
+    file: BinaryIO = open(directory / _LOCK_FILE_NAME, mode="a+b")
+    try:
+        if sys.platform == "win32":
+            file.seek(0)
+            msvcrt.locking(file.fileno(), msvcrt.LK_NBLCK, 1)
+        else:
+            fcntl.flock(file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError as exception:
+        file.close()
+        raise OSError(f"The segments of {str(directory)!r} are appended to by another process.") from exception
+    return file
+
+
+def _check_magic(file: BinaryIO, file_path: Path) -> None:
+    """
+    Checks the magic number at the start of a segment.
+    :param file: the segment, opened for reading
+    :param file_path: the path to the segment
+    :raises ParserError: if the file isn't a segment
+    """
+    if file.read(len(_SEGMENT_MAGIC)) != _SEGMENT_MAGIC:
+        raise ParserError(f"{str(file_path)!r} isn't a match log segment.")
+
+
+def read_record(location: SegmentLocation) -> SegmentRecord:
+    """
+    Reads a single record of a segment by random access.
+    :param location: the location of the record
+    :return: a SegmentRecord instance
+    :raises OSError: if the segment can't be read
+    :raises ParserError: if the record is truncated or its checksum doesn't match
+    """
+    with open(location.file_path, mode="rb") as file:
+        file.seek(location.offset)
+        data: bytes = file.read(_RECORD_HEADER.size + location.length)
+    return _decode_record(location, data)
+
+
+def _decode_record(location: SegmentLocation, data: bytes) -> SegmentRecord:
+    """
+    Decodes and validates a record.
+    :param location: the location of the record
+    :param data: the header and the payload of the record
+    :return: a SegmentRecord instance
+    :raises ParserError: if the record is truncated, its checksum doesn't match or it can't be decompressed
+    """
+    if len(data) < _RECORD_HEADER.size:
+        raise ParserError(f"The record at {location.offset} of {str(location.file_path)!r} is truncated.")
+    length: int
+    checksum: int
+    timestamp: float
+    length, checksum, timestamp = _RECORD_HEADER.unpack_from(data)
+    payload: bytes = data[_RECORD_HEADER.size:]
+    if length != location.length or len(payload) != length:
+        raise ParserError(f"The record at {location.offset} of {str(location.file_path)!r} is truncated.")
+    if zlib.crc32(payload) != checksum:
+        raise ParserError(f"The checksum of the record at {location.offset} of {str(location.file_path)!r} "
+                          "doesn't match.")
+    try:
+        payload = decompress(payload)
+    except OSError as exception:
+        raise ParserError(f"The record at {location.offset} of {str(location.file_path)!r} can't be decompressed: "
+                          f"{exception}") from exception
+    return SegmentRecord(location, datetime.fromtimestamp(timestamp), payload)
+
+
+def scan_segment(file_path: Path) -> Generator[SegmentLocation, None, None]:
+    """
+    Reads the record headers of a segment, the payloads are skipped (and validated by read_record).
+    A truncated record at the end of the segment (an interrupted append) ends the scan.
+    :param file_path: the path to the segment
+    :return: a generator which yields the location of each record, in the order they were appended
+    :raises OSError: if the segment can't be read
+    :raises ParserError: if the file isn't a segment
+    """
+    with open(file_path, mode="rb") as file:
+        _check_magic(file, file_path)
+        size: int = os.fstat(file.fileno()).st_size
+        offset: int = file.tell()
+        while len(header := file.read(_RECORD_HEADER.size)) == _RECORD_HEADER.size:
+            length: int = _RECORD_HEADER.unpack(header)[0]
+            if offset + _RECORD_HEADER.size + length > size:
+                return
+            yield SegmentLocation(file_path, offset, length)
+            offset = file.seek(length, os.SEEK_CUR)
+
+
+class SegmentReader:
+    max_mapped_segments: int
+    _lock: threading.Lock
+    _mappings: OrderedDict[Path, mmap.mmap]
+
+    def __init__(self, max_mapped_segments: int = MATCH_LOG_MAPPED_SEGMENTS):
+        """
+        Initialize the class.
+        Segments are memory-mapped once and shared by the reads, a read only copies the bytes of its record.
+        The least recently used segment is unmapped once the maximum amount of segments is mapped.
+        :param max_mapped_segments: the maximum amount of segments mapped at once
+        """
+        self.max_mapped_segments = max_mapped_segments
+        self._lock = threading.Lock()
+        self._mappings = OrderedDict()
+
+    def _map_segment(self, file_path: Path, size: int) -> mmap.mmap:
+        """
+        Maps a segment, a segment which grew since it was mapped is mapped again.
+        :param file_path: the path to the segment
+        :param size: the minimum size of the mapping
+        :return: the mapping of the segment
+        :raises OSError: if the segment can't be mapped
+        """
+        mapping: mmap.mmap | None = self._mappings.get(file_path)
+        if mapping is not None and len(mapping) >= size:
+            self._mappings.move_to_end(file_path)
+            return mapping
+        if mapping is not None:
+            mapping.close()
+            del self._mappings[file_path]
+
+        with open(file_path, mode="rb") as file:
+            try:
+                mapping = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError as exception:
+                # Empty files can't be mapped
+                raise OSError(f"{str(file_path)!r} can't be mapped: {exception}") from exception
+        self._mappings[file_path] = mapping
+        while len(self._mappings) > self.max_mapped_segments:
+            self._mappings.popitem(last=False)[1].close()
+        return mapping
+
+    def read(self, location: SegmentLocation) -> SegmentRecord:
+        """
+        Reads a single record of a segment by random access, invoked from any thread.
+        :param location: the location of the record
+        :return: a SegmentRecord instance
+        :raises OSError: if the segment can't be read
+        :raises ParserError: if the record is truncated, its checksum doesn't match or it can't be decompressed
+        """
+        end: int = location.offset + _RECORD_HEADER.size + location.length
+        with self._lock:
+            data: bytes = self._map_segment(location.file_path, size=end)[location.offset:end]
+        return _decode_record(location, data)
+
+    def close(self) -> None:
+        """Unmaps every segment."""
+        with self._lock:
+            for mapping in self._mappings.values():
+                mapping.close()
+            self._mappings.clear()
+
+    # Context manager support
+    def __enter__(self) -> SegmentReader:
+        """Return self when entering the scope."""
+        return self
+
+    def __exit__(self, exc_type: type[BaseException] | None, exc_val: BaseException | None,
+                 exc_tb: TracebackType | None) -> None:
+        """Unmap every segment when exiting the scope."""
+        self.close()
+
+
+class SegmentLog:
+    directory: Path
+    max_segment_size: int
+    compression: MatchLogCompression
+    _lock: threading.Lock
+    _lock_file: BinaryIO | None
+    _file: BinaryIO | None
+    _segment_index: int
+    _segment_path: Path
+
+    def __init__(self, directory: Path, max_segment_size: int = MATCH_LOG_SEGMENT_SIZE,
+                 compression: MatchLogCompression = MatchLogCompression.NONE):
+        """
+        Initialize the class.
+        Records are appended to the last segment in the directory, a new segment is started once it's full.
+        A truncated record at the end of the last segment (an interrupted append) is removed.
+        Segments are only appended to by a single process, which holds the lock of the directory until it's closed.
+        Payloads are compressed one record at a time, records remain readable by random access.
+        :param directory: the segments directory, created if it doesn't exist
+        :param max_segment_size: the size in bytes after which a new segment is started
+        :param compression: the codec used to compress the payloads of new records
+        :raises OSError: if the last segment can't be opened or another process appends to the segments
+        :raises ParserError: if the last segment isn't a segment
+        """
+        self.directory = directory
+        self.max_segment_size = max_segment_size
+        self.compression = compression
+        self._lock = threading.Lock()
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._lock_file = _lock_directory(self.directory)
+        segment_indices: list[int] = [int(file_path.stem) for file_path in self.directory.glob(f"*{SEGMENT_SUFFIX}")
+                                      if file_path.stem.isdigit()]
+        self._segment_index = max(segment_indices, default=1)
+        self._file = None
+        try:
+            self._open_segment(recover=True)
+        except (OSError, ParserError):
+            self.close()
+            raise
+
+    def _open_segment(self, recover: bool = False) -> None:
+        """
+        Opens the current segment for appending, writing the magic number to new segments.
+        :param recover: True to remove a truncated record at the end of the segment
+        """
+        self._segment_path = segment_file_path(self.directory, self._segment_index)
+        self._file = open(self._segment_path, mode="ab")
+        if self._file.tell() < len(_SEGMENT_MAGIC):
+            # A new segment, or a segment whose creation was interrupted
+            self._file.truncate(0)
+            self._file.write(_SEGMENT_MAGIC)
+            self._file.flush()
+        elif recover:
+            end: int = len(_SEGMENT_MAGIC)
+            for location in scan_segment(self._segment_path):
+                end = location.offset + _RECORD_HEADER.size + location.length
+            if end < self._file.tell():
+                self._file.truncate(end)
+
+    def append(self, payload: bytes, time: datetime) -> SegmentLocation:
+        """
+        Appends a record to the current segment, invoked from any thread.
+        :param payload: the payload of the record, compressed by the segment log
+        :param time: the time of the record
+        :return: the location of the record
+        :raises OSError: if the record can't be written
+        """
+        # Compress outside the lock, appends from other threads aren't delayed
+        payload = compress(payload, self.compression)
+        with self._lock:
+            assert self._file is not None, "The segment log is closed."
+            record_size: int = _RECORD_HEADER.size + len(payload)
+            offset: int = self._file.seek(0, os.SEEK_END)
+            if offset > len(_SEGMENT_MAGIC) and offset + record_size > self.max_segment_size:
+                self._file.close()
+                self._segment_index += 1
+                self._open_segment()
+                offset = self._file.tell()
+
+            self._file.write(_RECORD_HEADER.pack(len(payload), zlib.crc32(payload), time.timestamp()) + payload)
+            self._file.flush()
+            return SegmentLocation(self._segment_path, offset, len(payload))
+
+    def discard(self, location: SegmentLocation) -> bool:
+        """
+        Removes the last appended record, e.g. once the transaction which referenced it was rolled back.
+        A record followed by other records can't be removed, it remains in the segment (and is saved by the backfill).
+        :param location: the location of the record
+        :return: True if the record was removed, False if it isn't the last record
+        :raises OSError: if the segment can't be truncated
+        """
+        with self._lock:
+            assert self._file is not None, "The segment log is closed."
+            end: int = location.offset + _RECORD_HEADER.size + location.length
+            if location.file_path != self._segment_path or self._file.seek(0, os.SEEK_END) != end:
+                return False
+            self._file.truncate(location.offset)
+            return True
+
+    def close(self) -> None:
+        """Closes the current segment and releases the lock of the directory."""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+            if self._lock_file is not None:
+                self._lock_file.close()
+                self._lock_file = None
+
+    # Context manager support
+    def __enter__(self) -> SegmentLog:
+        """Return self when entering the scope."""
+        return self
+
+    def __exit__(self, exc_type: type[BaseException] | None, exc_val: BaseException | None,
+                 exc_tb: TracebackType | None) -> None:
+        """Close the current segment and release the lock when exiting the scope."""
+        self.close()
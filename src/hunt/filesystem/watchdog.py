@@ -4,35 +4,49 @@ from typing import Callable
 from watchdog.events import FileModifiedEvent, FileSystemEvent, FileSystemEventHandler
 from watchdog.observers import Observer
 
+from .base import FileWatcher
+from ..constants import WATCHDOG_MAX_DELAY, WATCHDOG_QUIET_PERIOD
 
-class FileWatchdog(FileSystemEventHandler):
-    file_path: Path
-    callback: Callable[..., None]
+
+class FileWatchdog(FileSystemEventHandler, FileWatcher):
     _observer: Observer   # type: ignore[valid-type]
 
-    def __init__(self, file_path: Path, callback: Callable[..., None]):
+    def __init__(self, file_path: Path, callback: Callable[[Path], None],
+                 quiet_period: float = WATCHDOG_QUIET_PERIOD, max_delay: float = WATCHDOG_MAX_DELAY):
         """
         Initialize the class.
+        The observer watches the parent directory of the file, changes to other files are filtered out.
         :param file_path: the file path to monitor for changes
-        :param callback: the callback to invoke when changes are detected
+        :param callback: the callback to invoke when changes are detected, once per burst of modifications
+        :param quiet_period: the amount of seconds without modifications after which a burst is over
+        :param max_delay: the maximum amount of seconds a burst can delay the callback
         """
-        self.file_path = file_path
-        self.callback = callback
+        FileWatcher.__init__(self, file_path, callback, quiet_period=quiet_period, max_delay=max_delay)
 
         self._observer = Observer()
         self._observer.schedule(event_handler=self, path=file_path.parent)   # type: ignore[no-untyped-call]
 
     def start(self) -> None:
         """Start the observer."""
+        super().start()
         self._observer.start()  # type: ignore[attr-defined]
 
     def join(self) -> None:
         """Wait until the observer thread terminates."""
         self._observer.join()  # type: ignore[attr-defined]
+        super().join()
 
     def stop(self) -> None:
         """Stop the observer."""
         self._observer.stop()  # type: ignore[attr-defined]
+        super().stop()
+
+    def on_any_event(self, event: FileSystemEvent) -> None:
+        """
+        Invoked for every event in the parent directory.
+        :param event: a watchdog event
+        """
+        self._record_wakeup()
 
     def on_modified(self, event: FileSystemEvent) -> None:
         """
@@ -41,4 +55,4 @@ class FileWatchdog(FileSystemEventHandler):
         """
         if not isinstance(event, FileModifiedEvent) or Path(event.src_path) != self.file_path:
             return
-        self.callback(self.file_path)
+        self.debouncer.notify(self.file_path)
@@ -0,0 +1,43 @@
+from enum import StrEnum
+from pathlib import Path
+from typing import Callable
+
+from .base import FileWatcher
+from ..constants import WATCHDOG_MAX_DELAY, WATCHDOG_POLL_INTERVAL, WATCHDOG_QUIET_PERIOD
+
+
+class WatcherBackend(StrEnum):
+    # A watchdog observer on the parent directory of the file
+    WATCHDOG = "watchdog"
+    # A native inotify watch on the file itself (Linux only)
+    INOTIFY = "inotify"
+    # Periodically compares the modification time, the size and the inode of the file
+    POLLING = "polling"
+
+
+def create_file_watcher(backend: WatcherBackend, file_path: Path, callback: Callable[[Path], None],
+                        quiet_period: float = WATCHDOG_QUIET_PERIOD, max_delay: float = WATCHDOG_MAX_DELAY,
+                        poll_interval: float = WATCHDOG_POLL_INTERVAL) -> FileWatcher:
+    """
+    Creates a file watcher using the selected backend.
+    :param backend: the watcher backend to use
+    :param file_path: the file path to monitor for changes
+    :param callback: the callback to invoke when changes are detected, once per burst of modifications
+    :param quiet_period: the amount of seconds without modifications after which a burst is over
+    :param max_delay: the maximum amount of seconds a burst can delay the callback
+    :param poll_interval: the amount of seconds between each stat call (polling backend only)
+    :return: a FileWatcher instance, which has yet to be started
+    :raises UnsupportedPlatformError: if the backend isn't supported on the current platform
+    """
+    # The backends are imported on demand, the watchdog package is only loaded by its backend
+    match backend:
+        case WatcherBackend.WATCHDOG:
+            from .watchdog import FileWatchdog
+            return FileWatchdog(file_path, callback, quiet_period=quiet_period, max_delay=max_delay)
+        case WatcherBackend.INOTIFY:
+            from .inotify import InotifyWatcher
+            return InotifyWatcher(file_path, callback, quiet_period=quiet_period, max_delay=max_delay)
+        case WatcherBackend.POLLING:
+            from .polling import PollingWatcher
+            return PollingWatcher(file_path, callback, quiet_period=quiet_period, max_delay=max_delay,
+                                  poll_interval=poll_interval)
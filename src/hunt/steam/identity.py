@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import threading
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from ..exceptions import SteamworksError
+
+if TYPE_CHECKING:
+    from .api import SteamworksApi
+
+
+class SteamIdentity(ABC):
+    @abstractmethod
+    def get_persona_name(self) -> str:
+        """
+        Gets the user's persona (display) name.
+        :return: the user's display name
+        :raises SteamworksError: if the persona name isn't available
+        """
+
+    @abstractmethod
+    def get_install_directory(self, app_id: int) -> Path:
+        """
+        Gets the installation path of the app id.
+        :param app_id: the app id of the game
+        :return: a path to the app directory
+        :raises SteamworksError: if the installation path isn't available
+        """
+
+    def refresh(self) -> None:
+        """Discards cached values, they're looked up again when they're next used."""
+
+    def shutdown(self) -> None:
+        """Releases the resources of the identity."""
+
+
+class SteamworksIdentity(SteamIdentity):
+    steamworks_api: SteamworksApi
+    _lock: threading.Lock
+    _persona_name: str | None
+    _install_directories: dict[int, Path]
+
+    def __init__(self, steamworks_api: SteamworksApi):
+        """
+        Initialize the class.
+        The persona name and the install directories are looked up once, until the identity is refreshed.
+        :param steamworks_api: an initialized SteamworksApi instance, shut down with the identity
+        """
+        self.steamworks_api = steamworks_api
+        self._lock = threading.Lock()
+        self._persona_name = None
+        self._install_directories = {}
+
+    def get_persona_name(self) -> str:
+        """
+        Gets the user's persona (display) name, cached after the first lookup.
+        :return: the user's display name
+        :raises SteamworksError: if a Steamworks API error occurred
+        """
+        with self._lock:
+            if self._persona_name is None:
+                self._persona_name = self.steamworks_api.get_persona_name()
+            return self._persona_name
+
+    def get_install_directory(self, app_id: int) -> Path:
+        """
+        Gets the installation path of the app id, cached after the first lookup.
+        :param app_id: the app id of the game
+        :return: a path to the app directory
+        :raises SteamworksError: if a Steamworks API error occurred (SteamworksApi.get_install_directory)
+        """
+        with self._lock:
+            if app_id not in self._install_directories:
+                self._install_directories[app_id] = self.steamworks_api.get_install_directory(app_id=app_id)
+            return self._install_directories[app_id]
+
+    def refresh(self) -> None:
+        """Discards the cached persona name and install directories."""
+        with self._lock:
+            self._persona_name = None
+            self._install_directories.clear()
+
+    def shutdown(self) -> None:
+        """Shuts down the Steamworks API."""
+        self.steamworks_api.shutdown()
+
+
+class HeadlessIdentity(SteamIdentity):
+    persona_name: str | None
+    install_directories: dict[int, Path]
+
+    def __init__(self, persona_name: str | None, install_directories: dict[int, Path] | None = None):
+        """
+        Initialize the class.
+        The identity is provided by the configuration, the Steamworks API isn't loaded.
+        :param persona_name: the user's persona (display) name, if known
+        :param install_directories: the install directories, by app id
+        """
+        self.persona_name = persona_name
+        self.install_directories = install_directories if install_directories is not None else {}
+
+    def get_persona_name(self) -> str:
+        """
+        Gets the configured persona (display) name.
+        :return: the user's display name
+        :raises SteamworksError: if the persona name wasn't configured
+        """
+        if self.persona_name is None:
+            raise SteamworksError("The persona name wasn't configured.")
+        return self.persona_name
+
+    def get_install_directory(self, app_id: int) -> Path:
+        """
+        Gets the configured installation path of the app id.
+        :param app_id: the app id of the game
+        :return: a path to the app directory
+        :raises SteamworksError: if the installation path wasn't configured
+        """
+        try:
+            return self.install_directories[app_id]
+        except KeyError:
+            raise SteamworksError(f"The install directory of {app_id} wasn't configured.") from None
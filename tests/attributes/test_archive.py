@@ -0,0 +1,59 @@
+from dataclasses import replace
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+from hunt.attributes.archive import MatchArchive
+from hunt.attributes.codec import encode_match
+from hunt.attributes.match import Match
+from hunt.database.client import Client as DatabaseClient
+from hunt.database.queries import MatchRecord, insert_matches
+from hunt.filesystem.compression import MatchLogCompression
+from hunt.filesystem.segments import SegmentLocation, SegmentLog
+
+
+def test_match_archive(tmp_path: Path, expected_match: Match) -> None:
+    """
+    Test MatchArchive by locating and loading matches stored in match log files and in compressed segments.
+    :param tmp_path: a temporary directory
+    :param expected_match: a Match instance
+    """
+    time: datetime = datetime(year=2023, month=1, day=1)
+    matches: list[Match] = [replace(expected_match, player_name=f"Player {i}", is_quickplay=i % 3 == 0)
+                            for i in range(10)]
+    records: list[MatchRecord] = []
+    segment_log: SegmentLog
+    with SegmentLog(tmp_path / "segments", compression=MatchLogCompression.GZIP) as segment_log:
+        # Every other match is stored in a file, the matches are saved out of order
+        for i, match in reversed(list(enumerate(matches))):
+            document: str = encode_match(match).document
+            match_time: datetime = time + timedelta(days=i)
+            if i % 2:
+                file_path: Path = tmp_path / f"{i}.json"
+                file_path.write_text(document)
+                records.append(match.to_record(match.generate_hash(), file_path, match_time))
+            else:
+                location: SegmentLocation = segment_log.append(document.encode(), match_time)
+                records.append(match.to_record(match.generate_hash(), location.file_path, match_time,
+                                               log_location=location))
+
+    database: DatabaseClient
+    archive: MatchArchive
+    with DatabaseClient(file_path=tmp_path / "match_data.db") as database, MatchArchive(database) as archive:
+        insert_matches(database, records)
+        assert len(archive) == len(matches)
+        assert list(archive.matches()) == matches
+
+        # Matches are located by their position in time order
+        assert archive.load(archive[0]) == matches[0]
+        assert archive[-1].time == time + timedelta(days=9)
+        assert archive[-1].match_hash == matches[-1].generate_hash()
+        with pytest.raises(IndexError):
+            archive[len(matches)]
+
+        # Time ranges and modes only read the match logs in the range
+        assert list(archive.matches(since=time + timedelta(days=2), until=time + timedelta(days=5))) == matches[2:5]
+        assert list(archive.matches(is_quickplay=True)) == matches[::3]
+        assert [match_log.is_quickplay for match_log in archive.match_logs(since=time + timedelta(days=8))] == \
+               [False, True]
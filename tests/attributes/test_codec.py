@@ -0,0 +1,77 @@
+import json
+from dataclasses import asdict, replace
+from hashlib import sha256
+
+import pytest
+
+from hunt.attributes.codec import EncodedMatch, decode_match, encode_match
+from hunt.attributes.match import Match
+from hunt.exceptions import ParserError
+
+
+def _legacy_hash(match: Match) -> str:
+    """
+    Generates a match hash the way previous versions did, hashes saved to the database must remain valid.
+    :param match: a Match instance
+    :return: a sha256 hash digest
+    """
+    match_data: dict = asdict(match)
+    del match_data["bloodline_rank"]
+    del match_data["region"]
+    del match_data["secondary_region"]
+    return sha256(json.dumps(match_data).encode()).hexdigest()
+
+
+@pytest.mark.parametrize("changes", ({}, {"player_name": "Plàyer \"☆\" \\ \n"}, {"accolades": (), "teams": ()}))
+def test_encode_match(expected_match: Match, changes: dict) -> None:
+    """
+    Test encode_match by comparing the encoded match to the previous json.dumps based implementations.
+    :param expected_match: a Match instance
+    :param changes: the changes to apply to the match
+    """
+    match: Match = replace(expected_match, **changes)
+
+    encoded_match: EncodedMatch = encode_match(match)
+    assert encoded_match.digest == _legacy_hash(match)
+    assert encoded_match.document == json.dumps(match, indent=2, default=vars)
+
+    # Generating only the hash should produce the same digest
+    assert encode_match(match, document=False) == EncodedMatch(digest=encoded_match.digest, document="")
+    assert match.generate_hash() == encoded_match.digest
+
+
+def test_encode_match_excluded_fields(expected_match: Match) -> None:
+    """
+    Test encode_match by changing the variables which are excluded from the hash.
+    :param expected_match: a Match instance
+    """
+    match: Match = replace(expected_match, bloodline_rank=1, region="us", secondary_region="eu")
+    assert encode_match(match).digest == encode_match(expected_match).digest
+    assert encode_match(match).document != encode_match(expected_match).document
+
+
+@pytest.mark.parametrize("changes", ({}, {"player_name": "Plàyer \"☆\" \\ \n"}, {"accolades": (), "teams": ()}))
+def test_decode_match(expected_match: Match, changes: dict) -> None:
+    """
+    Test decode_match by decoding encoded matches.
+    :param expected_match: a Match instance
+    :param changes: the changes to apply to the match
+    """
+    match: Match = replace(expected_match, **changes)
+    assert decode_match(encode_match(match).document) == match
+    assert decode_match(encode_match(match).document.encode()) == match
+
+
+@pytest.mark.parametrize("document", (
+        "", "{", "[]", "{}",
+        '{"player_name": "Player"}',
+        json.dumps({"player_name": 1, "bloodline_rank": 1, "is_hunter_dead": False, "is_quickplay": False,
+                    "region": "eu", "secondary_region": "", "accolades": [], "entries": [], "rewards": {},
+                    "teams": []})))
+def test_decode_match_malformed(document: str) -> None:
+    """
+    Test decode_match with malformed documents.
+    :param document: a malformed document
+    """
+    with pytest.raises(ParserError):
+        decode_match(document)
@@ -0,0 +1,24 @@
+from hunt.attributes.fingerprint import FingerprintTracker
+from hunt.database.client import Client as DatabaseClient
+
+
+def test_fingerprint_tracker(database_client: DatabaseClient) -> None:
+    """
+    Test FingerprintTracker by updating the fingerprint and restoring it from the database.
+    :param database_client: a Database instance
+    """
+    fingerprint_tracker: FingerprintTracker = FingerprintTracker(database=database_client)
+    assert not fingerprint_tracker.is_unchanged("fingerprint")
+
+    fingerprint_tracker.update("fingerprint")
+    assert fingerprint_tracker.is_unchanged("fingerprint")
+    assert not fingerprint_tracker.is_unchanged("other fingerprint")
+
+    # The fingerprint should be restored after a restart
+    assert FingerprintTracker(database=database_client).is_unchanged("fingerprint")
+
+    # Sources which share the database track their fingerprints separately
+    source_fingerprint_tracker: FingerprintTracker = FingerprintTracker(database=database_client, source="test-server")
+    assert not source_fingerprint_tracker.is_unchanged("fingerprint")
+    source_fingerprint_tracker.update("other fingerprint")
+    assert FingerprintTracker(database=database_client).is_unchanged("fingerprint")
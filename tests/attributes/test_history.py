@@ -0,0 +1,64 @@
+from dataclasses import replace
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from hunt.attributes.archive import MatchArchive
+from hunt.attributes.codec import encode_match
+from hunt.attributes.history import MatchHistory
+from hunt.attributes.match import Match
+from hunt.attributes.player import Player
+from hunt.database.client import Client as DatabaseClient
+from hunt.database.queries import insert_matches
+
+
+def test_match_history(expected_match: Match) -> None:
+    """
+    Test MatchHistory by appending matches and reading their columns.
+    :param expected_match: a Match instance
+    """
+    time: datetime = datetime(year=2023, month=1, day=1)
+    history: MatchHistory = MatchHistory()
+    assert history.append(expected_match, time=time) == 0
+    assert history.append(replace(expected_match, teams=()), time=time) == 1
+    assert history.append(replace(expected_match, is_quickplay=True), time=time + timedelta(hours=1)) == 2
+    assert len(history) == 3
+
+    # The rows of each table are addressed by their index
+    players: tuple[Player, ...] = tuple(player for team in expected_match.teams for player in team.players)
+    assert len(history.team_range(0)) == len(expected_match.teams)
+    assert not history.team_range(1) and not history.match_player_range(1)
+    assert [history.strings[history.players.name[i]] for i in history.match_player_range(2)] == \
+           [player.name for player in players]
+    assert [history.players.mmr[i] for i in history.match_player_range(0)] == [player.mmr for player in players]
+    assert [history.players.team[i] for i in history.player_range(history.team_range(2).start)] == \
+           [history.team_range(2).start] * len(expected_match.teams[0].players)
+    assert list(history.matches.is_quickplay) == [False, False, True]
+    assert history.matches.time[2] - history.matches.time[0] == 3600
+    assert history.matches.bounty[0] == expected_match.rewards.bounty
+
+    # Strings are stored once
+    assert len(history.strings) == len({expected_match.player_name, expected_match.region,
+                                        expected_match.secondary_region, *(player.name for player in players)})
+
+
+def test_match_history_extend(tmp_path: Path, expected_match: Match) -> None:
+    """
+    Test MatchHistory.extend by appending saved matches from the match archive.
+    :param tmp_path: a temporary directory
+    :param expected_match: a Match instance
+    """
+    time: datetime = datetime(year=2023, month=1, day=1)
+    matches: list[Match] = [replace(expected_match, player_name=f"Player {i}") for i in range(3)]
+    file_paths: list[Path] = [tmp_path / f"{i}.json" for i in range(len(matches))]
+    for file_path, match in zip(file_paths, matches):
+        file_path.write_text(encode_match(match).document)
+
+    database: DatabaseClient
+    archive: MatchArchive
+    with DatabaseClient(file_path=tmp_path / "match_data.db") as database, MatchArchive(database) as archive:
+        insert_matches(database, (match.to_record(match.generate_hash(), file_path, time + timedelta(days=i))
+                                  for i, (match, file_path) in enumerate(zip(matches, file_paths))))
+        history: MatchHistory = MatchHistory()
+        assert history.extend(archive, since=time + timedelta(days=1)) == 2
+    assert [history.strings[string_id] for string_id in history.matches.player_name] == ["Player 1", "Player 2"]
+    assert history.matches.time[0] == int((time + timedelta(days=1)).timestamp())
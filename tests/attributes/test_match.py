@@ -1,7 +1,15 @@
 import json
+from dataclasses import replace
 from pathlib import Path
+from sqlite3 import Error as SqliteError, IntegrityError
+
+import pytest
+from pytest import MonkeyPatch
 
 from hunt.attributes.match import DatabaseClient, Match
+from hunt.database.client import Cursor
+from hunt.database.queries import MatchRecord
+from hunt.filesystem.segments import SegmentLog
 from .conftest import MAGIC_FILE_PATH, MagicMock, datetime
 
 
@@ -30,7 +38,34 @@ def test_match_try_save_to_file(io_safe_match: Match, database_client: DatabaseC
 
     # Assertions
     match_data: str = json.dumps(io_safe_match, indent=2, default=vars)
-    mock_open.assert_called_once_with(MAGIC_FILE_PATH, mode="w")  # assert open(MAGIC_FILE_PATH, mode="w") invoked
+    mock_open.assert_called_once_with(MAGIC_FILE_PATH, mode="x")  # assert open(MAGIC_FILE_PATH, mode="x") invoked
 
     mock_open_handle: MagicMock = mock_open()
     mock_open_handle.write.assert_called_once_with(match_data)  # assert file.write(match_data) invoked
+
+
+def test_match_write_rollback(tmp_path: Path, monkeypatch: MonkeyPatch, expected_match: Match,
+                              database_client: DatabaseClient) -> None:
+    """
+    Test Match.write with a database update which fails, the match logs written before it are removed.
+    :param tmp_path: a temporary directory
+    :param monkeypatch: a MonkeyPatch instance
+    :param expected_match: a Match instance
+    :param database_client: a Database instance
+    """
+    def failing_write_match(cursor: Cursor, match: MatchRecord) -> bool:
+        raise IntegrityError("The match can't be saved.")
+    monkeypatch.setattr("hunt.attributes.match.write_match", failing_write_match)
+    monkeypatch.setattr("hunt.attributes.match.MATCH_LOGS_PATH", tmp_path / "logs")
+
+    segment_log: SegmentLog
+    with SegmentLog(tmp_path / "segments") as segment_log:
+        segment_size: int = sum(file_path.stat().st_size for file_path in (tmp_path / "segments").iterdir())
+        for match_log_storage in (None, segment_log):
+            cursor: Cursor
+            with pytest.raises(SqliteError), database_client.transaction() as cursor:
+                replace(expected_match, player_name="Rollback").write(cursor, database=database_client,
+                                                                      segment_log=match_log_storage)
+
+    assert not list((tmp_path / "logs").rglob("*.json"))
+    assert sum(file_path.stat().st_size for file_path in (tmp_path / "segments").iterdir()) == segment_size
@@ -1,6 +1,11 @@
-from xml.etree.ElementTree import Element as XmlElement
+from pathlib import Path
+from xml.etree.ElementTree import Element as XmlElement, tostring
 
-from hunt.attributes.parser import parse_match, Match
+import pytest
+
+from hunt.attributes.parser import ParserBackend, parse_match, read_attributes, Match
+from hunt.exceptions import ParserError
+from hunt.attributes.xml.elements import AttributeIndex, index_attributes
 
 
 def test_parse_match(attributes_tree: XmlElement, expected_match: Match) -> None:
@@ -10,3 +15,44 @@ def test_parse_match(attributes_tree: XmlElement, expected_match: Match) -> None
     :param expected_match: the Match instance to compare against
     """
     assert parse_match(attributes_tree, steam_name=expected_match.player_name) == expected_match
+
+
+def test_parse_match_from_index(attributes_tree: XmlElement, expected_match: Match) -> None:
+    """
+    Test parse_match by parsing a prebuilt attribute index instead of the element tree.
+    :param attributes_tree: a generated element tree
+    :param expected_match: the Match instance to compare against
+    """
+    attributes: AttributeIndex = index_attributes(attributes_tree)
+    assert parse_match(attributes, steam_name=expected_match.player_name) == expected_match
+
+
+@pytest.mark.parametrize("backend", tuple(ParserBackend))
+def test_read_attributes(attributes_tree: XmlElement, expected_match: Match, tmp_path: Path,
+                         backend: ParserBackend) -> None:
+    """
+    Test read_attributes by parsing an attributes file with each parser backend.
+    :param attributes_tree: a generated element tree
+    :param expected_match: the Match instance to compare against
+    :param tmp_path: a temporary directory
+    :param backend: the parser backend to use
+    """
+    file_path: Path = tmp_path / "attributes.xml"
+    file_path.write_bytes(tostring(attributes_tree, encoding="utf-8", xml_declaration=True))
+
+    attributes: AttributeIndex = read_attributes(file_path, backend=backend)
+    assert parse_match(attributes, steam_name=expected_match.player_name) == expected_match
+
+
+@pytest.mark.parametrize("backend", tuple(ParserBackend))
+def test_read_attributes_malformed(tmp_path: Path, backend: ParserBackend) -> None:
+    """
+    Test read_attributes by parsing a truncated attributes file with each parser backend.
+    :param tmp_path: a temporary directory
+    :param backend: the parser backend to use
+    """
+    file_path: Path = tmp_path / "attributes.xml"
+    file_path.write_bytes(b'<Attributes Version="37"><Attr name="Region" value="eu"/>')
+
+    with pytest.raises(ParserError):
+        read_attributes(file_path, backend=backend)
@@ -1,6 +1,7 @@
 import pytest
 
-from hunt.attributes.xml.elements import XmlElement, ParserError, append_element, get_element_value
+from hunt.attributes.xml.elements import AttributeIndex, XmlElement, ParserError, append_element, get_element_value, \
+    index_attributes
 from .conftest import ElementDataType, ElementDataCollectionType
 
 
@@ -76,3 +77,25 @@ def test_get_element_value_missing_element(root_element: XmlElement) -> None:
     # Invoke get_element_value
     with pytest.raises(ParserError, match=r"No such element .* in the current element tree."):
         get_element_value(root_element, name="nonexistent-element-name")
+
+
+def test_index_attributes(root_element: XmlElement, expected_elements: ElementDataCollectionType) -> None:
+    """
+    Test index_attributes by indexing the root element and resolving the expected elements from the index.
+    :param root_element: the root element of the tree
+    """
+    # Append a duplicate and an unrelated element, neither should affect the index
+    existing_element_name, existing_element_value = expected_elements[0]
+    root_element.append(XmlElement("Attr", attrib={"name": existing_element_name, "value": "duplicate"}))
+    root_element.append(XmlElement("Unrelated", attrib={"name": "unrelated-element", "value": "unrelated"}))
+
+    # Index the root element
+    index: AttributeIndex = index_attributes(root_element)
+    assert len(index) == len(expected_elements)
+    assert index[existing_element_name] == existing_element_value
+    assert "unrelated-element" not in index
+
+    # Invoke get_element_value
+    for element_name, expected_value in expected_elements:
+        result = get_element_value(index, name=element_name, result_type=type(expected_value))
+        assert result == expected_value
@@ -0,0 +1,72 @@
+from pathlib import Path
+from xml.etree.ElementTree import fromstring
+
+import pytest
+
+from hunt.attributes.xml.elements import AttributeIndex, ParserError, index_attributes
+from hunt.attributes.xml.scanner import fingerprint_match_attributes, scan_match_attributes
+from hunt.attributes.xml.streaming import is_match_attribute
+
+
+@pytest.mark.parametrize("value", ("eu", "", "&amp;&lt;&gt;&quot;&apos;", "&#65;&#x42;", "line\r\nbreak\ttab",
+                                   "&#10;", "ünïcödé"))
+def test_scan_match_attributes_values(tmp_path: Path, value: str) -> None:
+    """
+    Test scan_match_attributes by comparing the decoded values to the values decoded by ElementTree.
+    :param tmp_path: a temporary directory
+    :param value: the raw attribute value
+    """
+    document: bytes = (f'<?xml version="1.0" encoding="utf-8"?>\n<Attributes Version="37">\n'
+                       f' <Attr name="Settings/Language" value="en"/>\n'
+                       f' <Attr name="Region" value="{value}"/>\n'
+                       f' <Attr name="Region" value="duplicate"/>\n'
+                       f'</Attributes>\n').encode()
+    file_path: Path = tmp_path / "attributes.xml"
+    file_path.write_bytes(document)
+
+    expected_attributes: AttributeIndex = {name: value for name, value in index_attributes(fromstring(document)).items()
+                                           if is_match_attribute(name)}
+    assert scan_match_attributes(file_path) == expected_attributes
+
+
+@pytest.mark.parametrize("document", (
+        b"",
+        b'<Attributes Version="37"><Attr name="Region" value="eu"/>',
+        b'<Attributes Version="37"><Attr name="Region" value="e<u"/></Attributes>',
+        b'<Attributes Version="37"><Attr name="Region" value=eu/></Attributes>',
+        b'<Attributes Version="37"><Attr name="Region" value="eu"></Attributes>',
+        b'<Attributes Version="37"><Attr name="Region"/></Attributes>',
+        b'<Attributes Version="37"><Attr name="Region" value="&unknown;"/></Attributes>',
+        b'<Attributes Version="37"><Attr name="Region" value="&amp"/></Attributes>',
+        b'<Attributes Version="37"><Attr name="Region" value="\xff"/></Attributes>'))
+def test_scan_match_attributes_malformed(tmp_path: Path, document: bytes) -> None:
+    """
+    Test scan_match_attributes by scanning malformed attribute files.
+    :param tmp_path: a temporary directory
+    :param document: the malformed file contents
+    """
+    file_path: Path = tmp_path / "attributes.xml"
+    file_path.write_bytes(document)
+
+    with pytest.raises(ParserError):
+        scan_match_attributes(file_path)
+
+
+def test_fingerprint_match_attributes(tmp_path: Path) -> None:
+    """
+    Test fingerprint_match_attributes by changing match data and unrelated attributes.
+    :param tmp_path: a temporary directory
+    """
+    file_path: Path = tmp_path / "attributes.xml"
+
+    def fingerprint(unlock_rank: int, setting: str, team_count: int) -> str:
+        file_path.write_bytes(f'<Attributes Version="37">'
+                              f'<Attr name="Unlocks/UnlockRank" value="{unlock_rank}"/>'
+                              f'<Attr name="Settings/Language" value="{setting}"/>'
+                              f'<Attr name="MissionBagNumTeams" value="{team_count}"/>'
+                              f'</Attributes>'.encode())
+        return fingerprint_match_attributes(file_path)
+
+    expected_fingerprint: str = fingerprint(unlock_rank=1, setting="en", team_count=2)
+    assert fingerprint(unlock_rank=2, setting="de", team_count=2) == expected_fingerprint
+    assert fingerprint(unlock_rank=1, setting="en", team_count=3) != expected_fingerprint
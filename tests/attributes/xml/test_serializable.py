@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import pytest
+
+from hunt.attributes.accolade import Accolade
+from hunt.attributes.xml.elements import AttributeIndex, ParserError, XmlElement, index_attributes
+from hunt.attributes.xml.serializable import MappingGenerator, Serializable
+
+
+@dataclass(frozen=True)
+class _UnsupportedSerializable(Serializable):
+    value: float
+
+    @staticmethod
+    def _data_mappings() -> MappingGenerator:
+        """
+        Yield each variable name and its corresponding attribute suffix.
+        :return: a generator which yields the name, value
+        """
+        yield "value", "value"
+
+    def serialize(self, root: XmlElement, name_prefix: str) -> None:
+        """
+        Serialize an _UnsupportedSerializable instance.
+        :param root: the root element to serialize into
+        :param name_prefix: the name prefix to use when appending elements
+        """
+        super().serialize(root, name_prefix)
+
+    @classmethod
+    def deserialize(cls, root: XmlElement | AttributeIndex, name_prefix: str) -> _UnsupportedSerializable:
+        """
+        Deserialize a series of elements into an _UnsupportedSerializable instance.
+        :param root: the root element to deserialize from
+        :param name_prefix: the name prefix to use when resolving elements
+        :return: a deserialized _UnsupportedSerializable instance
+        """
+        return super(cls, cls).deserialize(root, name_prefix)
+
+
+def test_serializable_round_trip() -> None:
+    """Test Serializable.serialize and Serializable.deserialize by round-tripping an Accolade instance."""
+    accolade: Accolade = Accolade(1, 2, "accolade_extraction", 3, 4, 5, 6, 7, 8, 9, 10, 11)
+
+    # Serialize the accolade twice to make sure repeated use of the compiled fields is stable
+    root: XmlElement = XmlElement("Attributes")
+    for accolade_id in range(2):
+        accolade.serialize(root, accolade_id=accolade_id)
+
+    index: AttributeIndex = index_attributes(root)
+    assert len(index) == 2 * 12
+    for accolade_id in range(2):
+        assert Accolade.deserialize(index, accolade_id=accolade_id) == accolade
+
+
+def test_serializable_unsupported_type() -> None:
+    """Test Serializable.deserialize by deserializing a class with an unsupported field type."""
+    index: AttributeIndex = {"prefix_value": "1.0"}
+    with pytest.raises(ParserError, match=r"Type conversion not supported."):
+        _UnsupportedSerializable.deserialize(index, "prefix")
@@ -0,0 +1,42 @@
+from io import BytesIO
+from xml.etree.ElementTree import ParseError, tostring
+
+import pytest
+
+from hunt.attributes.parser import Match, parse_match
+from hunt.attributes.xml.elements import AttributeIndex, XmlElement, append_element
+from hunt.attributes.xml.streaming import stream_match_attributes
+
+
+def test_stream_match_attributes(attributes_tree: XmlElement, expected_match: Match) -> None:
+    """
+    Test stream_match_attributes by streaming a serialized element tree and parsing the result.
+    :param attributes_tree: a generated element tree
+    :param expected_match: the Match instance to compare against
+    """
+    # Append attributes which aren't required to parse match data
+    append_element(attributes_tree, name="UnlockedItems/Item_0", value="rifle")
+    append_element(attributes_tree, name="Settings/Volume", value=100)
+
+    attributes: AttributeIndex = stream_match_attributes(BytesIO(tostring(attributes_tree)))
+    assert "UnlockedItems/Item_0" not in attributes
+    assert "Settings/Volume" not in attributes
+    assert parse_match(attributes, steam_name=expected_match.player_name) == expected_match
+
+
+def test_stream_match_attributes_first_element_wins() -> None:
+    """Test stream_match_attributes by streaming duplicate and nested attributes."""
+    document: bytes = (b'<Attributes Version="37">'
+                       b'<Attr name="Region" value="eu"/>'
+                       b'<Attr name="Region" value="us"/>'
+                       b'<Nested><Attr name="SecondaryRegion" value="nested"/></Nested>'
+                       b'</Attributes>')
+
+    attributes: AttributeIndex = stream_match_attributes(BytesIO(document))
+    assert attributes == {"Region": "eu"}
+
+
+def test_stream_match_attributes_malformed() -> None:
+    """Test stream_match_attributes by streaming a truncated attributes file."""
+    with pytest.raises(ParseError):
+        stream_match_attributes(BytesIO(b'<Attributes Version="37"><Attr name="Region" value="eu"/>'))
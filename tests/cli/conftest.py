@@ -0,0 +1,74 @@
+from dataclasses import replace
+from datetime import datetime
+from pathlib import Path
+
+from pytest import MonkeyPatch, fixture
+
+from hunt.attributes.codec import encode_match
+from hunt.attributes.match import Match
+from hunt.attributes.parser import ParserBackend
+from hunt.cli.config import Command, Config
+from hunt.constants import WATCHDOG_MAX_DELAY, WATCHDOG_POLL_INTERVAL, WATCHDOG_QUIET_PERIOD
+from hunt.database.client import DatabaseProfile
+from hunt.filesystem.compression import MatchLogCompression
+from hunt.filesystem.segments import MatchLogStorage
+from hunt.filesystem.watchers import WatcherBackend
+from ..attributes.conftest import attributes_tree, expected_match  # noqa: F401
+
+
+@fixture
+def database_path(tmp_path: Path, monkeypatch: MonkeyPatch) -> Path:
+    """
+    A fixture which redirects the database used by commands to a temporary directory.
+    :param tmp_path: a temporary directory
+    :param monkeypatch: a MonkeyPatch instance
+    :return: the path to the database
+    """
+    file_path: Path = tmp_path / "match_data.db"
+    monkeypatch.setattr("hunt.cli.backfill.DATABASE_PATH", file_path)
+    monkeypatch.setattr("hunt.cli.ingest.DATABASE_PATH", file_path)
+    monkeypatch.setattr("hunt.cli.convert.DATABASE_PATH", file_path)
+    return file_path
+
+
+def generate_config(command: Command, paths: tuple[Path, ...], persona_name: str | None = None,
+                    match_log_storage: MatchLogStorage = MatchLogStorage.FILES,
+                    match_log_compression: MatchLogCompression = MatchLogCompression.NONE,
+                    remove_files: bool = False) -> Config:
+    """
+    Generates the configuration of a command.
+    :param command: the command to run
+    :param paths: the paths processed by the command
+    :param persona_name: the Steam persona name used by the command
+    :param match_log_storage: how new match logs are stored
+    :param match_log_compression: how match logs are compressed
+    :param remove_files: True to remove the converted match log files
+    :return: a Config instance
+    """
+    return Config(debug=False, test_server=False, statistics=False, parser_backend=ParserBackend.STREAMING,
+                  database_profile=DatabaseProfile.DURABLE, match_log_storage=match_log_storage,
+                  match_log_compression=match_log_compression, watcher_backend=WatcherBackend.WATCHDOG,
+                  poll_interval=WATCHDOG_POLL_INTERVAL, quiet_period=WATCHDOG_QUIET_PERIOD,
+                  max_delay=WATCHDOG_MAX_DELAY, all_profiles=False, profile_personas={}, sources=(),
+                  headless=False,
+                  install_directory=None, test_server_install_directory=None, command=command, paths=paths,
+                  workers=2, persona_name=persona_name, remove_files=remove_files)
+
+
+def write_match_logs(directory: Path, match: Match, count: int) -> list[Path]:
+    """
+    Writes match logs the way Match.try_save_to_file does.
+    :param directory: the match logs directory
+    :param match: the match to derive each match from
+    :param count: the amount of match logs
+    :return: the paths to the match logs
+    """
+    file_paths: list[Path] = []
+    for i in range(count):
+        file_path: Path = replace(match, bloodline_rank=i).generate_file_path(
+            time=datetime(year=2023, month=1, day=1 + i // 2, second=i))
+        file_path = directory / file_path.relative_to(file_path.parents[2])
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        file_path.write_text(encode_match(replace(match, player_name=f"Player {i}")).document)
+        file_paths.append(file_path)
+    return file_paths
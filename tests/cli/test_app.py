@@ -0,0 +1,14 @@
+import os
+import subprocess
+import sys
+
+
+def test_lazy_imports() -> None:
+    """Test the CLI entry point by importing it, the modules of the watch mode and the commands aren't imported."""
+    deferred_modules: tuple[str, ...] = (
+        "asyncio", "statistics", "zipfile", "watchdog", "xml.etree.ElementTree", "hunt.attributes.parser",
+        "hunt.cli.backfill", "hunt.cli.ingest", "hunt.cli.runtime", "hunt.filesystem.watchdog", "hunt.steam.api")
+    process: subprocess.CompletedProcess[str] = subprocess.run(
+        (sys.executable, "-c", "import sys, hunt.cli.app; print(*sys.modules, sep='\\n')"),
+        capture_output=True, text=True, check=True, env=os.environ | {"PYTHONPATH": os.pathsep.join(sys.path)})
+    assert set(deferred_modules).isdisjoint(process.stdout.splitlines())
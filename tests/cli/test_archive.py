@@ -0,0 +1,56 @@
+from datetime import date
+from pathlib import Path
+
+from hunt.attributes.codec import decode_match
+from hunt.attributes.match import Match, load_match
+from hunt.cli.archive import MatchLogArchiver, archived_day_directories
+from hunt.cli.backfill import backfill
+from hunt.cli.config import Command
+from hunt.cli.exit_codes import ExitCode
+from hunt.database.client import Client as DatabaseClient
+from hunt.database.paths import relative_log_path
+from hunt.database.queries import fetch_match_log_paths
+from hunt.database.writer import DatabaseWriter
+from hunt.filesystem.compression import MatchLogCompression
+from .conftest import generate_config, write_match_logs
+
+
+def test_archive(tmp_path: Path, database_path: Path, expected_match: Match) -> None:
+    """
+    Test MatchLogArchiver by compressing the match logs of the previous days, then backfilling them.
+    :param tmp_path: a temporary directory
+    :param database_path: the path to the database
+    :param expected_match: a Match instance
+    """
+    logs_path: Path = tmp_path / "logs"
+    file_paths: list[Path] = write_match_logs(logs_path, expected_match, count=4)
+    matches: list[Match] = [decode_match(file_path.read_bytes()) for file_path in file_paths]
+    (logs_path / "segments").mkdir()
+    assert backfill(generate_config(Command.BACKFILL, paths=(logs_path,))) == ExitCode.SUCCESS
+
+    # On 2023-01-02, only the match logs of 2023-01-01 are archived
+    assert archived_day_directories(logs_path, before=date(year=2023, month=1, day=2)) == [logs_path / "2023-01-01"]
+    archiver: MatchLogArchiver
+    database: DatabaseClient
+    writer: DatabaseWriter
+    with DatabaseClient(file_path=database_path) as database:
+        with DatabaseWriter(database) as writer:
+            archiver = MatchLogArchiver(logs_path, compression=MatchLogCompression.GZIP, writers=(writer,))
+            archiver.archive()
+            assert archiver.compressed_match_logs == 4
+            # Compressing the archived match logs again doesn't compress them again
+            archiver.archive()
+            assert archiver.compressed_match_logs == 4
+
+        # The plain match logs are replaced, the database is pointed to the compressed match logs
+        compressed_paths: list[Path] = [file_path.with_name(f"{file_path.name}.gz") for file_path in file_paths]
+        assert sorted(logs_path.rglob("*.json*")) == compressed_paths
+        assert fetch_match_log_paths(database) == {relative_log_path(file_path) for file_path in compressed_paths}
+        assert [load_match(database, match_hash=match.generate_hash()) for match in matches] == matches
+
+    # The backfill skips the compressed match logs, or decodes them into a new database
+    assert backfill(generate_config(Command.BACKFILL, paths=(logs_path,))) == ExitCode.SUCCESS
+    database_path.unlink()
+    assert backfill(generate_config(Command.BACKFILL, paths=(logs_path,))) == ExitCode.SUCCESS
+    with DatabaseClient(file_path=database_path) as database:
+        assert fetch_match_log_paths(database) == {relative_log_path(file_path) for file_path in compressed_paths}
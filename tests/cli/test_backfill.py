@@ -0,0 +1,85 @@
+from contextlib import closing
+from pathlib import Path
+from sqlite3 import Connection, connect as sqlite3_connect
+
+from hunt.attributes.codec import decode_match
+from hunt.attributes.match import Match
+from hunt.cli.backfill import backfill
+from hunt.cli.config import Command
+from hunt.cli.exit_codes import ExitCode
+from hunt.constants import DATABASE_TABLE_QUERIES
+from hunt.database.client import Client as DatabaseClient, Cursor
+from hunt.database.queries import count_matches
+from .conftest import generate_config, write_match_logs
+
+
+def test_backfill(tmp_path: Path, database_path: Path, expected_match: Match) -> None:
+    """
+    Test backfill by backfilling a generated match logs directory, including a duplicate and a malformed match log,
+      and resuming the backfill.
+    :param tmp_path: a temporary directory
+    :param database_path: the path to the database
+    :param expected_match: a Match instance
+    """
+    logs_path: Path = tmp_path / "logs"
+    file_paths: list[Path] = write_match_logs(logs_path, expected_match, count=5)
+    (logs_path / "2023-01-01" / "duplicate.json").write_bytes(file_paths[0].read_bytes())
+    (logs_path / "2023-01-01" / "malformed.json").write_text("{")
+
+    def count_matches() -> int:
+        database: DatabaseClient
+        with DatabaseClient(file_path=database_path) as database:
+            cursor: Cursor
+            with closing(database.cursor()) as cursor:
+                return cursor.execute("SELECT COUNT(*) FROM matches").fetchone()[0]
+
+    assert backfill(generate_config(Command.BACKFILL, paths=(logs_path,))) == ExitCode.SUCCESS
+    assert count_matches() == len(file_paths)
+
+    # Resuming skips the saved match logs
+    file_paths += write_match_logs(tmp_path / "resumed", expected_match, count=6)[-1:]
+    assert backfill(generate_config(Command.BACKFILL, paths=(logs_path, tmp_path / "resumed"))) == ExitCode.SUCCESS
+    assert count_matches() == len(file_paths)
+
+
+def test_backfill_legacy_database(tmp_path: Path, database_path: Path, expected_match: Match) -> None:
+    """
+    Test backfill with a database created before the schema was versioned, which saved the hashes of the matches
+      (and updated the player log) without their match data.
+    :param tmp_path: a temporary directory
+    :param database_path: the path to the database
+    :param expected_match: a Match instance
+    """
+    logs_path: Path = tmp_path / "logs"
+    file_paths: list[Path] = write_match_logs(logs_path, expected_match, count=3)
+    connection: Connection
+    with closing(sqlite3_connect(database_path)) as connection:
+        for query in DATABASE_TABLE_QUERIES:
+            connection.execute(query)
+        connection.executemany("INSERT INTO data_hashes (hash, path) VALUES (?, ?)",
+                               ((decode_match(file_path.read_bytes()).generate_hash(), str(file_path))
+                                for file_path in file_paths))
+        connection.commit()
+
+    database: DatabaseClient
+    assert backfill(generate_config(Command.BACKFILL, paths=(logs_path,))) == ExitCode.SUCCESS
+    with DatabaseClient(file_path=database_path) as database:
+        assert count_matches(database) == len(file_paths)
+        # The players of these matches were already counted by the legacy version
+        cursor: Cursor
+        with closing(database.cursor()) as cursor:
+            assert cursor.execute("SELECT COUNT(*) FROM player_log_bountyhunt").fetchone()[0] == 0
+
+    # Resuming skips the match logs whose match data is saved
+    assert backfill(generate_config(Command.BACKFILL, paths=(logs_path,))) == ExitCode.SUCCESS
+    with DatabaseClient(file_path=database_path) as database:
+        assert count_matches(database) == len(file_paths)
+
+
+def test_backfill_missing_directory(tmp_path: Path, database_path: Path) -> None:
+    """
+    Test backfill with a missing match logs directory.
+    :param tmp_path: a temporary directory
+    :param database_path: the path to the database
+    """
+    assert backfill(generate_config(Command.BACKFILL, paths=(tmp_path / "missing",))) == ExitCode.FILESYSTEM_ERROR
@@ -0,0 +1,100 @@
+from contextlib import closing
+from pathlib import Path
+from sqlite3 import Connection, connect as sqlite3_connect
+
+from pytest import MonkeyPatch
+
+from hunt.attributes.codec import decode_match
+from hunt.attributes.match import Match, load_match
+from hunt.cli.backfill import backfill
+from hunt.cli.config import Command
+from hunt.cli.convert import convert
+from hunt.cli.exit_codes import ExitCode
+from hunt.constants import DATABASE_TABLE_QUERIES
+from hunt.database.client import Client as DatabaseClient, Cursor
+from hunt.filesystem.segments import SegmentLog
+from .conftest import generate_config, write_match_logs
+
+
+def test_convert(tmp_path: Path, database_path: Path, monkeypatch: MonkeyPatch, expected_match: Match) -> None:
+    """
+    Test convert by converting saved, new, duplicate and malformed match logs to segments,
+      then backfilling a new database from the segments.
+    :param tmp_path: a temporary directory
+    :param database_path: the path to the database
+    :param monkeypatch: a MonkeyPatch instance
+    :param expected_match: a Match instance
+    """
+    logs_path: Path = tmp_path / "logs"
+    segments_path: Path = logs_path / "segments"
+    monkeypatch.setattr("hunt.database.paths.MATCH_LOGS_PATH", logs_path)
+    monkeypatch.setattr("hunt.cli.convert.MATCH_LOG_SEGMENTS_PATH", segments_path)
+
+    # Every match log except the last one is already saved
+    file_paths: list[Path] = write_match_logs(logs_path, expected_match, count=5)
+    matches: list[Match] = [decode_match(file_path.read_bytes()) for file_path in file_paths]
+    file_paths[-1].rename(tmp_path / "new.json")
+    assert backfill(generate_config(Command.BACKFILL, paths=(logs_path,))) == ExitCode.SUCCESS
+    (tmp_path / "new.json").rename(file_paths[-1])
+    (logs_path / "2023-01-01" / "duplicate.json").write_bytes(file_paths[0].read_bytes())
+    (logs_path / "2023-01-01" / "malformed.json").write_text("{")
+
+    assert convert(generate_config(Command.CONVERT, paths=(logs_path,), remove_files=True)) == ExitCode.SUCCESS
+    # The converted match log files are removed, the malformed match log is kept
+    assert [file_path.name for file_path in logs_path.rglob("*.json")] == ["malformed.json"]
+    segment_size: int = sum(file_path.stat().st_size for file_path in segments_path.iterdir())
+
+    database: DatabaseClient
+    with DatabaseClient(file_path=database_path) as database:
+        cursor: Cursor
+        with closing(database.cursor()) as cursor:
+            assert cursor.execute("SELECT COUNT(*) FROM data_hashes WHERE log_offset IS NOT NULL").fetchone()[0] == 5
+            assert cursor.execute("SELECT COUNT(*) FROM matches").fetchone()[0] == 5
+        # Every match is read from the segments by random access
+        assert [load_match(database, match_hash=match.generate_hash()) for match in matches] == matches
+
+    # Converting the match logs again doesn't append them again, nor while another process appends to the segments
+    with SegmentLog(segments_path):
+        assert convert(generate_config(Command.CONVERT, paths=(logs_path,))) == ExitCode.FILESYSTEM_ERROR
+    assert convert(generate_config(Command.CONVERT, paths=(logs_path,))) == ExitCode.SUCCESS
+    assert sum(file_path.stat().st_size for file_path in segments_path.iterdir()) == segment_size
+
+    # The database can be rebuilt from the segments
+    database_path.unlink()
+    assert backfill(generate_config(Command.BACKFILL, paths=(logs_path,))) == ExitCode.SUCCESS
+    with DatabaseClient(file_path=database_path) as database:
+        assert [load_match(database, match_hash=match.generate_hash()) for match in matches] == matches
+
+
+def test_convert_legacy_database(tmp_path: Path, database_path: Path, monkeypatch: MonkeyPatch,
+                                 expected_match: Match) -> None:
+    """
+    Test convert with a database created before the schema was versioned, which saved the hashes of the matches
+      without their match data, removing the converted match log files.
+    :param tmp_path: a temporary directory
+    :param database_path: the path to the database
+    :param monkeypatch: a MonkeyPatch instance
+    :param expected_match: a Match instance
+    """
+    logs_path: Path = tmp_path / "logs"
+    monkeypatch.setattr("hunt.database.paths.MATCH_LOGS_PATH", logs_path)
+    monkeypatch.setattr("hunt.cli.convert.MATCH_LOG_SEGMENTS_PATH", logs_path / "segments")
+
+    file_paths: list[Path] = write_match_logs(logs_path, expected_match, count=3)
+    matches: list[Match] = [decode_match(file_path.read_bytes()) for file_path in file_paths]
+    connection: Connection
+    with closing(sqlite3_connect(database_path)) as connection:
+        for query in DATABASE_TABLE_QUERIES:
+            connection.execute(query)
+        connection.executemany("INSERT INTO data_hashes (hash, path) VALUES (?, ?)",
+                               ((match.generate_hash(), str(file_path))
+                                for match, file_path in zip(matches, file_paths)))
+        connection.commit()
+
+    assert convert(generate_config(Command.CONVERT, paths=(logs_path,), remove_files=True)) == ExitCode.SUCCESS
+    assert not list(logs_path.rglob("*.json"))
+
+    # The hashes are pointed to the converted match logs
+    database: DatabaseClient
+    with DatabaseClient(file_path=database_path) as database:
+        assert [load_match(database, match_hash=match.generate_hash()) for match in matches] == matches
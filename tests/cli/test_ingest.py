@@ -0,0 +1,146 @@
+import os
+from contextlib import closing
+from pathlib import Path
+from sqlite3 import Error as SqliteError, IntegrityError
+from typing import Iterable
+from xml.etree.ElementTree import tostring
+
+import pytest
+from pytest import MonkeyPatch
+
+from hunt.attributes.match import Match, load_match
+from hunt.attributes.xml.elements import XmlElement, append_element
+from hunt.cli.config import Command, Config
+from hunt.cli.exit_codes import ExitCode
+from hunt.cli.ingest import collect_snapshots, ingest
+from hunt.constants import MATCH_LOGS_PATH
+from hunt.database.client import Client as DatabaseClient, Cursor
+from hunt.database.queries import MatchRecord
+from hunt.filesystem.compression import MatchLogCompression
+from hunt.filesystem.segments import MatchLogStorage, scan_segment
+from .conftest import generate_config
+
+
+def test_collect_snapshots(tmp_path: Path) -> None:
+    """
+    Test collect_snapshots by collecting files and directories of snapshots.
+    :param tmp_path: a temporary directory
+    """
+    file_paths: list[Path] = [tmp_path / "b" / "attributes.xml", tmp_path / "a" / "attributes.xml",
+                              tmp_path / "attributes_copy.xml"]
+    for i, file_path in enumerate(file_paths):
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        file_path.touch()
+        os.utime(file_path, (i, i))
+
+    # The snapshots are ordered by their modification time, duplicates are removed
+    assert collect_snapshots((tmp_path / "a", tmp_path / "b", tmp_path / "attributes_copy.xml",
+                              tmp_path / "a" / "attributes.xml")) == file_paths
+
+
+def test_ingest(tmp_path: Path, database_path: Path, monkeypatch: MonkeyPatch,
+                attributes_tree: XmlElement, expected_match: Match) -> None:
+    """
+    Test ingest by ingesting duplicate, new and malformed snapshots.
+    :param tmp_path: a temporary directory
+    :param database_path: the path to the database
+    :param monkeypatch: a MonkeyPatch instance
+    :param attributes_tree: a generated element tree
+    :param expected_match: the Match instance in the element tree
+    """
+    logs_path: Path = tmp_path / "logs"
+    monkeypatch.setattr("hunt.attributes.match.MATCH_LOGS_PATH", logs_path)
+    monkeypatch.setattr("hunt.database.paths.MATCH_LOGS_PATH", logs_path)
+
+    # Two snapshots of the same match, a snapshot of another match (written at the same time) and a malformed snapshot
+    snapshots_path: Path = tmp_path / "snapshots"
+    snapshots_path.mkdir()
+    (snapshots_path / "1.xml").write_bytes(tostring(attributes_tree))
+    (snapshots_path / "2.xml").write_bytes(tostring(attributes_tree))
+    attributes_tree[:] = [element for element in attributes_tree if element.get("name") != "MissionBagIsHunterDead"]
+    append_element(attributes_tree, name="MissionBagIsHunterDead", value=True)
+    (snapshots_path / "3.xml").write_bytes(tostring(attributes_tree))
+    (snapshots_path / "4.xml").write_text("<Attributes>")
+    for file_path in snapshots_path.iterdir():
+        os.utime(file_path, (0, 0))
+
+    config: Config = generate_config(Command.INGEST, paths=(snapshots_path,), persona_name=expected_match.player_name)
+    assert ingest(config) == ExitCode.SUCCESS
+    assert len(list(logs_path.rglob("*.json"))) == 2
+
+    # Ingesting the same snapshots again doesn't save anything
+    assert ingest(config) == ExitCode.SUCCESS
+    database: DatabaseClient
+    with DatabaseClient(file_path=database_path) as database:
+        cursor: Cursor
+        with closing(database.cursor()) as cursor:
+            assert cursor.execute("SELECT COUNT(*) FROM matches").fetchone()[0] == 2
+            assert not any(row[0].startswith(str(MATCH_LOGS_PATH))
+                           for row in cursor.execute("SELECT path FROM data_hashes"))
+    assert len(list(logs_path.rglob("*.json"))) == 2
+
+
+def test_ingest_compressed_segments(tmp_path: Path, database_path: Path, monkeypatch: MonkeyPatch,
+                                    attributes_tree: XmlElement, expected_match: Match) -> None:
+    """
+    Test ingest by appending the match log of a snapshot to the segments, compressed.
+    :param tmp_path: a temporary directory
+    :param database_path: the path to the database
+    :param monkeypatch: a MonkeyPatch instance
+    :param attributes_tree: a generated element tree
+    :param expected_match: the Match instance in the element tree
+    """
+    segments_path: Path = tmp_path / "logs" / "segments"
+    monkeypatch.setattr("hunt.database.paths.MATCH_LOGS_PATH", tmp_path / "logs")
+    monkeypatch.setattr("hunt.cli.ingest.MATCH_LOG_SEGMENTS_PATH", segments_path)
+    (tmp_path / "attributes.xml").write_bytes(tostring(attributes_tree))
+
+    config: Config = generate_config(Command.INGEST, paths=(tmp_path / "attributes.xml",),
+                                     persona_name=expected_match.player_name,
+                                     match_log_storage=MatchLogStorage.SEGMENTS,
+                                     match_log_compression=MatchLogCompression.GZIP)
+    assert ingest(config) == ExitCode.SUCCESS
+
+    # The match log isn't stored as plain JSON
+    assert not any(expected_match.player_name.encode() in file_path.read_bytes()
+                   for file_path in segments_path.glob("*.segment"))
+    database: DatabaseClient
+    with DatabaseClient(file_path=database_path) as database:
+        assert load_match(database, match_hash=expected_match.generate_hash()) == expected_match
+
+
+def test_ingest_rollback(tmp_path: Path, database_path: Path, monkeypatch: MonkeyPatch,
+                         attributes_tree: XmlElement, expected_match: Match) -> None:
+    """
+    Test ingest with a transaction which fails, the match logs written for the batch are removed.
+    :param tmp_path: a temporary directory
+    :param database_path: the path to the database
+    :param monkeypatch: a MonkeyPatch instance
+    :param attributes_tree: a generated element tree
+    :param expected_match: the Match instance in the element tree
+    """
+    def failing_insert_matches(database: DatabaseClient, matches: Iterable[MatchRecord]) -> int:
+        raise IntegrityError("The matches can't be saved.")
+    logs_path: Path = tmp_path / "logs"
+    monkeypatch.setattr("hunt.cli.ingest.insert_matches", failing_insert_matches)
+    monkeypatch.setattr("hunt.attributes.match.MATCH_LOGS_PATH", logs_path)
+    monkeypatch.setattr("hunt.database.paths.MATCH_LOGS_PATH", logs_path)
+    monkeypatch.setattr("hunt.cli.ingest.MATCH_LOG_SEGMENTS_PATH", logs_path / "segments")
+    (tmp_path / "attributes.xml").write_bytes(tostring(attributes_tree))
+
+    for match_log_storage in MatchLogStorage:
+        with pytest.raises(SqliteError):
+            ingest(generate_config(Command.INGEST, paths=(tmp_path / "attributes.xml",),
+                                   persona_name=expected_match.player_name, match_log_storage=match_log_storage))
+    assert not list(logs_path.rglob("*.json"))
+    assert not any(list(scan_segment(file_path)) for file_path in (logs_path / "segments").glob("*.segment"))
+
+
+def test_ingest_missing_snapshot(tmp_path: Path, database_path: Path) -> None:
+    """
+    Test ingest with a missing snapshot.
+    :param tmp_path: a temporary directory
+    :param database_path: the path to the database
+    """
+    config: Config = generate_config(Command.INGEST, paths=(tmp_path / "missing.xml",), persona_name="Player")
+    assert ingest(config) == ExitCode.FILESYSTEM_ERROR
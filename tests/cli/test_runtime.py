@@ -0,0 +1,171 @@
+import threading
+import time
+from contextlib import ExitStack, closing
+from pathlib import Path
+from unittest.mock import MagicMock
+from xml.etree.ElementTree import tostring
+
+from pytest import MonkeyPatch
+
+from hunt.attributes.fingerprint import FingerprintTracker
+from hunt.attributes.match import Match, load_match
+from hunt.attributes.parser import ParserBackend
+from hunt.attributes.xml.elements import XmlElement
+from hunt.cli.runtime import MatchRuntime, MatchSource, ParsedAttributes, parse_attributes_file
+from hunt.database.client import Client as DatabaseClient, Cursor
+from hunt.database.writer import DatabaseWriter
+from hunt.filesystem.base import FileWatcher
+from hunt.filesystem.segments import SegmentLocation, SegmentLog, scan_segment
+from hunt.filesystem.watchers import WatcherBackend, create_file_watcher
+from hunt.steam.identity import HeadlessIdentity, SteamworksIdentity
+
+
+def _run_runtime(tmp_path: Path, monkeypatch: MonkeyPatch, attributes_tree: XmlElement, expected_match: Match,
+                 quiet_period: float, sources: int = 1, segment_log: SegmentLog | None = None) -> list[Match]:
+    """
+    Runs a runtime in a separate thread, writes the attributes files and stops the runtime once they were detected.
+    :param tmp_path: a temporary directory
+    :param monkeypatch: a MonkeyPatch instance
+    :param attributes_tree: a generated element tree
+    :param expected_match: the Match instance in the element tree
+    :param quiet_period: the quiet period of the file watchers
+    :param sources: the amount of sources, each with its own attributes file and database
+    :param segment_log: a SegmentLog instance to append the match logs to, None to save them to files
+    :return: the logged matches
+    """
+    logs_path: Path = tmp_path / "logs"
+    monkeypatch.setattr("hunt.attributes.match.MATCH_LOGS_PATH", logs_path)
+    monkeypatch.setattr("hunt.database.paths.MATCH_LOGS_PATH", logs_path)
+
+    logged_matches: list[Match] = []
+    exit_stack: ExitStack
+    with ExitStack() as exit_stack:
+        match_sources: list[MatchSource] = []
+        for i in range(sources):
+            (tmp_path / f"{i}").mkdir()
+            attributes_path: Path = tmp_path / f"{i}" / "attributes.xml"
+            attributes_path.touch()
+            database: DatabaseClient = exit_stack.enter_context(
+                DatabaseClient(file_path=tmp_path / f"{i}" / "match_data.db"))
+            match_sources.append(MatchSource(
+                name=f"{i}", attributes_path=attributes_path, writer=exit_stack.enter_context(DatabaseWriter(database)),
+                fingerprint_tracker=FingerprintTracker(database=database),
+                identity=HeadlessIdentity(persona_name=expected_match.player_name), segment_log=segment_log))
+
+        runtime: MatchRuntime = MatchRuntime(sources=tuple(match_sources), parser_backend=ParserBackend.STREAMING,
+                                             log_match=logged_matches.append)
+        file_watchers: tuple[FileWatcher, ...] = tuple(
+            create_file_watcher(WatcherBackend.POLLING, source.attributes_path, runtime.notify,
+                                quiet_period=quiet_period, max_delay=60, poll_interval=0.01)
+            for source in match_sources)
+        thread: threading.Thread = threading.Thread(target=runtime.run, args=(file_watchers,))
+        thread.start()
+
+        # Stop the runtime once the modifications were detected, they might not have been processed yet
+        while not all(file_watcher.wakeups for file_watcher in file_watchers):
+            time.sleep(0.01)
+        for source in match_sources:
+            source.attributes_path.write_bytes(tostring(attributes_tree))
+        while not all(file_watcher.debouncer.events for file_watcher in file_watchers):
+            time.sleep(0.01)
+        runtime.stop()
+        thread.join(timeout=10)
+        assert not thread.is_alive()
+
+        # Every source saved the match to its own database
+        for source in match_sources:
+            # Without a quiet period, truncating and writing the file can be detected as separate modifications
+            assert source.modifications >= 1
+            assert (source.parsed_matches, source.saved_matches) == (1, 1)
+            cursor: Cursor
+            with closing(source.writer.database.cursor()) as cursor:
+                assert cursor.execute("SELECT COUNT(*) FROM matches").fetchone()[0] == 1
+    return logged_matches
+
+
+def test_runtime(tmp_path: Path, monkeypatch: MonkeyPatch, attributes_tree: XmlElement,
+                 expected_match: Match) -> None:
+    """
+    Test MatchRuntime by modifying the attributes file while it's running.
+    :param tmp_path: a temporary directory
+    :param monkeypatch: a MonkeyPatch instance
+    :param attributes_tree: a generated element tree
+    :param expected_match: the Match instance in the element tree
+    """
+    assert _run_runtime(tmp_path, monkeypatch, attributes_tree, expected_match, quiet_period=0) == [expected_match]
+    assert len(list((tmp_path / "logs").rglob("*.json"))) == 1
+
+
+def test_runtime_drain(tmp_path: Path, monkeypatch: MonkeyPatch, attributes_tree: XmlElement,
+                       expected_match: Match) -> None:
+    """
+    Test MatchRuntime by stopping it while a burst of modifications is pending, the burst is processed on shutdown.
+    :param tmp_path: a temporary directory
+    :param monkeypatch: a MonkeyPatch instance
+    :param attributes_tree: a generated element tree
+    :param expected_match: the Match instance in the element tree
+    """
+    assert _run_runtime(tmp_path, monkeypatch, attributes_tree, expected_match, quiet_period=60) == [expected_match]
+
+
+def test_runtime_multiple_sources(tmp_path: Path, monkeypatch: MonkeyPatch, attributes_tree: XmlElement,
+                                  expected_match: Match) -> None:
+    """
+    Test MatchRuntime by modifying the attributes files of multiple sources.
+    :param tmp_path: a temporary directory
+    :param monkeypatch: a MonkeyPatch instance
+    :param attributes_tree: a generated element tree
+    :param expected_match: the Match instance in the element tree
+    """
+    assert _run_runtime(tmp_path, monkeypatch, attributes_tree, expected_match, quiet_period=0,
+                        sources=3) == [expected_match] * 3
+    # The match logs of matches saved at the same time don't overwrite each other
+    assert len(list((tmp_path / "logs").rglob("*.json"))) == 3
+
+
+def test_runtime_segments(tmp_path: Path, monkeypatch: MonkeyPatch, attributes_tree: XmlElement,
+                          expected_match: Match) -> None:
+    """
+    Test MatchRuntime by appending the match logs of multiple sources to the same segments.
+    :param tmp_path: a temporary directory
+    :param monkeypatch: a MonkeyPatch instance
+    :param attributes_tree: a generated element tree
+    :param expected_match: the Match instance in the element tree
+    """
+    segment_log: SegmentLog
+    with SegmentLog(tmp_path / "logs" / "segments") as segment_log:
+        assert _run_runtime(tmp_path, monkeypatch, attributes_tree, expected_match, quiet_period=0, sources=2,
+                            segment_log=segment_log) == [expected_match] * 2
+    assert not list((tmp_path / "logs").rglob("*.json"))
+    locations: list[SegmentLocation] = list(scan_segment(next((tmp_path / "logs" / "segments").iterdir())))
+    assert len(locations) == 2
+
+    # The database of each source points to a record of the match
+    for i in range(2):
+        database: DatabaseClient
+        with DatabaseClient(file_path=tmp_path / f"{i}" / "match_data.db") as database:
+            assert load_match(database, match_hash=expected_match.generate_hash()) == expected_match
+
+
+def test_parse_attributes_file_refresh(tmp_path: Path, attributes_tree: XmlElement, expected_match: Match) -> None:
+    """
+    Test parse_attributes_file with an outdated persona name, which is refreshed once.
+    :param tmp_path: a temporary directory
+    :param attributes_tree: a generated element tree
+    :param expected_match: the Match instance in the element tree
+    """
+    attributes_path: Path = tmp_path / "attributes.xml"
+    attributes_path.write_bytes(tostring(attributes_tree))
+    steamworks_api: MagicMock = MagicMock()
+    steamworks_api.get_persona_name.side_effect = ["Outdated name", expected_match.player_name]
+    identity: SteamworksIdentity = SteamworksIdentity(steamworks_api)
+
+    database: DatabaseClient
+    with DatabaseClient(file_path=tmp_path / "match_data.db") as database:
+        fingerprint_tracker: FingerprintTracker = FingerprintTracker(database=database)
+        parsed: ParsedAttributes | None = parse_attributes_file(attributes_path, fingerprint_tracker, identity,
+                                                                ParserBackend.STREAMING)
+    assert parsed is not None and parsed.match == expected_match
+    # The refreshed persona name is cached
+    assert identity.get_persona_name() == expected_match.player_name
+    assert steamworks_api.get_persona_name.call_count == 2
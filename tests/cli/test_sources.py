@@ -0,0 +1,43 @@
+from pathlib import Path
+
+import pytest
+
+from hunt.cli.sources import SourceConfig, discover_sources, profile_database_path
+from hunt.constants import DATABASE_PATH, DATABASE_TEST_SERVER_PATH, HUNT_SHOWDOWN_APP_ID, \
+    HUNT_SHOWDOWN_TEST_SERVER_APP_ID
+
+
+def test_profile_database_path() -> None:
+    """Test profile_database_path by generating the database paths of default and other profiles."""
+    assert profile_database_path(HUNT_SHOWDOWN_APP_ID, "default") == DATABASE_PATH
+    assert profile_database_path(HUNT_SHOWDOWN_TEST_SERVER_APP_ID, "default") == DATABASE_TEST_SERVER_PATH
+    assert profile_database_path(HUNT_SHOWDOWN_APP_ID, "second") == DATABASE_PATH.with_name("match_data_second.db")
+
+
+def test_discover_sources(tmp_path: Path) -> None:
+    """
+    Test discover_sources by discovering the profiles of a live and a test server install.
+    :param tmp_path: a temporary directory
+    """
+    install_directories: dict[int, Path] = {HUNT_SHOWDOWN_APP_ID: tmp_path / "live",
+                                            HUNT_SHOWDOWN_TEST_SERVER_APP_ID: tmp_path / "test_server"}
+    for profile_path in (tmp_path / "live/user/profiles/default", tmp_path / "live/user/profiles/second",
+                         tmp_path / "test_server/user/profiles/default"):
+        profile_path.mkdir(parents=True)
+        (profile_path / "attributes.xml").touch()
+    (tmp_path / "live/user/profiles/empty").mkdir()  # Profiles without an attributes file are skipped
+
+    assert discover_sources(install_directories, all_profiles=True, profile_personas={"live/second": "Second"}) == (
+        SourceConfig("live/default", tmp_path / "live/user/profiles/default/attributes.xml", None, DATABASE_PATH),
+        SourceConfig("live/second", tmp_path / "live/user/profiles/second/attributes.xml", "Second",
+                     profile_database_path(HUNT_SHOWDOWN_APP_ID, "second")),
+        SourceConfig("test-server/default", tmp_path / "test_server/user/profiles/default/attributes.xml", None,
+                     DATABASE_TEST_SERVER_PATH))
+
+    # Only the default profile is watched by default
+    assert discover_sources({HUNT_SHOWDOWN_APP_ID: tmp_path / "live"}, all_profiles=False) == (
+        SourceConfig("live/default", tmp_path / "live/user/profiles/default/attributes.xml", None, DATABASE_PATH),)
+
+    # The matches of the other profiles aren't attributed to the logged-in user
+    with pytest.raises(ValueError, match="live/second"):
+        discover_sources(install_directories, all_profiles=True)
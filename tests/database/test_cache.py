@@ -0,0 +1,96 @@
+from contextlib import closing
+from datetime import datetime, timedelta
+from hashlib import sha256
+from pathlib import Path
+
+from hunt.database.cache import MatchHashCache
+from hunt.database.client import Client as DatabaseClient, Cursor, _HASH_CACHE_FILL_QUERY, _HASH_CACHE_QUERY
+from hunt.database.queries import MatchRecord, data_hash_exists, insert_match, insert_match_hash
+
+_HASHES: tuple[str, ...] = tuple(sha256(f"{i}".encode()).hexdigest() for i in range(4))
+
+
+def test_match_hash_cache_lookup() -> None:
+    """Test MatchHashCache.lookup by looking up cached and missing hashes."""
+    cache: MatchHashCache = MatchHashCache(capacity=len(_HASHES))
+    cache.load(_HASHES[:2])
+
+    assert cache.lookup(_HASHES[0])
+    assert not cache.lookup(_HASHES[2])  # Not cached, the database has to be queried
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_match_hash_cache_eviction() -> None:
+    """Test MatchHashCache.add by exceeding the capacity of the cache."""
+    cache: MatchHashCache = MatchHashCache(capacity=2)
+    cache.load(_HASHES[:2])
+
+    # Use the first hash, the second hash becomes the least recently used hash
+    assert cache.lookup(_HASHES[0])
+    cache.add(_HASHES[2])
+
+    assert len(cache) == 2
+    assert cache.lookup(_HASHES[0])
+    assert not cache.lookup(_HASHES[1])  # Evicted, the database has to be queried
+
+
+def test_database_client_hash_cache(tmp_path: Path) -> None:
+    """
+    Test the hash cache of a DatabaseClient by preloading hashes and keeping the cache consistent with the database.
+    :param tmp_path: a temporary directory
+    """
+    database_path: Path = tmp_path / "match_data.db"
+    database: DatabaseClient
+    with DatabaseClient(file_path=database_path) as database:
+        # The matches are saved out of order, the hashes are preloaded by the time of the match
+        time: datetime = datetime(year=2023, month=1, day=1)
+        for i in (2, 0, 1):
+            insert_match(database, MatchRecord(_HASHES[i], tmp_path / f"{i}.json", time + timedelta(hours=i),
+                                               is_quickplay=False, is_hunter_dead=False, bloodline_rank=100,
+                                               region="eu", players=()))
+
+    # Preload fewer hashes than stored, the least recent hash has to be queried
+    with DatabaseClient(file_path=database_path, hash_cache_capacity=2) as database:
+        assert len(database.hash_cache) == 2
+        assert not database.hash_cache.lookup(_HASHES[0])
+        assert data_hash_exists(database, match_hash=_HASHES[0])
+        assert database.hash_cache.lookup(_HASHES[0])
+
+    # Missing hashes are always queried, another process may have saved them since the cache was preloaded
+    with DatabaseClient(file_path=database_path) as database:
+        assert not data_hash_exists(database, match_hash=_HASHES[3])
+        other_database: DatabaseClient
+        with DatabaseClient(file_path=database_path) as other_database:
+            insert_match_hash(other_database, match_hash=_HASHES[3], file_path=tmp_path / "match.json")
+        assert not database.hash_cache.lookup(_HASHES[3])
+        assert data_hash_exists(database, match_hash=_HASHES[3])
+        assert database.hash_cache.lookup(_HASHES[3])
+
+
+def test_database_client_hash_cache_legacy(tmp_path: Path) -> None:
+    """
+    Test the hash cache of a DatabaseClient by preloading the hashes of matches saved without their match data.
+    :param tmp_path: a temporary directory
+    """
+    database_path: Path = tmp_path / "match_data.db"
+    database: DatabaseClient
+    with DatabaseClient(file_path=database_path) as database:
+        for i, match_hash in enumerate(_HASHES):
+            insert_match_hash(database, match_hash=match_hash, file_path=tmp_path / f"{i}.json")
+
+    with DatabaseClient(file_path=database_path) as database:
+        assert all(database.hash_cache.lookup(match_hash) for match_hash in _HASHES)
+
+
+def test_database_client_hash_cache_query_plan(tmp_path: Path) -> None:
+    """
+    Test the hash cache preload queries of a DatabaseClient, which read the indices without sorting.
+    :param tmp_path: a temporary directory
+    """
+    database: DatabaseClient
+    with DatabaseClient(file_path=tmp_path / "match_data.db") as database:
+        cursor: Cursor
+        with closing(database.cursor()) as cursor:
+            query_plans: list[list[str]] = [[row[-1] for row in cursor.execute(f"EXPLAIN QUERY PLAN {query}", (1,))]
+                                            for query in (_HASH_CACHE_QUERY, _HASH_CACHE_FILL_QUERY)]
+    assert query_plans == [["SCAN matches USING COVERING INDEX matches_time"], ["SCAN data_hashes"]]
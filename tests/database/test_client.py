@@ -5,7 +5,8 @@ import pytest
 from hunt.database.client import Client as DatabaseClient, Cursor
 
 
-@pytest.mark.parametrize("table_name", ("data_hashes", "player_log_bountyhunt", "player_log_quickplay"))
+@pytest.mark.parametrize("table_name", ("data_hashes", "player_log_bountyhunt", "player_log_quickplay",
+                                        "application_state", "matches", "match_players"))
 def test_database_tables(database_client: DatabaseClient, table_name: str) -> None:
     cursor: Cursor
     with closing(database_client.cursor()) as cursor:
@@ -0,0 +1,129 @@
+from contextlib import closing
+from hashlib import sha256
+from pathlib import Path
+from sqlite3 import Connection, Cursor, connect as sqlite3_connect
+from typing import Generator
+
+import pytest
+
+from hunt.constants import DATABASE_TABLE_QUERIES, MATCH_LOGS_PATH
+from hunt.database.migrations import MIGRATIONS, Migration, get_schema_version, migrate, rebuild_table
+from hunt.exceptions import DatabaseError
+
+_LATEST_SCHEMA_VERSION: int = MIGRATIONS[-1].version
+
+
+@pytest.fixture
+def connection() -> Generator[Connection, None, None]:
+    """
+    A fixture to provide an empty in-memory database.
+    :return: a generator which yields a sqlite3 Connection instance
+    """
+    with closing(sqlite3_connect(":memory:")) as connection:
+        yield connection
+
+
+def test_migrate_new_database(connection: Connection) -> None:
+    """
+    Test migrating an empty database to the latest schema version.
+    :param connection: a sqlite3 Connection instance
+    """
+    assert migrate(connection) == len(MIGRATIONS)
+    assert get_schema_version(connection) == _LATEST_SCHEMA_VERSION
+    assert not connection.in_transaction
+
+
+def test_migrate_up_to_date_database(connection: Connection) -> None:
+    """
+    Test that no DDL is executed if the database is already up-to-date.
+    :param connection: a sqlite3 Connection instance
+    """
+    migrate(connection)
+
+    statements: list[str] = []
+    connection.set_trace_callback(statements.append)
+    assert migrate(connection) == 0
+    assert statements == ["PRAGMA user_version"]
+
+
+def test_migrate_legacy_database(connection: Connection) -> None:
+    """
+    Test migrating a database created before the schema was versioned, preserving its rows.
+    :param connection: a sqlite3 Connection instance
+    """
+    match_hash: str = sha256(b"legacy").hexdigest()
+    file_path: Path = MATCH_LOGS_PATH / "2023-01-01" / "bounty_hunt" / "12-00-00.json"
+
+    cursor: Cursor
+    with closing(connection.cursor()) as cursor:
+        for query in DATABASE_TABLE_QUERIES:
+            cursor.execute(query)
+        cursor.execute("INSERT INTO data_hashes (hash, path) VALUES (?, ?)", (match_hash, str(file_path)))
+        cursor.execute("INSERT INTO matches (hash, time, is_quickplay, is_hunter_dead, bloodline_rank, region) "
+                       "VALUES (?, 0, 0, 0, 100, 'eu')", (match_hash,))
+        cursor.execute("INSERT INTO match_players (match_id, team, profile_id, name, mmr, kills, deaths) "
+                       "VALUES (?, 0, 1, 'Player', 2695, 1, 0)", (cursor.lastrowid,))
+    connection.commit()
+
+    migrate(connection)
+    assert get_schema_version(connection) == _LATEST_SCHEMA_VERSION
+    with closing(connection.cursor()) as cursor:
+        # Hashes are stored as digests, paths relative to the match logs directory
+        assert cursor.execute("SELECT hash, path FROM data_hashes").fetchall() == [
+            (bytes.fromhex(match_hash), "2023-01-01/bounty_hunt/12-00-00.json")]
+
+        # The players still reference their match
+        players_query: str = "SELECT match_players.name FROM match_players " \
+                             "JOIN matches ON matches.id = match_players.match_id WHERE matches.hash = ?"
+        assert cursor.execute(players_query, (bytes.fromhex(match_hash),)).fetchall() == [("Player",)]
+
+
+def test_migrate_newer_database(connection: Connection) -> None:
+    """
+    Test that databases created by newer versions of the application are rejected.
+    :param connection: a sqlite3 Connection instance
+    """
+    connection.execute(f"PRAGMA user_version = {_LATEST_SCHEMA_VERSION + 1:d}")
+    with pytest.raises(DatabaseError):
+        migrate(connection)
+
+
+def test_migrate_failure_rollback(connection: Connection) -> None:
+    """
+    Test that a failing migration is rolled back without affecting previously applied migrations.
+    :param connection: a sqlite3 Connection instance
+    """
+    def _create_table(cursor: Cursor) -> None:
+        cursor.execute("CREATE TABLE complete (id INTEGER PRIMARY KEY)")
+
+    def _failing_migration(cursor: Cursor) -> None:
+        cursor.execute("CREATE TABLE partial (id INTEGER PRIMARY KEY)")
+        raise RuntimeError("Migration failed.")
+
+    migrations: tuple[Migration, ...] = (
+        Migration(1, "Create a table", _create_table),
+        Migration(2, "Fail after creating a table", _failing_migration))
+    with pytest.raises(RuntimeError):
+        migrate(connection, migrations)
+
+    assert get_schema_version(connection) == 1
+    cursor: Cursor
+    with closing(connection.cursor()) as cursor:
+        tables: set[str] = {row[0] for row in cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    assert tables == {"complete"}
+
+
+def test_rebuild_table(connection: Connection) -> None:
+    """
+    Test rebuilding a table in multiple batches.
+    :param connection: a sqlite3 Connection instance
+    """
+    cursor: Cursor
+    with closing(connection.cursor()) as cursor:
+        cursor.execute("CREATE TABLE numbers (value TEXT NOT NULL, unused TEXT)")
+        cursor.executemany("INSERT INTO numbers (value) VALUES (?)", ((str(i),) for i in range(25)))
+
+        rebuild_table(cursor, "numbers", columns=("value INTEGER PRIMARY KEY",), copied_columns=("value",),
+                      convert=lambda row: (int(row[0]),), without_rowid=True, batch_size=10)
+        assert [row[0] for row in cursor.execute("SELECT value FROM numbers")] == list(range(25))
+        assert [row[1] for row in cursor.execute("PRAGMA table_info(numbers)")] == ["value"]
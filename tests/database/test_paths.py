@@ -0,0 +1,19 @@
+from pathlib import Path
+
+import pytest
+
+from hunt.constants import MATCH_LOGS_PATH
+from hunt.database.paths import relative_log_path, resolve_log_path
+
+
+@pytest.mark.parametrize("file_path, expected_path", (
+        (MATCH_LOGS_PATH / "2023-01-01" / "quickplay" / "12-00-00.json", "2023-01-01/quickplay/12-00-00.json"),
+        (Path("/tmp/dummy.json"), "/tmp/dummy.json")))
+def test_relative_log_path(file_path: Path, expected_path: str) -> None:
+    """
+    Test relative_log_path and resolve_log_path with paths inside and outside the match logs directory.
+    :param file_path: the path to a match log
+    :param expected_path: the expected stored path
+    """
+    assert relative_log_path(file_path) == expected_path
+    assert resolve_log_path(expected_path) == file_path
@@ -0,0 +1,43 @@
+from contextlib import closing
+from pathlib import Path
+
+import pytest
+
+from hunt.database.client import Client as DatabaseClient, Cursor, DatabaseProfile
+
+
+@pytest.mark.parametrize("profile, expected_journal_mode, expected_synchronous", (
+        (DatabaseProfile.DURABLE, "delete", 2),
+        (DatabaseProfile.PERFORMANCE, "wal", 1)))
+def test_database_profile(tmp_path: Path, profile: DatabaseProfile,
+                          expected_journal_mode: str, expected_synchronous: int) -> None:
+    """
+    Test the pragmas applied by each DatabaseProfile.
+    :param tmp_path: a temporary directory
+    :param profile: the database profile to use
+    :param expected_journal_mode: the expected journal mode
+    :param expected_synchronous: the expected synchronization level
+    """
+    database: DatabaseClient
+    with DatabaseClient(file_path=tmp_path / "match_data.db", profile=profile) as database:
+        cursor: Cursor
+        with closing(database.cursor()) as cursor:
+            assert cursor.execute("PRAGMA journal_mode").fetchone()[0] == expected_journal_mode
+            assert cursor.execute("PRAGMA synchronous").fetchone()[0] == expected_synchronous
+
+
+def test_database_profile_switch(tmp_path: Path) -> None:
+    """
+    Test DatabaseProfile by reopening a database previously opened with another profile,
+      the persistent journal mode of the performance profile is reset by the durable profile.
+    :param tmp_path: a temporary directory
+    """
+    database: DatabaseClient
+    cursor: Cursor
+    for profile, expected_journal_mode, expected_synchronous in (
+            (DatabaseProfile.PERFORMANCE, "wal", 1), (DatabaseProfile.DURABLE, "delete", 2),
+            (DatabaseProfile.PERFORMANCE, "wal", 1)):
+        with DatabaseClient(file_path=tmp_path / "match_data.db", profile=profile) as database:
+            with closing(database.cursor()) as cursor:
+                assert cursor.execute("PRAGMA journal_mode").fetchone()[0] == expected_journal_mode
+                assert cursor.execute("PRAGMA synchronous").fetchone()[0] == expected_synchronous
@@ -1,6 +1,7 @@
 import random
 import sqlite3
 from contextlib import closing, nullcontext as does_not_raise
+from datetime import datetime
 from hashlib import sha256
 from pathlib import Path
 
@@ -8,7 +9,10 @@ import pytest
 from _pytest.python_api import RaisesContext
 
 from hunt.database.client import Client as DatabaseClient, Cursor
-from hunt.database.queries import data_hash_exists, insert_match_hash, update_player_data
+from hunt.database.paths import relative_log_path
+from hunt.database.queries import MatchRecord, PlayerEncounter, PlayerRecord, data_hash_exists, \
+    fetch_match_log_paths, fetch_player_history, get_application_state, insert_match, insert_match_hash, \
+    insert_matches, set_application_state, update_player_data
 
 # Global variables for data_hashes
 _DUMMY_HASH: str = sha256(b"dummy").hexdigest()
@@ -45,7 +49,7 @@ def test_insert_match_hash(database_client: DatabaseClient,
     cursor: Cursor
     with closing(database_client.cursor()) as cursor:
         query: str = "SELECT path FROM data_hashes where hash = ?"
-        assert cursor.execute(query, (match_hash,)).fetchone()[0] == str(file_path)
+        assert cursor.execute(query, (bytes.fromhex(match_hash),)).fetchone()[0] == relative_log_path(file_path)
     database_client.save()
 
 
@@ -88,3 +92,110 @@ def test_update_player_data(database_client: DatabaseClient) -> None:
 
         query = "SELECT name, mmr, kills, deaths, encounters FROM player_log_quickplay WHERE profile_id = ?"
         assert cursor.execute(query, (profile_id,)).fetchone() == (name, mmr, 6, 1, 2)
+
+
+def test_application_state(database_client: DatabaseClient) -> None:
+    """
+    Test get_application_state and set_application_state by persisting, replacing and fetching a value.
+    :param database_client: a Database instance
+    """
+    key: str = "test_key"
+    assert get_application_state(database_client, key=key) is None
+
+    for value in ("first", "second"):
+        set_application_state(database_client, key=key, value=value)
+        assert get_application_state(database_client, key=key) == value
+
+
+def _generate_match_record(match_hash: str, time: datetime, profile_ids: tuple[int, ...]) -> MatchRecord:
+    """
+    Generates a match record with random (but sensible) player data.
+    :param match_hash: the hash of the match
+    :param time: the time of the match
+    :param profile_ids: the profile ids of the players
+    :return: a MatchRecord instance
+    """
+    players: tuple[PlayerRecord, ...] = tuple(
+        PlayerRecord(team=i // 3, profile_id=profile_id, name=f"Player {i}", mmr=int(random.gauss(2695, 600)),
+                     kills=random.randint(0, 3), deaths=random.randint(0, 1))
+        for i, profile_id in enumerate(profile_ids))
+    return MatchRecord(match_hash, _DUMMY_PATH, time, is_quickplay=False, is_hunter_dead=False, bloodline_rank=100,
+                       region="eu", players=players)
+
+
+def test_insert_match(database_client: DatabaseClient) -> None:
+    """
+    Test insert_match by inserting a match, and inserting it again to make sure no changes are made.
+    :param database_client: a Database instance
+    """
+    match: MatchRecord = _generate_match_record(
+        sha256(b"insert_match").hexdigest(), datetime.now(),
+        profile_ids=tuple(int(abs(random.gauss(10**8, 10**10))) for _ in range(3)))
+
+    # Insert the match
+    insert_match(database_client, match=match)
+    assert data_hash_exists(database_client, match_hash=match.match_hash)
+
+    def verify_player_log() -> None:
+        cursor: Cursor
+        with closing(database_client.cursor()) as cursor:
+            query: str = "SELECT name, mmr, kills, deaths, encounters FROM player_log_bountyhunt WHERE profile_id = ?"
+            for player in match.players:
+                assert cursor.execute(query, (player.profile_id,)).fetchone() == (
+                    player.name, player.mmr, player.kills, player.deaths, 1)
+
+            query = "SELECT COUNT(*) FROM match_players WHERE match_id = (SELECT id FROM matches WHERE hash = ?)"
+            assert cursor.execute(query, (bytes.fromhex(match.match_hash),)).fetchone()[0] == len(match.players)
+
+    verify_player_log()
+
+    # Inserting the same match again should fail without updating the player log
+    with pytest.raises(sqlite3.IntegrityError):
+        insert_match(database_client, match=match)
+    verify_player_log()
+
+
+def test_fetch_player_history(database_client: DatabaseClient) -> None:
+    """
+    Test fetch_player_history by inserting matches with a recurring player and fetching the encounters.
+    :param database_client: a Database instance
+    """
+    profile_id: int = int(abs(random.gauss(10**8, 10**10)))
+    times: tuple[datetime, ...] = tuple(datetime(year=2000, month=1, day=day, hour=12) for day in (3, 1, 2))
+    matches: tuple[MatchRecord, ...] = tuple(
+        _generate_match_record(sha256(f"player_history_{i}".encode()).hexdigest(), time,
+                               profile_ids=(int(abs(random.gauss(10**8, 10**10))), profile_id))
+        for i, time in enumerate(times))
+    for match in matches:
+        insert_match(database_client, match=match)
+
+    # The encounters should be ordered by time
+    expected_encounters: tuple[PlayerEncounter, ...] = tuple(
+        PlayerEncounter(match.time, match.is_quickplay, player.team, player.name, player.mmr, player.kills,
+                        player.deaths)
+        for match in sorted(matches, key=lambda match: match.time) for player in match.players[1:])
+    assert fetch_player_history(database_client, profile_id=profile_id) == expected_encounters
+    assert fetch_player_history(database_client, profile_id=profile_id, since=times[2]) == expected_encounters[1:]
+
+
+def test_insert_matches(database_client: DatabaseClient) -> None:
+    """
+    Test insert_matches by inserting multiple matches, including a duplicate, and inserting them again.
+    :param database_client: a Database instance
+    """
+    profile_ids: tuple[int, ...] = tuple(int(abs(random.gauss(10**8, 10**10))) for _ in range(3))
+    matches: list[MatchRecord] = [
+        _generate_match_record(sha256(f"insert_matches {i}".encode()).hexdigest(), datetime.now(), profile_ids)
+        for i in range(3)]
+
+    # The duplicate match is skipped
+    assert insert_matches(database_client, [*matches, matches[0]]) == len(matches)
+    assert insert_matches(database_client, matches) == 0
+    assert all(data_hash_exists(database_client, match_hash=match.match_hash) for match in matches)
+    assert relative_log_path(_DUMMY_PATH) in fetch_match_log_paths(database_client)
+
+    # The player log is only updated once per saved match
+    cursor: Cursor
+    with closing(database_client.cursor()) as cursor:
+        query: str = "SELECT encounters FROM player_log_bountyhunt WHERE profile_id = ?"
+        assert cursor.execute(query, (profile_ids[0],)).fetchone()[0] == len(matches)
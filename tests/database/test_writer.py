@@ -0,0 +1,70 @@
+from concurrent.futures import Future
+from datetime import datetime
+from hashlib import sha256
+from pathlib import Path
+
+import pytest
+
+from hunt.database.client import Client as DatabaseClient, Cursor
+from hunt.database.queries import MatchRecord, PlayerRecord, data_hash_exists, get_application_state, \
+    submit_match, write_application_state
+from hunt.database.writer import DatabaseWriter
+from hunt.exceptions import DatabaseError
+
+
+def _generate_match(i: int) -> MatchRecord:
+    """
+    Generates a match record with two players.
+    :param i: the index of the match
+    :return: a MatchRecord instance
+    """
+    return MatchRecord(sha256(f"{i}".encode()).hexdigest(), Path(f"{i}.json"), datetime.now(), is_quickplay=False,
+                       is_hunter_dead=False, bloodline_rank=100, region="eu",
+                       players=tuple(PlayerRecord(j, profile_id=j, name=f"Player {j}", mmr=3000, kills=1, deaths=0)
+                                     for j in range(2)))
+
+
+def test_database_writer_group_commit(tmp_path: Path) -> None:
+    """
+    Test DatabaseWriter by submitting a full batch of matches, which are committed in a single transaction.
+    :param tmp_path: a temporary directory
+    """
+    database: DatabaseClient
+    writer: DatabaseWriter
+    with DatabaseClient(file_path=tmp_path / "match_data.db") as database:
+        with DatabaseWriter(database, batch_size=4, max_delay=60) as writer:
+            futures: list[Future[bool]] = [submit_match(writer, _generate_match(i)) for i in range(3)]
+            futures.append(submit_match(writer, _generate_match(0)))  # A duplicate
+            assert [future.result(timeout=5) for future in futures] == [True, True, True, False]
+            assert (writer.requests, writer.transactions) == (4, 1)
+
+        # The hashes were cached once committed
+        assert all(data_hash_exists(database, match_hash=_generate_match(i).match_hash) for i in range(3))
+        assert database.hash_cache.misses == 0
+        with pytest.raises(DatabaseError):
+            submit_match(writer, _generate_match(3))
+
+
+def test_database_writer_failed_request(tmp_path: Path) -> None:
+    """
+    Test DatabaseWriter by submitting a failing request, which is rolled back without affecting the other requests.
+    :param tmp_path: a temporary directory
+    """
+    def failing_request(cursor: Cursor) -> None:
+        write_application_state(cursor, key="failed", value="value")
+        raise ValueError("Failed.")
+
+    database: DatabaseClient
+    writer: DatabaseWriter
+    with DatabaseClient(file_path=tmp_path / "match_data.db") as database:
+        with DatabaseWriter(database, max_delay=60) as writer:
+            failed_future: Future[None] = writer.submit(failing_request)
+            future: Future[None] = writer.submit(lambda cursor: write_application_state(cursor, "key", "value"))
+        # The queued requests are committed when the writer is stopped
+
+        with pytest.raises(ValueError):
+            failed_future.result(timeout=5)
+        assert future.result(timeout=5) is None
+        assert (writer.requests, writer.transactions) == (2, 1)
+        assert get_application_state(database, key="failed") is None
+        assert get_application_state(database, key="key") == "value"
@@ -0,0 +1,49 @@
+from pathlib import Path
+
+import pytest
+
+from hunt.filesystem.compression import COMPRESSION_SUFFIXES, MatchLogCompression, compress, compress_file, \
+    decompress, read_match_log, uncompressed_path
+
+_DOCUMENT: bytes = b'{\n  "player_name": "Player",\n  "teams": []\n}' * 10
+
+
+@pytest.mark.parametrize("compression", tuple(MatchLogCompression))
+def test_compress(compression: MatchLogCompression) -> None:
+    """
+    Test compress and decompress by round-tripping a document, the codec is detected from the data.
+    :param compression: the codec to use
+    """
+    data: bytes = compress(_DOCUMENT, compression)
+    assert (data == _DOCUMENT) == (compression == MatchLogCompression.NONE)
+    assert len(data) <= len(_DOCUMENT)
+    assert decompress(data) == _DOCUMENT
+
+    # Corrupted compressed data fails to be decompressed
+    if compression != MatchLogCompression.NONE:
+        with pytest.raises(OSError):
+            decompress(data[:len(data) // 2])
+
+
+@pytest.mark.parametrize("compression", (MatchLogCompression.GZIP, MatchLogCompression.LZMA))
+def test_compress_file(tmp_path: Path, compression: MatchLogCompression) -> None:
+    """
+    Test compress_file and read_match_log by compressing a match log file.
+    :param tmp_path: a temporary directory
+    :param compression: the codec to use
+    """
+    file_path: Path = tmp_path / "00-00-00.json"
+    file_path.write_bytes(_DOCUMENT)
+    compressed_path: Path = compress_file(file_path, compression)
+    assert compressed_path.name == f"00-00-00.json{COMPRESSION_SUFFIXES[compression]}"
+    assert uncompressed_path(compressed_path) == file_path
+    assert sorted(tmp_path.iterdir()) == [file_path, compressed_path]
+
+    # Plain and compressed match logs are read the same way
+    assert read_match_log(file_path) == read_match_log(compressed_path) == _DOCUMENT
+
+    # The path of a removed plain match log resolves to its compressed copy
+    file_path.unlink()
+    assert read_match_log(file_path) == _DOCUMENT
+    with pytest.raises(FileNotFoundError):
+        read_match_log(tmp_path / "missing.json")
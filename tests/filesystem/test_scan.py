@@ -0,0 +1,17 @@
+from pathlib import Path
+
+from hunt.filesystem.scan import scan_files
+
+
+def test_scan_files(tmp_path: Path) -> None:
+    """
+    Test scan_files by scanning a nested directory tree.
+    :param tmp_path: a temporary directory
+    """
+    file_paths: list[Path] = [tmp_path / "a.json", tmp_path / "2023-01-01" / "quickplay" / "b.json"]
+    for file_path in (*file_paths, tmp_path / "notes.txt", tmp_path / "2023-01-01" / "c.json.tmp"):
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        file_path.touch()
+    (tmp_path / "empty").mkdir()
+
+    assert sorted(scan_files(tmp_path, suffix=".json")) == sorted(file_paths)
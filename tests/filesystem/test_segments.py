@@ -0,0 +1,135 @@
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+from hunt.exceptions import ParserError
+from hunt.filesystem.compression import MatchLogCompression
+from hunt.filesystem.segments import SegmentLocation, SegmentLog, SegmentReader, read_record, scan_segment, \
+    segment_file_path
+
+
+def test_segment_log(tmp_path: Path) -> None:
+    """
+    Test SegmentLog by appending records to rotating segments and reading them by random access.
+    :param tmp_path: a temporary directory
+    """
+    time: datetime = datetime(year=2023, month=1, day=1, second=30)
+    payloads: list[bytes] = [f"match {i}".encode() * 10 for i in range(10)]
+    segment_log: SegmentLog
+    with SegmentLog(tmp_path, max_segment_size=256) as segment_log:
+        locations: list[SegmentLocation] = [segment_log.append(payload, time) for payload in payloads]
+
+    # The segments rotate once they're full, every record is read back by random access
+    assert len({location.file_path for location in locations}) > 1
+    assert all(location.file_path.stat().st_size <= 256 for location in locations)
+    assert [read_record(location).payload for location in reversed(locations)] == payloads[::-1]
+    assert read_record(locations[0]).time == time
+    assert [location for file_path in sorted(tmp_path.glob("*.segment")) for location in scan_segment(file_path)] == \
+           locations
+
+    # Reopening the log appends to the last segment
+    with SegmentLog(tmp_path, max_segment_size=256) as segment_log:
+        assert segment_log.append(b"", time).file_path == locations[-1].file_path
+
+
+@pytest.mark.parametrize("compression", (MatchLogCompression.GZIP, MatchLogCompression.LZMA))
+def test_segment_log_compression(tmp_path: Path, compression: MatchLogCompression) -> None:
+    """
+    Test SegmentLog by appending compressed records next to plain records.
+    :param tmp_path: a temporary directory
+    :param compression: the codec to use
+    """
+    payload: bytes = b'{"player_name": "Player"}' * 100
+    segment_log: SegmentLog
+    with SegmentLog(tmp_path) as segment_log:
+        plain_location: SegmentLocation = segment_log.append(payload, datetime.now())
+    with SegmentLog(tmp_path, compression=compression) as segment_log:
+        location: SegmentLocation = segment_log.append(payload, datetime.now())
+
+    # Records are compressed one at a time, the payloads are decompressed when they're read
+    assert location.length < plain_location.length == len(payload)
+    assert read_record(plain_location).payload == read_record(location).payload == payload
+    assert list(scan_segment(location.file_path)) == [plain_location, location]
+
+
+def test_segment_reader(tmp_path: Path) -> None:
+    """
+    Test SegmentReader by reading records from memory-mapped segments while they're appended to.
+    :param tmp_path: a temporary directory
+    """
+    time: datetime = datetime(year=2023, month=1, day=1)
+    segment_log: SegmentLog
+    reader: SegmentReader
+    with SegmentLog(tmp_path, max_segment_size=256) as segment_log, SegmentReader(max_mapped_segments=2) as reader:
+        locations: list[SegmentLocation] = [segment_log.append(f"match {i}".encode() * 10, time) for i in range(10)]
+        assert [reader.read(location) for location in locations] == [read_record(location) for location in locations]
+
+        # Segments which grew since they were mapped are mapped again
+        location: SegmentLocation = segment_log.append(b"next match", time)
+        assert reader.read(location).payload == b"next match"
+
+    # Records past the end of the segment are truncated
+    with pytest.raises(ParserError):
+        SegmentReader().read(SegmentLocation(location.file_path, location.offset, location.length + 1))
+
+
+def test_segment_log_lock(tmp_path: Path) -> None:
+    """
+    Test SegmentLog by opening the segments of a directory twice, only one log appends to them at a time.
+    :param tmp_path: a temporary directory
+    """
+    segment_log: SegmentLog
+    with SegmentLog(tmp_path) as segment_log:
+        with pytest.raises(OSError):
+            SegmentLog(tmp_path)
+        segment_log.append(b"match", datetime.now())
+    with SegmentLog(tmp_path) as segment_log:
+        segment_log.append(b"next match", datetime.now())
+    assert len(list(scan_segment(segment_file_path(tmp_path, index=1)))) == 2
+
+
+def test_segment_log_discard(tmp_path: Path) -> None:
+    """
+    Test SegmentLog.discard by removing the last appended records, records followed by other records are kept.
+    :param tmp_path: a temporary directory
+    """
+    segment_log: SegmentLog
+    with SegmentLog(tmp_path) as segment_log:
+        locations: list[SegmentLocation] = [segment_log.append(f"match {i}".encode(), datetime.now())
+                                            for i in range(3)]
+        assert not segment_log.discard(locations[1])
+        assert segment_log.discard(locations[2])
+        assert segment_log.discard(locations[1])
+        assert segment_log.append(b"next match", datetime.now()).offset == locations[1].offset
+    assert [read_record(location).payload for location in scan_segment(locations[0].file_path)] == [
+        b"match 0", b"next match"]
+
+
+def test_segment_log_recovery(tmp_path: Path) -> None:
+    """
+    Test SegmentLog by reopening a segment with an interrupted append and reading a corrupted record.
+    :param tmp_path: a temporary directory
+    """
+    segment_log: SegmentLog
+    with SegmentLog(tmp_path) as segment_log:
+        location: SegmentLocation = segment_log.append(b"match", datetime.now())
+        torn_location: SegmentLocation = segment_log.append(b"torn match", datetime.now())
+    file_path: Path = segment_file_path(tmp_path, index=1)
+    with open(file_path, mode="r+b") as file:
+        file.truncate(torn_location.offset + 4)
+
+    # The truncated record is removed, the next record is appended in its place
+    assert list(scan_segment(file_path)) == [location]
+    with SegmentLog(tmp_path) as segment_log:
+        assert segment_log.append(b"next match", datetime.now()).offset == torn_location.offset
+
+    # Corrupted records fail to be read
+    data: bytearray = bytearray(file_path.read_bytes())
+    data[-1] ^= 0xFF
+    file_path.write_bytes(data)
+    with pytest.raises(ParserError):
+        read_record(SegmentLocation(file_path, torn_location.offset, length=len(b"next match")))
+    (tmp_path / "invalid.segment").write_bytes(b"invalid")
+    with pytest.raises(ParserError):
+        list(scan_segment(tmp_path / "invalid.segment"))
@@ -0,0 +1,72 @@
+import threading
+import time
+from pathlib import Path
+
+from hunt.filesystem.base import Debouncer
+from hunt.filesystem.watchdog import FileWatchdog
+
+_FILE_PATH: Path = Path("attributes.xml")
+
+
+def test_debouncer_burst() -> None:
+    """Test Debouncer by collapsing a burst of events into a single callback."""
+    invocations: list[Path] = []
+    debouncer: Debouncer = Debouncer(invocations.append, quiet_period=0.05, max_delay=10)
+    debouncer.start()
+
+    for _ in range(5):
+        debouncer.notify(_FILE_PATH)
+    time.sleep(0.2)
+    assert invocations == [_FILE_PATH]
+    assert (debouncer.events, debouncer.collapsed_events, debouncer.invocations) == (5, 4, 1)
+
+    # A new burst invokes the callback again
+    debouncer.notify(_FILE_PATH)
+    debouncer.stop()
+    debouncer.join()
+    assert invocations == [_FILE_PATH] * 2
+
+
+def test_debouncer_max_delay() -> None:
+    """Test Debouncer by generating events more frequently than the quiet period for longer than the maximum delay."""
+    invocations: list[Path] = []
+    debouncer: Debouncer = Debouncer(invocations.append, quiet_period=0.1, max_delay=0.1)
+    debouncer.start()
+
+    end_time: float = time.monotonic() + 0.5
+    while time.monotonic() < end_time:
+        debouncer.notify(_FILE_PATH)
+        time.sleep(0.01)
+    assert len(invocations) >= 2
+
+    debouncer.stop()
+    debouncer.join()
+
+
+def test_file_watchdog(tmp_path: Path) -> None:
+    """
+    Test FileWatchdog by writing to the watched file (and an unrelated file) multiple times.
+    :param tmp_path: a temporary directory
+    """
+    file_path: Path = tmp_path / "attributes.xml"
+    file_path.touch()
+    invoked: threading.Event = threading.Event()
+    invocations: list[Path] = []
+
+    def callback(modified_file_path: Path) -> None:
+        invocations.append(modified_file_path)
+        invoked.set()
+
+    file_watchdog: FileWatchdog = FileWatchdog(file_path, callback, quiet_period=0.2, max_delay=10)
+    file_watchdog.start()
+    try:
+        for i in range(3):
+            file_path.write_text(f"{i}")
+            (tmp_path / "unrelated.xml").write_text(f"{i}")
+        assert invoked.wait(timeout=5)
+    finally:
+        file_watchdog.stop()
+        file_watchdog.join()
+
+    assert invocations == [file_path]
+    assert file_watchdog.debouncer.collapsed_events == file_watchdog.debouncer.events - 1
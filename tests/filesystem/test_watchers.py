@@ -0,0 +1,93 @@
+import os
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+from hunt.filesystem.base import FileWatcher
+from hunt.filesystem.polling import stat_signature
+from hunt.filesystem.watchers import WatcherBackend, create_file_watcher
+
+_BACKENDS: tuple = tuple(
+    pytest.param(backend, marks=pytest.mark.skipif(
+        backend is WatcherBackend.INOTIFY and not sys.platform.startswith("linux"), reason="Requires Linux."))
+    for backend in WatcherBackend)
+
+
+def _watch(backend: WatcherBackend, file_path: Path, modify: list) -> tuple[FileWatcher, list[Path]]:
+    """
+    Watches a file while modifying it, until the callback is invoked.
+    :param backend: the watcher backend to use
+    :param file_path: the path to the file
+    :param modify: the functions which modify the file
+    :return: the stopped FileWatcher instance and the callback invocations
+    """
+    invoked: threading.Event = threading.Event()
+    invocations: list[Path] = []
+
+    def callback(modified_file_path: Path) -> None:
+        invocations.append(modified_file_path)
+        invoked.set()
+
+    file_watcher: FileWatcher = create_file_watcher(backend, file_path, callback,
+                                                    quiet_period=0.2, max_delay=10, poll_interval=0.05)
+    file_watcher.start()
+    try:
+        for function in modify:
+            function()
+        assert invoked.wait(timeout=5)
+    finally:
+        file_watcher.stop()
+        file_watcher.join()
+    return file_watcher, invocations
+
+
+@pytest.mark.parametrize("backend", _BACKENDS)
+def test_file_watcher_modified(tmp_path: Path, backend: WatcherBackend) -> None:
+    """
+    Test each watcher backend by modifying the watched file multiple times.
+    :param tmp_path: a temporary directory
+    :param backend: the watcher backend to use
+    """
+    file_path: Path = tmp_path / "attributes.xml"
+    file_path.touch()
+
+    file_watcher, invocations = _watch(backend, file_path, [
+        lambda: file_path.write_text("match data"), lambda: file_path.write_text("more match data")])
+    assert invocations == [file_path]
+    assert file_watcher.wakeups >= 1
+    assert file_watcher.cpu_time > 0
+
+
+@pytest.mark.parametrize("backend", (WatcherBackend.INOTIFY, WatcherBackend.POLLING))
+def test_file_watcher_replaced(tmp_path: Path, backend: WatcherBackend) -> None:
+    """
+    Test the single file watcher backends by replacing the watched file with another file.
+    :param tmp_path: a temporary directory
+    :param backend: the watcher backend to use
+    """
+    if backend is WatcherBackend.INOTIFY and not sys.platform.startswith("linux"):
+        pytest.skip("Requires Linux.")
+    file_path: Path = tmp_path / "attributes.xml"
+    file_path.write_text("match data")
+    temporary_file_path: Path = tmp_path / "attributes.xml.tmp"
+    temporary_file_path.write_text("new match data")
+
+    _, invocations = _watch(backend, file_path, [lambda: os.replace(temporary_file_path, file_path)])
+    assert invocations == [file_path]
+
+
+def test_stat_signature(tmp_path: Path) -> None:
+    """
+    Test stat_signature by modifying and deleting a file.
+    :param tmp_path: a temporary directory
+    """
+    file_path: Path = tmp_path / "attributes.xml"
+    file_path.write_text("match data")
+    signature = stat_signature(file_path)
+
+    file_path.write_text("more match data")
+    assert stat_signature(file_path) not in (signature, None)
+    file_path.unlink()
+    assert stat_signature(file_path) is None
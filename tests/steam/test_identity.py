@@ -0,0 +1,42 @@
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+
+from hunt.constants import HUNT_SHOWDOWN_APP_ID, HUNT_SHOWDOWN_TEST_SERVER_APP_ID
+from hunt.exceptions import SteamworksError
+from hunt.steam.identity import HeadlessIdentity, SteamworksIdentity
+
+
+def test_steamworks_identity_cache() -> None:
+    """Test SteamworksIdentity by looking up the identity repeatedly, the Steamworks API is used once per refresh."""
+    steamworks_api: MagicMock = MagicMock()
+    steamworks_api.get_persona_name.side_effect = ["Player", "Renamed player"]
+    steamworks_api.get_install_directory.side_effect = lambda app_id: Path(f"{app_id}")
+    identity: SteamworksIdentity = SteamworksIdentity(steamworks_api)
+
+    assert [identity.get_persona_name() for _ in range(3)] == ["Player"] * 3
+    assert [identity.get_install_directory(HUNT_SHOWDOWN_APP_ID) for _ in range(3)] == \
+           [Path(f"{HUNT_SHOWDOWN_APP_ID}")] * 3
+    assert (steamworks_api.get_persona_name.call_count, steamworks_api.get_install_directory.call_count) == (1, 1)
+
+    # The cached values are discarded by a refresh
+    identity.refresh()
+    assert identity.get_persona_name() == "Renamed player"
+    assert identity.get_install_directory(HUNT_SHOWDOWN_APP_ID) == Path(f"{HUNT_SHOWDOWN_APP_ID}")
+    assert (steamworks_api.get_persona_name.call_count, steamworks_api.get_install_directory.call_count) == (2, 2)
+
+    identity.shutdown()
+    steamworks_api.shutdown.assert_called_once()
+
+
+def test_headless_identity() -> None:
+    """Test HeadlessIdentity by looking up configured and missing values."""
+    identity: HeadlessIdentity = HeadlessIdentity(persona_name="Player",
+                                                  install_directories={HUNT_SHOWDOWN_APP_ID: Path("live")})
+    assert identity.get_persona_name() == "Player"
+    assert identity.get_install_directory(HUNT_SHOWDOWN_APP_ID) == Path("live")
+    with pytest.raises(SteamworksError):
+        identity.get_install_directory(HUNT_SHOWDOWN_TEST_SERVER_APP_ID)
+    with pytest.raises(SteamworksError):
+        HeadlessIdentity(persona_name=None).get_persona_name()